@@ -1,9 +1,48 @@
 import streamlit as st
-import google.generativeai as genai
-import fitz  # PyMuPDF
+import hashlib
+import os
 import re
-import pandas as pd
-import docx
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from core import metrics
+from core.ats import format_keyword_table, score_ats
+from core.backends import SharedModel
+from core.compaction import compact_resume
+from core.extraction import (
+    EXTRACTOR_VERSION,
+    ExtractionError,
+    ExtractionLimits,
+    check_upload,
+    is_supported,
+    parse_document,
+)
+from core.incremental import run_incremental
+from core.jobs import JobQueue
+from core.jd_library import DEFAULT_LIBRARY_DIR, open_library
+from core.llm import create_model, generate_text, stream_text
+from core.llm_cache import ResponseCache
+from core.near_dup import DEFAULT_THRESHOLD, NearDuplicateIndex, similarity
+from core.parse_cache import ParseCache
+from core.parsing import parse_score, parse_trend_rows
+from core.prompts import (
+    build_ats_prompt,
+    build_cover_letter_prompt,
+    build_enhancement_prompt,
+    build_general_prompt,
+    build_opportunity_prompt,
+    build_roadmap_prompt,
+    build_structured_prompt,
+    build_trends_prompt,
+)
+from core.resume import parse_resume
+from core.scheduler import LLMScheduler
+from core.session_store import SessionStore
+from core.shared_cache import SharedCache
+from core.structured import analyze, json_generation_config, parse_analysis, render_results, result_fields
+from core.titles import TitleIndex
 
 # --- 1. Page Configuration ---
 st.set_page_config(
@@ -11,6 +50,7 @@ st.set_page_config(
     page_icon="✨",
     layout="wide"
 )
+script_started = time.perf_counter()
 
 # --- 2. CSS for an Animated Gradient Background & Top Dashboard ---
 custom_css = """
@@ -92,56 +132,373 @@ st.markdown(custom_css, unsafe_allow_html=True)
 
 
 # --- AI Model & State Initialization (Your original code) ---
-if 'general_result' not in st.session_state:
-    st.session_state.general_result = ""
-if 'ats_result' not in st.session_state:
-    st.session_state.ats_result = ""
-if 'roadmap_result' not in st.session_state:
-    st.session_state.roadmap_result = ""
-if 'opportunity_result' not in st.session_state:
-    st.session_state.opportunity_result = ""
-if 'enhanced_resume' not in st.session_state:
-    st.session_state.enhanced_resume = ""
-if 'cover_letter_result' not in st.session_state:
-    st.session_state.cover_letter_result = ""
-if 'trends_result' not in st.session_state:
-    st.session_state.trends_result = None
+@st.cache_resource
+def get_session_store():
+    # Results of every session, compressed and deduplicated in one store per
+    # process; cold sessions spill to disk past RESUME_ANALYZER_SESSION_MEMORY_MB.
+    return SessionStore(
+        max_memory_bytes=int(float(os.environ.get("RESUME_ANALYZER_SESSION_MEMORY_MB", 64)) * 1024 * 1024),
+        spill_dir=os.environ.get("RESUME_ANALYZER_SESSION_DIR", os.path.join(".cache", "sessions")),
+    )
+
+# Analysis results live in the session store rather than in st.session_state.
+# The session id is also kept in the URL, so a reloaded or reconnected page
+# finds its results and background jobs again. Anyone with the link can, so
+# only ids in the form this app generates are taken from it.
+SESSION_ID = re.compile(r"[0-9a-f]{32}")
+if "session_id" not in st.session_state:
+    requested = st.query_params.get("session", "")
+    st.session_state.session_id = requested if SESSION_ID.fullmatch(requested) else uuid.uuid4().hex
+st.query_params["session"] = st.session_state.session_id
+results = get_session_store().session(st.session_state.session_id)
 if 'app_started' not in st.session_state:
     st.session_state.app_started = False
 
-try:
-    # --- AI Model Configuration (Optimized for Local Demo) ---
-    # This hardcoded method ensures your laptop demo works flawlessly
-    MY_API_KEY = "MY_API_KEY"
-    
-    genai.configure(api_key=MY_API_KEY)
-    
-    # Using 'gemini-1.5-flash-latest' to ensure compatibility and prevent 404 errors
-    generation_config = genai.types.GenerationConfig(temperature=0.2)
-    model = genai.GenerativeModel('gemini-1.5-flash')
-    
-except Exception as e:
-    st.error(f"Error configuring the AI model: {e}")
-    st.info("Check if your API key is correct and your internet connection is active.")
-    st.stop()
+# --- AI Model Configuration (Optimized for Local Demo) ---
+# This hardcoded method ensures your laptop demo works flawlessly
+MY_API_KEY = "MY_API_KEY"
+
+@st.cache_resource
+def get_shared_model():
+    # One client per process: every session and rerun reuses its connection.
+    shared = SharedModel(lambda: create_model(MY_API_KEY))
+    if os.environ.get("RESUME_ANALYZER_WARM_UP"):
+        # Connection setup happens in the background instead of on the first click.
+        threading.Thread(target=shared.warm_up, name="model-warm-up", daemon=True).start()
+    interval = float(os.environ.get("RESUME_ANALYZER_HEALTH_CHECK_INTERVAL", 0))
+    if interval:
+        shared.start_health_checks(interval)
+    return shared
+
+def get_model():
+    # Built on the first analysis request rather than on every page load, so
+    # the Gemini SDK is only imported once someone actually asks for one
+    # (unless RESUME_ANALYZER_WARM_UP asks for it at startup).
+    shared = get_shared_model()
+    return shared, shared.generation_config
 
 # --- Helper Functions (Your original code) ---
-def extract_text_from_file(file):
+@st.cache_resource
+def get_parse_cache():
+    # One cache per process, shared by every session. Set RESUME_ANALYZER_CACHE_DIR
+    # to also keep parsed texts on disk across restarts.
+    return ParseCache(disk_dir=os.environ.get("RESUME_ANALYZER_CACHE_DIR") or None)
+
+@st.cache_resource
+def get_response_cache():
+    return ResponseCache(os.environ.get("RESUME_ANALYZER_LLM_CACHE", os.path.join(".cache", "llm_responses.sqlite3")))
+
+@st.cache_resource
+def start_metrics_exporter():
+    # RESUME_ANALYZER_METRICS_PORT serves /metrics; RESUME_ANALYZER_METRICS_LOG
+    # appends every timing span to a JSON-lines file.
+    return metrics.configure_from_env()
+
+@st.cache_resource
+def get_job_library():
+    # Saved roles, preprocessed once into a memory-mapped library and rebuilt
+    # at startup if the folder changed. None when there is no folder.
+    source_dir = os.environ.get("RESUME_ANALYZER_JD_DIR", "SampleJOBDesc")
+    if not os.path.isdir(source_dir):
+        return None
+    return open_library(source_dir, os.environ.get("RESUME_ANALYZER_JD_LIBRARY", DEFAULT_LIBRARY_DIR))
+
+def saved_role_picker(picker_key, text_key):
+    # Picking a role fills the job description box below it; the callback
+    # runs before the box is rendered, so it may set the box's value.
+    library = get_job_library()
+    if not library:
+        return None
+
+    def fill():
+        role = st.session_state[picker_key]
+        if role:
+            st.session_state[text_key] = library.text(role)
+
+    return st.selectbox(
+        "Start from a saved role",
+        [""] + [role["id"] for role in library.roles],
+        format_func=lambda role: library.title(role) if role else "Paste your own job description",
+        key=picker_key,
+        on_change=fill,
+    )
+
+@st.cache_resource
+def get_scheduler():
+    # Shared by every session in this process so the quota is enforced globally.
+    return LLMScheduler(
+        requests_per_minute=int(os.environ.get("RESUME_ANALYZER_RPM", 60)),
+        burst=int(os.environ.get("RESUME_ANALYZER_BURST", 10)),
+        max_concurrency=int(os.environ.get("RESUME_ANALYZER_MAX_CONCURRENCY", 4)),
+    )
+
+def llm_options():
+    # Everything generate_text needs from session_state, read on the script
+    # thread so the options can be handed to worker threads.
+    return dict(
+        cache=get_response_cache(),
+        bypass_cache=st.session_state.get("bypass_llm_cache", False),
+        scheduler=get_scheduler(),
+        session_id=st.session_state.session_id,
+    )
+
+@st.cache_resource
+def get_job_queue():
+    # Long analyses run on these workers instead of in the script run, so a
+    # rerun or a reconnect does not cut them short. The runner only touches
+    # process-wide objects; the model is looked up on the first job.
+    cache, scheduler = get_response_cache(), get_scheduler()
+    shared = []
+
+    def run_job(feature, prompt, options):
+        if not shared:
+            shared.append(get_shared_model())
+        model = shared[0]
+        return generate_text(model, prompt, model.generation_config, feature=feature, cache=cache, scheduler=scheduler, **options)
+
+    return JobQueue(
+        os.environ.get("RESUME_ANALYZER_JOBS", os.path.join(".cache", "jobs.sqlite3")),
+        run_job,
+        workers=int(os.environ.get("RESUME_ANALYZER_JOB_WORKERS", 2)),
+    )
+
+def run_in_background(result_key, prompt, feature):
+    # Queue the analysis, or join the identical one already queued; its id is
+    # kept in session_state and its result lands in ``results`` when done.
+    options = llm_options()
+    options = {"bypass_cache": options["bypass_cache"], "session_id": options["session_id"]}
+    job_id = get_job_queue().submit(st.session_state.session_id, feature, result_key, prompt, options)
+    st.session_state.setdefault("jobs", {})[result_key] = job_id
+
+def deliver_jobs():
+    # Copy finished background results into this session's results. Jobs are
+    # looked up by session id, so ones submitted before a reconnect count too.
+    # Failures are kept for the next full run to show, since the poller
+    # reruns the page right after delivering.
+    queue = get_job_queue()
+    pending = {}
+    for job in queue.undelivered(st.session_state.session_id):
+        if job.status == "done":
+            results[job.result_key] = job.result
+        elif job.status == "failed":
+            st.session_state.setdefault("job_errors", []).append(job.error)
+        else:
+            pending[job.result_key] = job.id
+            continue
+        queue.mark_delivered(job.id)
+    st.session_state.jobs = pending
+    return pending
+
+def background_status(result_key, label):
+    if result_key in st.session_state.get("jobs", {}):
+        st.info(f"⏳ {label} is being generated in the background. It will appear here when ready; you can keep working or reload the page.")
+        return True
+    return False
+
+# Read as it is written, so it streams into the page unless streaming is off.
+STREAMED_FEATURES = {"enhancement"}
+
+def use_background_jobs(feature):
+    if feature in STREAMED_FEATURES and st.session_state.get("stream_responses", True):
+        return False
+    return st.session_state.get("background_jobs", True)
+
+def run_prompt(prompt, feature):
+    model, generation_config = get_model()
+    options = dict(llm_options(), feature=feature)
+    if not st.session_state.get("stream_responses", True):
+        return generate_text(model, prompt, generation_config, **options)
+
+    # Render partial Markdown as it arrives; the caller's normal result view
+    # (scores, tables, charts) takes over once the full text is returned.
+    placeholder = st.empty()
+    text = ""
+    for chunk in stream_text(model, prompt, generation_config, **options):
+        text += chunk
+        placeholder.markdown(text + "▌")
+    placeholder.empty()
+    return text
+
+@st.cache_resource
+def get_shared_cache():
+    # Resume-independent answers (market trends) shared by every user.
+    return SharedCache(os.environ.get("RESUME_ANALYZER_SHARED_CACHE", os.path.join(".cache", "shared_results.sqlite3")))
+
+@st.cache_resource
+def get_title_index():
+    # Seeded with the saved roles and every title already in the shared cache,
+    # so typos and variants of popular roles land on the same entry.
+    library = get_job_library()
+    return TitleIndex([role["title"] for role in (library.roles if library else [])] + get_shared_cache().titles("trends"))
+
+@st.cache_resource
+def get_near_duplicate_index():
+    # Only its hash functions are shared; each session keeps the signatures
+    # of its own analysed resumes, so one user's resume never matches another's.
+    return NearDuplicateIndex(float(os.environ.get("RESUME_ANALYZER_DEDUPE_THRESHOLD", DEFAULT_THRESHOLD)))
+
+def remember_analysis(feature, text, job_description=""):
+    st.session_state.setdefault("analyzed_resumes", {})[feature] = {
+        "signature": get_near_duplicate_index().signature(text),
+        "digest": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+        "job_description": job_description,
+    }
+
+def similar_analysis(feature, text, job_description=""):
+    # Similarity of ``text`` to the resume behind this session's current
+    # ``feature`` result when it is a near-duplicate but not identical, else None.
+    prior = st.session_state.get("analyzed_resumes", {}).get(feature)
+    if prior is None or prior["job_description"] != job_description:
+        return None
+    if prior["digest"] == hashlib.sha256(text.encode("utf-8")).hexdigest():
+        return None
+    index = get_near_duplicate_index()
+    score = similarity(index.signature(text), prior["signature"])
+    return score if score >= index.threshold else None
+
+def prepare_trends(target_job):
+    # Everything from session_state and st.cache_resource is read here; the
+    # returned function can run on a worker thread and returns (text, cache status).
+    model, generation_config = get_model()
+    shared_cache = get_shared_cache()
+    options = dict(llm_options(), cache=None, session_id="shared-cache")
+    force = options.pop("bypass_cache")
+    key, title = get_title_index().resolve(target_job)
+
+    def compute():
+        return generate_text(model, build_trends_prompt(title), generation_config, feature="trends", **options)
+
+    return title, lambda: shared_cache.get_or_compute("trends", f"{model.model_name}|{key}", title, compute, force=force)
+
+def run_incremental_analysis(feature, text, job_description=None):
+    model, generation_config = get_model()
+    options = llm_options()
+
+    def generate(prompt, section_feature):
+        return generate_text(model, prompt, generation_config, feature=section_feature, **options)
+
+    store = st.session_state.setdefault("incremental_store", {})
+    result, report = run_incremental(feature, text, generate, store, job_description=job_description)
+    total = len(report.analyzed) + len(report.reused)
+    st.caption(f"Re-analyzed {len(report.analyzed)} of {total} sections; reused findings for {len(report.reused)}.")
+    return result
+
+def prompt_resume(text, feature):
+    # The editor keeps the text exactly as extracted; prompts get a cleaned
+    # copy trimmed to the feature's token budget.
+    if not st.session_state.get("compact_prompts", True):
+        return text
+    with metrics.span("compaction", feature=feature):
+        return compact_resume(text, feature)[0]
+
+# Upper bound on simultaneous Gemini calls from one "Run Full Report" click.
+FULL_REPORT_WORKERS = 6
+
+def _digest(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def store_structured(analysis):
+    # Replaces every result the structured report owns, so a tab it has
+    # nothing for does not keep an answer from an earlier run. The validated
+    # fields are kept with the digest of the text they belong to.
+    rendered = render_results(analysis)
+    results.update(rendered)
+    st.session_state.structured_fields = {
+        key: dict(value, digest=_digest(rendered[key])) for key, value in result_fields(analysis).items()
+    }
+
+def structured_field(result_key, name):
+    # A validated value behind ``result_key``'s text, or None once that
+    # result has been replaced by any other analysis.
+    fields = st.session_state.get("structured_fields", {}).get(result_key)
+    text = results[result_key]
+    if fields is None or not text or fields["digest"] != _digest(text):
+        return None
+    return fields[name]
+
+def run_full_report(tasks):
+    # tasks: (feature, result key, label, prompt or a prepared function). Calls
+    # run in worker threads; session_state and widgets are only touched from this thread.
+    # The "structured" task fills several tabs from one validated JSON answer.
     try:
-        if file.name.endswith('.pdf'):
-            doc = fitz.open(stream=file.read(), filetype="pdf")
-            text = "".join(page.get_text() for page in doc)
-        elif file.name.endswith('.docx'):
-            doc = docx.Document(file)
-            text = "\n".join([para.text for para in doc.paragraphs])
+        model, generation_config = get_model()
+    except Exception as e:
+        st.error(f"Error configuring the AI model: {e}")
+        return
+    options = llm_options()
+    progress = st.progress(0.0, text=f"0 of {len(tasks)} analyses complete")
+    failed = 0
+    with st.status("Running full report...", expanded=True) as status:
+        rows = {}
+        for feature, _, label, _ in tasks:
+            rows[feature] = st.empty()
+            rows[feature].markdown(f"⏳ {label}")
+        def generate_structured(prompt):
+            json_config = json_generation_config(generation_config)
+            return analyze(lambda p: generate_text(model, p, json_config, feature="structured", validate=parse_analysis,
+                                                   **options), prompt)
+
+        def submit(feature, prompt):
+            if feature == "structured":
+                return pool.submit(generate_structured, prompt)
+            if callable(prompt):
+                return pool.submit(prompt)
+            return pool.submit(generate_text, model, prompt, generation_config, feature=feature, **options)
+
+        with ThreadPoolExecutor(max_workers=min(FULL_REPORT_WORKERS, len(tasks))) as pool:
+            futures = {
+                submit(feature, prompt): (feature, state_key, label)
+                for feature, state_key, label, prompt in tasks
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                feature, state_key, label = futures[future]
+                try:
+                    if feature == "structured":
+                        store_structured(future.result())
+                    else:
+                        results[state_key] = future.result()
+                    rows[feature].markdown(f"✅ {label}")
+                except Exception as e:
+                    failed += 1
+                    rows[feature].markdown(f"❌ {label}: {e}")
+                progress.progress(done / len(tasks), text=f"{done} of {len(tasks)} analyses complete")
+        if failed:
+            status.update(label=f"Full report finished with {failed} failed analyses", state="error")
         else:
-            st.error("Unsupported file type.")
-            return None
-        return text if text.strip() else None
+            status.update(label="Full report ready", state="complete", expanded=False)
+
+def extract_text_from_file(file):
+    with metrics.span("extract", extension=os.path.splitext(file.name)[1].lower()) as fields:
+        text = _extract_text_from_file(file)
+        fields["chars"] = len(text or "")
+    return text
+
+def _extract_text_from_file(file):
+    if not is_supported(file.name):
+        st.error("Unsupported file type.")
+        return None
+    limits = ExtractionLimits.from_env()
+    try:
+        # Size and magic-byte checks happen before hashing or parsing anything.
+        check_upload(file.getbuffer()[:8].tobytes(), file.size, file.name, limits)
+        # Limits are part of the key so a cached text never bypasses stricter ones.
+        return get_parse_cache().get_or_parse(
+            file.getvalue(), file.name, f"{EXTRACTOR_VERSION}-{limits.max_pages}-{limits.max_chars}",
+            # Pages are read in this process: a pool per upload measured slower
+            # than sequential reading (see benchmarks/parallel_extraction.py).
+            lambda data, name: parse_document(data, name, limits, workers=1),
+        )
+    except ExtractionError as e:
+        st.error(str(e))
+        return None
     except Exception as e:
         st.error(f"An error occurred while reading the file: {e}")
         return None
 
+start_metrics_exporter()
+if os.environ.get("RESUME_ANALYZER_WARM_UP"):
+    get_shared_model()
+
 # --- UI LOGIC with Top Dashboard (NO Sidebar) ---
 st.title("✨ AI Career Toolkit")
 
@@ -151,11 +508,96 @@ with st.container():
     with col1:
         st.header("1. Upload Resume")
         uploaded_file = st.file_uploader("Upload your resume (PDF or DOCX)", type=["pdf", "docx"], label_visibility="collapsed")
+        parse_stats = get_parse_cache().stats()
+        st.caption(f"Parse cache: {parse_stats['hits'] + parse_stats['disk_hits']} hits · {parse_stats['misses']} misses · {parse_stats['entries']} documents")
     
     with col2:
         st.header("2. Enter Target Job")
         target_job = st.text_input("e.g., Senior Python Developer", help="Used for targeted analysis.")
 
+if st.session_state.get("jobs") or "jobs" not in st.session_state:
+    # Checked on every run while something is queued, and once per session
+    # (a reconnected page may have jobs from before).
+    deliver_jobs()
+for job_error in st.session_state.pop("job_errors", []):
+    st.error(f"A background analysis failed: {job_error}")
+
+@st.fragment(run_every=2)
+def watch_background_jobs():
+    # Polls only while jobs are pending; a finished job reruns the page to show it.
+    if not st.session_state.get("jobs"):
+        return
+    pending = st.session_state.jobs
+    if deliver_jobs() != pending:
+        st.rerun()
+    st.caption(f"⏳ {len(pending)} analysis{'es' if len(pending) > 1 else ''} running in the background")
+
+watch_background_jobs()
+
+with st.expander("⚙️ Advanced settings"):
+    backend = os.environ.get("RESUME_ANALYZER_BACKEND", "gemini")
+    if backend != "gemini":
+        st.caption(f"Model backend: **{backend}** (set by RESUME_ANALYZER_BACKEND)")
+    st.toggle(
+        "Stream responses",
+        value=True,
+        key="stream_responses",
+        help="Show each analysis as it is being written instead of waiting for the full answer.",
+    )
+    st.toggle(
+        "Run long analyses in the background",
+        value=True,
+        key="background_jobs",
+        help="The roadmap, career opportunities and cover letter are generated by a background worker, so clicking elsewhere or reloading the page does not interrupt them. They are not streamed. The enhanced resume also runs in the background when streaming is off.",
+    )
+    st.toggle(
+        "Compact resume before prompting",
+        value=True,
+        key="compact_prompts",
+        help="Strip PDF artifacts (broken hyphenation, repeated headers, extra whitespace) and trim low-priority sections of very long resumes to each analysis's token budget.",
+    )
+    st.toggle(
+        "Single-request report",
+        key="structured_report",
+        help="Run Full Report asks for the scores, ATS keywords, career paths and trends in one structured (JSON) request instead of four, then fills in each tab.",
+    )
+    st.toggle(
+        "Incremental re-analysis",
+        key="incremental_analysis",
+        help="General and ATS analysis review the resume section by section and only resend sections you edited since the last run.",
+    )
+    st.toggle(
+        "Reuse analysis for near-identical resumes",
+        key="reuse_similar_analysis",
+        help="When the resume is nearly the same as the one last analysed (a new phone number, a reordered skill), General and ATS analysis show the earlier result instead of calling the model again.",
+    )
+    st.toggle(
+        "Bypass response cache",
+        key="bypass_llm_cache",
+        help="Always call Gemini instead of reusing a cached answer for an identical request. Fresh answers still refresh the cache.",
+    )
+    st.toggle(
+        "Show performance panel",
+        key="show_performance_panel",
+        help="Time spent per stage (parsing, prompt building, model calls, rendering) at the bottom of the page.",
+    )
+    llm_stats = get_response_cache().stats()
+    st.caption(f"Response cache: {llm_stats['hits']} hits · {llm_stats['misses']} misses · {llm_stats['entries']} stored answers ({llm_stats['bytes'] / 1024:.0f} KB)")
+    store_stats, session_stats = get_session_store().stats(), results.stats()
+    st.caption(
+        f"Stored results: this session {session_stats['text_bytes'] / 1024:.0f} KB of text in "
+        f"{session_stats['memory_bytes'] / 1024:.0f} KB ({session_stats['disk_bytes'] / 1024:.0f} KB on disk) · "
+        f"all {store_stats['sessions']} sessions {store_stats['memory_bytes'] / 1024 / 1024:.1f} MB in memory, "
+        f"{store_stats['disk_bytes'] / 1024 / 1024:.1f} MB on disk, {store_stats['dedup_saved_bytes'] / 1024:.0f} KB saved by sharing"
+    )
+    jobs = get_job_queue().stats()
+    st.caption(f"Background jobs: {jobs['queued']} queued · {jobs['running']} running · {jobs['done']} done · {jobs['failed']} failed since start")
+    queue = get_scheduler().metrics()
+    st.caption(
+        f"Request queue: {queue['queue_depth']} waiting · {queue['active']}/{queue['max_concurrency']} running · "
+        f"avg wait {queue['wait_avg_s']:.1f}s (p95 {queue['wait_p95_s']:.1f}s) · {queue['retries']} retries"
+    )
+
 st.divider()
 
 # Main panel logic
@@ -178,8 +620,47 @@ else:
         with left_column:
             st.subheader("Live Resume Editor")
             edited_text = st.text_area("Resume Content", resume_text, height=700, label_visibility="collapsed")
+            if st.session_state.get("compact_prompts", True):
+                _, compaction = compact_resume(edited_text, "general")
+                st.caption(f"Prompt-ready resume: ~{compaction.tokens_before:,} → ~{compaction.tokens_after:,} tokens ({compaction.saved_ratio:.0%} smaller)")
+            # Parsed once per version of the text and shared with the scorers and prompts.
+            resume = parse_resume(edited_text)
+            found = [s.heading.title() for s in resume.sections if s.heading]
+            contact = [label for label, value in (("email", resume.contact.email), ("phone", resume.contact.phone)) if value]
+            st.caption(
+                f"Found {len(found)} sections ({', '.join(found) or 'none'}) · {len(resume.experience)} roles · "
+                f"{len(resume.skills)} skills · contact: {', '.join(contact + [f'{len(resume.contact.links)} links'])}"
+            )
 
         with right_column:
+            # The job description boxes live further down in the tabs; their keyed
+            # values from the previous run are already in session_state here.
+            report_job_desc = st.session_state.get("ats_job_description") or st.session_state.get("cover_letter_job_description", "")
+            if st.button("🚀 Run Full Report", help="Runs every available analysis at once instead of one tab at a time."):
+                if st.session_state.get("structured_report"):
+                    # General, ATS, opportunities and trends in a single request.
+                    report_tasks = [("structured", None, "Scores, ATS keywords, career paths and trends",
+                                     build_structured_prompt(prompt_resume(edited_text, "structured"), report_job_desc, target_job))]
+                else:
+                    report_tasks = [("general", "general_result", "General analysis", build_general_prompt(prompt_resume(edited_text, "general")))]
+                    if report_job_desc:
+                        report_tasks.append(("ats", "ats_result", "ATS analysis", build_ats_prompt(prompt_resume(edited_text, "ats"), report_job_desc)))
+                    if target_job:
+                        report_tasks.append(("opportunities", "opportunity_result", "Career opportunities", build_opportunity_prompt(prompt_resume(edited_text, "opportunities"), target_job)))
+                        run_trends = prepare_trends(target_job)[1]
+                        report_tasks.append(("trends", "trends_result", "Market trends", lambda: run_trends()[0]))
+                if report_job_desc:
+                    report_tasks.append(("cover_letter", "cover_letter_result", "Cover letter", build_cover_letter_prompt(prompt_resume(edited_text, "cover_letter"), report_job_desc)))
+                if target_job:
+                    report_tasks.append(("roadmap", "roadmap_result", "Learning roadmap", build_roadmap_prompt(prompt_resume(edited_text, "roadmap"), target_job, st.session_state.get("roadmap_personalization", ""))))
+                run_full_report(report_tasks)
+                if results.general_result:
+                    remember_analysis("general", edited_text)
+                if results.ats_result:
+                    remember_analysis("ats", edited_text, report_job_desc)
+                if not report_job_desc or not target_job:
+                    st.caption("Add a target job and a job description to include every analysis in the report.")
+
             tab1, tab2, tab3, tab4 = st.tabs(["📄 Resume Feedback", "🗺️ Learning Roadmap", "🎯 Career Insights", "✍️ Cover Letter"])
             
             # --- Tab 1: Your original code with full prompts ---
@@ -187,76 +668,74 @@ else:
                 st.subheader("Resume Analysis")
                 st.markdown("##### Get General Feedback")
                 st.info("Get an overall score and general feedback from our AI recruiter.")
-                if st.button("Run General Analysis", type="primary"):
+                reuse_general = st.session_state.get("reuse_similar_analysis") and results.general_result
+                if st.button("Run General Analysis", type="primary") and not (reuse_general and similar_analysis("general", edited_text)):
                     with st.spinner("Running general analysis..."):
-                        live_editor_prompt = f"""
-                        You are a top-tier executive recruiter from a leading tech firm like Google or Goldman Sachs, known for your brutally honest but invaluable feedback. Your task is to conduct a professional-grade analysis of the following resume.
-                        **Analysis Steps:**
-                        1.  **Headline:** Provide a single, powerful headline that describes the candidate's professional identity.
-                        2.  **Overall Resume Score:** Provide a score on its own line in the format: `Resume Score: [score]/100`.
-                        3.  **Candidate Archetype:** Classify the candidate into a professional archetype (e.g., 'The Specialist', 'The Generalist', 'The Rising Star', 'The Career Transitioner') and provide a one-sentence justification.
-                        4.  **Verdict:** In one bolded sentence, state whether you would move forward with this candidate for an interview and why.
-                        5.  **Strengths vs. Weaknesses:** Create a two-column Markdown table. The left column will list the top 3 strengths. The right column will list the top 3 weaknesses.
-                        6.  **Actionable Improvements:** Provide a bulleted list of the three most critical, specific, and actionable pieces of advice the candidate can implement right now.
-                        **Perform this analysis on the following resume text:**
-                        ---
-                        {edited_text}
-                        ---
-                        """
+                        live_editor_prompt = build_general_prompt(prompt_resume(edited_text, "general"))
                         try:
-                            response = model.generate_content(live_editor_prompt, generation_config=generation_config)
-                            st.session_state.general_result = response.text
-                            st.session_state.ats_result = "" 
+                            if st.session_state.get("incremental_analysis"):
+                                results.general_result = run_incremental_analysis("general", edited_text)
+                            else:
+                                results.general_result = run_prompt(live_editor_prompt, "general")
+                            remember_analysis("general", edited_text)
+                            results.ats_result = "" 
                         except Exception as e:
                             st.error(f"An error occurred during analysis: {e}")
                 
-                if st.session_state.general_result:
-                    response_text = st.session_state.general_result
-                    score = 0
-                    match = re.search(r'(\d+)\s*/\s*100', response_text)
-                    if match:
-                        score = int(match.group(1))
+                if results.general_result:
+                    response_text = results.general_result
+                    score = structured_field("general_result", "score")
+                    if score is None:
+                        score = parse_score(response_text)
+                    if score is not None:
                         st.metric(label="General Score", value=f"{score} / 100")
+                    similar = similar_analysis("general", edited_text)
+                    if similar:
+                        st.caption(f"🔁 Similar to previous resume ({similar:.0%}): this feedback is for the earlier version.")
                     with st.expander("See Detailed General Feedback"):
                         st.markdown(response_text)
 
                 st.divider()
 
                 st.markdown("##### Get ATS Compatibility Score")
-                st.info("Paste a job description to get a specific ATS score and keyword analysis.")
-                job_desc_for_ats = st.text_area("Paste the Job Description here for ATS Analysis")
-                if st.button("Run ATS Analysis", disabled=not job_desc_for_ats, type="primary"):
+                st.info("Paste a job description to get an instant keyword score, then run the AI analysis for detailed feedback.")
+                saved_role = saved_role_picker("ats_saved_role", "ats_job_description")
+                job_desc_for_ats = st.text_area("Paste the Job Description here for ATS Analysis", key="ats_job_description")
+                if job_desc_for_ats:
+                    # Local keyword match: no network call, recomputed on every edit.
+                    # An unedited saved role starts from its precomputed terms.
+                    library = get_job_library()
+                    if saved_role and job_desc_for_ats == library.text(saved_role):
+                        local_ats = library.score_ats(saved_role, edited_text)
+                    else:
+                        local_ats = score_ats(edited_text, job_desc_for_ats)
+                    st.metric(label="Instant ATS Score (keyword match)", value=f"{local_ats.score} / 100")
+                    st.markdown(format_keyword_table(local_ats.missing_keywords, local_ats.present_keywords))
+                reuse_ats = st.session_state.get("reuse_similar_analysis") and results.ats_result
+                if st.button("Run ATS Analysis", disabled=not job_desc_for_ats, type="primary") and not (
+                        reuse_ats and similar_analysis("ats", edited_text, job_desc_for_ats)):
                     with st.spinner("Running ATS simulation..."):
-                        ats_prompt = f"""
-                        You are an advanced Applicant Tracking System (ATS) combined with an expert HR recruiter. Your primary goal is to analyze the provided resume against the provided job description.
-                        **Analysis Steps:**
-                        1.  **ATS Compatibility Score:** Provide an ATS compatibility score on its own line in the format: `ATS Score: [score]/100`.
-                        2.  **Keyword Analysis:** Compare the resume to the job description. Create a two-column Markdown table. The left column will list the top 5-7 most important keywords missing from the resume. The right column will list the top keywords that are correctly included.
-                        3.  **Formatting Check:** Analyze the resume for any formatting that could be problematic for an ATS.
-                        4.  **Actionable Feedback:** Provide a bulleted list of the top 3 most critical changes the user must make to improve their ATS score for this specific job.
-                        **Perform this ATS analysis:**
-                        ---
-                        **USER'S RESUME:**
-                        {edited_text}
-                        ---
-                        **TARGET JOB DESCRIPTION:**
-                        {job_desc_for_ats}
-                        ---
-                        """
+                        ats_prompt = build_ats_prompt(prompt_resume(edited_text, "ats"), job_desc_for_ats)
                         try:
-                            response = model.generate_content(ats_prompt, generation_config=generation_config)
-                            st.session_state.ats_result = response.text
-                            st.session_state.general_result = "" 
+                            if st.session_state.get("incremental_analysis"):
+                                results.ats_result = run_incremental_analysis("ats", edited_text, job_desc_for_ats)
+                            else:
+                                results.ats_result = run_prompt(ats_prompt, "ats")
+                            remember_analysis("ats", edited_text, job_desc_for_ats)
+                            results.general_result = "" 
                         except Exception as e:
                             st.error(f"An error occurred during analysis: {e}")
                 
-                if st.session_state.ats_result:
-                    response_text = st.session_state.ats_result
-                    score = 0
-                    match = re.search(r'(\d+)\s*/\s*100', response_text)
-                    if match:
-                        score = int(match.group(1))
+                if results.ats_result:
+                    response_text = results.ats_result
+                    score = structured_field("ats_result", "score")
+                    if score is None:
+                        score = parse_score(response_text)
+                    if score is not None:
                         st.metric(label="ATS Score", value=f"{score} / 100")
+                    similar = similar_analysis("ats", edited_text, job_desc_for_ats)
+                    if similar:
+                        st.caption(f"🔁 Similar to previous resume ({similar:.0%}): this feedback is for the earlier version.")
                     with st.expander("See Detailed ATS Feedback"):
                         st.markdown(response_text)
 
@@ -264,31 +743,22 @@ else:
 
                 if st.button("✨ Generate Enhanced Version", type="primary"):
                     with st.spinner("Rewriting your resume for maximum impact..."):
-                        enhancement_prompt = f"""
-                        You are a world-class resume writer and editor for a top tech company. Your task is to take the user's resume text and rewrite it from scratch to be as powerful, professional, and impactful as possible.
-                        **Instructions:**
-                        1.  Preserve all original facts, job titles, companies, and dates. Do not invent new experiences.
-                        2.  Rewrite every bullet point to use the STAR (Situation, Task, Action, Result) method. Emphasize quantifiable results.
-                        3.  Ensure the language is professional, confident, and uses strong action verbs.
-                        4.  Correct any spelling or grammar mistakes.
-                        5.  Structure the output in a clean, standard resume format.
-                        **Rewrite this resume:**
-                        ---
-                        {edited_text}
-                        ---
-                        """
+                        enhancement_prompt = build_enhancement_prompt(prompt_resume(edited_text, "enhancement"))
                         try:
-                            response = model.generate_content(enhancement_prompt, generation_config=generation_config)
-                            st.session_state.enhanced_resume = response.text
+                            if use_background_jobs("enhancement"):
+                                run_in_background("enhanced_resume", enhancement_prompt, "enhancement")
+                            else:
+                                results.enhanced_resume = run_prompt(enhancement_prompt, "enhancement")
                         except Exception as e:
                             st.error(f"An error occurred during enhancement: {e}")
 
-                if st.session_state.enhanced_resume:
+                background_status("enhanced_resume", "Your enhanced resume")
+                if results.enhanced_resume:
                     with st.expander("View AI-Enhanced Resume Version", expanded=True):
-                        st.code(st.session_state.enhanced_resume)
+                        st.code(results.enhanced_resume)
                         st.download_button(
                             label="Download Enhanced Resume as TXT",
-                            data=st.session_state.enhanced_resume,
+                            data=results.enhanced_resume,
                             file_name="enhanced_resume.txt",
                             mime="text/plain"
                         )
@@ -296,101 +766,73 @@ else:
             # --- Tab 2: Your original code with full prompts ---
             with tab2:
                 st.subheader("Your Personalized Learning Roadmap")
-                roadmap_personalization = st.text_area("Add any personalizations (e.g., 'create a 60-day plan', 'focus on free courses')")
+                roadmap_personalization = st.text_area("Add any personalizations (e.g., 'create a 60-day plan', 'focus on free courses')", key="roadmap_personalization")
                 if st.button("Generate My Roadmap", disabled=not target_job, type="primary"):
                     with st.spinner(f"Building your roadmap for {target_job}..."):
-                        roadmap_prompt = f"""
-                        You are a world-class academic advisor and career coach from an elite university's career services department. Your task is to create a personalized, flexible learning roadmap for a user who wants to become a "{target_job}".
-                        **Instructions:**
-                        1.  Analyze the user's resume to identify their current skill level.
-                        2.  Identify the top 3 most critical **technical skill gaps**.
-                        3.  Identify the single most important **soft skill** they should develop for this role.
-                        4.  For each of the 3 technical gaps, create a "Learning Module" containing a concept, a recommended paid course, a free resource, and a portfolio project idea.
-                        5.  Create a final "Soft Skill Development" module with actionable advice.
-                        6.  **Personalization:** The user has provided the following special request: "{roadmap_personalization}". You must incorporate this request into the plan.
-                        **Generate this roadmap based on the following resume text:**
-                        ---
-                        {edited_text}
-                        ---
-                        """
+                        roadmap_prompt = build_roadmap_prompt(prompt_resume(edited_text, "roadmap"), target_job, roadmap_personalization)
                         try:
-                            roadmap_response = model.generate_content(roadmap_prompt, generation_config=generation_config)
-                            st.session_state.roadmap_result = roadmap_response.text
+                            if use_background_jobs("roadmap"):
+                                run_in_background("roadmap_result", roadmap_prompt, "roadmap")
+                            else:
+                                results.roadmap_result = run_prompt(roadmap_prompt, "roadmap")
                         except Exception as e:
                             st.error(f"An error occurred during roadmap generation: {e}")
                 
-                if not target_job and not st.session_state.roadmap_result:
+                background_status("roadmap_result", "Your roadmap")
+                if not target_job and not results.roadmap_result:
                     st.warning("Please enter a Target Job Title in the sidebar to enable this feature.")
 
-                if st.session_state.roadmap_result:
-                    st.markdown(st.session_state.roadmap_result)
+                if results.roadmap_result:
+                    st.markdown(results.roadmap_result)
             
             # --- Tab 3: Your original code with full prompts ---
             with tab3:
                 st.subheader("Career Opportunity & Market Insights")
                 if st.button("Find My Opportunities", disabled=not target_job, type="primary"):
                     with st.spinner("Scanning for career paths..."):
-                        opportunity_prompt = f"""
-                        You are a seasoned career strategist and futurist. Analyze the resume for the target role of "{target_job}".
-                        **Analysis:**
-                        1.  **Fit Score for Target Role:** Provide a "Fit Score" from 1-100 and a brief justification.
-                        2.  **Recruiter's Red Flag:** Identify the single biggest potential "red flag" a recruiter might see in this resume for this specific role and suggest how to mitigate it.
-                        3.  **Career Suggestions:** Suggest and score three career opportunities:
-                            * **Obvious Fit:** The most direct path. Provide an 'Opportunity Score' (1-100) and justification.
-                            * **Related Fit:** A similar role in a different industry. Provide score and justification.
-                            * **Wildcard Fit:** An unexpected but high-potential role. Provide score and justification.
-                        **Perform this analysis on the following resume text:**
-                        ---
-                        {edited_text}
-                        ---
-                        """
+                        opportunity_prompt = build_opportunity_prompt(prompt_resume(edited_text, "opportunities"), target_job)
                         try:
-                            response = model.generate_content(opportunity_prompt, generation_config=generation_config)
-                            st.session_state.opportunity_result = response.text
+                            if use_background_jobs("opportunities"):
+                                run_in_background("opportunity_result", opportunity_prompt, "opportunities")
+                            else:
+                                results.opportunity_result = run_prompt(opportunity_prompt, "opportunities")
                         except Exception as e:
                             st.error(f"An error occurred during analysis: {e}")
                 
-                if not target_job and not st.session_state.opportunity_result:
+                background_status("opportunity_result", "Your career opportunities report")
+                if not target_job and not results.opportunity_result:
                     st.warning("Please enter a Target Job Title in the sidebar to enable this feature.")
 
-                if st.session_state.opportunity_result:
-                    st.markdown(st.session_state.opportunity_result)
+                if results.opportunity_result:
+                    st.markdown(results.opportunity_result)
 
                 st.divider()
                 st.subheader("Job Market Future Trends")
                 if st.button("Analyze Market Trends", disabled=not target_job, type="primary"):
                     with st.spinner(f"Analyzing future trends for a {target_job}..."):
-                        trends_prompt = f"""
-                        Act as a senior market analyst from Gartner providing a direct report.
-                        Your task is to generate a job market trend analysis for the role of "{target_job}".
-                        **Output Requirements:**
-                        1.  **Executive Summary:** A concise, one-paragraph summary of the future outlook for this role. This summary must describe strong, positive growth.
-                        2.  **Data Table:** A Markdown table with columns 'Year' and 'Demand Growth (%)', showing plausible data for the last 3 years and a forecast for the next 3.
-                        **CRITICAL RULE:** For a high-growth role like AI Engineer or Data Scientist, the numbers in the 'Demand Growth (%)' column MUST show a generally increasing trend for future years. Do not show a declining trend. All numbers must be positive.
-                        **Constraint:**
-                        - Do not include any conversational introductions, questions, or conclusions.
-                        - Your entire output must consist of only the Executive Summary and the Markdown Data Table.
-                        Generate the report now.
-                        """
                         try:
-                            response = model.generate_content(trends_prompt, generation_config=generation_config)
-                            st.session_state.trends_result = response.text
+                            trends_title, run_trends = prepare_trends(target_job)
+                            results.trends_result, trends_status = run_trends()
+                            if trends_status != "computed":
+                                st.caption(f"Shared market report for “{trends_title}”" + (" (refreshing in the background)" if trends_status == "stale" else ""))
                         except Exception as e:
                             st.error(f"An error occurred during trend analysis: {e}")
 
-                if not target_job and not st.session_state.trends_result:
+                if not target_job and not results.trends_result:
                     st.warning("Please enter a Target Job Title in the sidebar to enable this feature.")
 
-                if st.session_state.trends_result:
-                    trends_text = st.session_state.trends_result
+                if results.trends_result:
+                    trends_text = results.trends_result
                     st.markdown(trends_text)
                     try:
-                        table_rows = re.findall(r'\|\s*(\d{4})\s*\|\s*([\d.-]+)\s*\|', trends_text)
+                        table_rows = structured_field("trends_result", "rows") or parse_trend_rows(trends_text)
                         if table_rows:
+                            import pandas as pd  # only needed for this chart
+
                             df = pd.DataFrame(table_rows, columns=['Year', 'Demand Growth (%)'])
-                            df['Demand Growth (%)'] = pd.to_numeric(df['Demand Growth (%)'])
                             df = df.set_index('Year')
-                            st.line_chart(df)
+                            with metrics.span("render", element="line_chart"):
+                                st.line_chart(df)
                         else:
                             st.info("Could not find table data in the response to generate a graph.")
                     except Exception as e:
@@ -399,37 +841,37 @@ else:
             # --- Tab 4: Your original code with full prompts ---
             with tab4:
                 st.subheader("AI Cover Letter Generator")
-                job_description = st.text_area("Paste the job description here")
+                saved_role_picker("cover_letter_saved_role", "cover_letter_job_description")
+                job_description = st.text_area("Paste the job description here", key="cover_letter_job_description")
                 if st.button("Generate Cover Letter", disabled=not job_description, type="primary"):
                     with st.spinner("Writing a tailored cover letter..."):
-                        cover_letter_prompt = f"""
-                        You are a professional career writer. Your task is to write a concise and compelling cover letter and suggest an email subject line.
-                        **Instructions:**
-                        1.  Write a professional email subject line for the application.
-                        2.  Write a cover letter (no more than 250 words) that highlights the top 2-3 most relevant skills from the resume that match the job description.
-                        **User's Resume:**
-                        ---
-                        {edited_text}
-                        ---
-                        **Target Job Description:**
-                        ---
-                        {job_description}
-                        ---
-                        """
+                        cover_letter_prompt = build_cover_letter_prompt(prompt_resume(edited_text, "cover_letter"), job_description)
                         try:
-                            response = model.generate_content(cover_letter_prompt, generation_config=generation_config)
-                            st.session_state.cover_letter_result = response.text
+                            if use_background_jobs("cover_letter"):
+                                run_in_background("cover_letter_result", cover_letter_prompt, "cover_letter")
+                            else:
+                                results.cover_letter_result = run_prompt(cover_letter_prompt, "cover_letter")
                         except Exception as e:
                             st.error(f"An error occurred during cover letter generation: {e}")
 
-                if not job_description and not st.session_state.cover_letter_result:
+                background_status("cover_letter_result", "Your cover letter")
+                if not job_description and not results.cover_letter_result:
                     st.warning("Please paste a job description to enable this feature.")
 
-                if st.session_state.cover_letter_result:
-                    st.code(st.session_state.cover_letter_result)
+                if results.cover_letter_result:
+                    st.code(results.cover_letter_result)
                     st.download_button(
                         label="Download Cover Letter as TXT",
-                        data=st.session_state.cover_letter_result,
+                        data=results.cover_letter_result,
                         file_name="cover_letter.txt",
                         mime="text/plain"
                     )
+
+# --- Performance panel ---
+# Timed up to here, so a run's own panel is not part of its script time.
+metrics.observe("script_run", time.perf_counter() - script_started)
+if st.session_state.get("show_performance_panel"):
+    st.divider()
+    st.subheader("⏱️ Performance")
+    st.caption("Latency per stage since the server started, across all sessions. Token counts are estimates.")
+    st.dataframe(metrics.snapshot(), hide_index=True, use_container_width=True)
@@ -0,0 +1,50 @@
+"""Prompt token counts before and after resume compaction.
+
+Reports, for every resume in a folder, the estimated tokens each feature
+would embed raw versus compacted, and the total across all seven prompts::
+
+    python benchmarks/compaction_report.py SampleResume
+"""
+
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.compaction import CHARS_PER_TOKEN, FEATURE_BUDGETS, compact_resume  # noqa: E402
+from core.extraction import extract_text_from_path, is_supported  # noqa: E402
+
+# Every feature that embeds the resume ("trends" does not).
+FEATURES = list(FEATURE_BUDGETS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("resume_dir", nargs="?", default=os.path.join(ROOT, "SampleResume"))
+    args = parser.parse_args()
+
+    total_before = total_after = 0
+    for name in sorted(os.listdir(args.resume_dir)):
+        if not is_supported(name):
+            continue
+        text = extract_text_from_path(os.path.join(args.resume_dir, name))
+        if not text:
+            continue
+        print(f"\n{name}")
+        for feature in FEATURES:
+            _, report = compact_resume(text, feature)
+            total_before += report.tokens_before
+            total_after += report.tokens_after
+            trimmed = f"  trimmed: {', '.join(report.trimmed_sections)}" if report.trimmed_sections else ""
+            print(f"  {feature:<14} {report.tokens_before:6,} -> {report.tokens_after:6,} tokens"
+                  f"  ({report.saved_ratio:5.1%} saved){trimmed}")
+
+    if total_before:
+        print(f"\nall prompts: {total_before:,} -> {total_after:,} tokens "
+              f"({1 - total_after / total_before:.1%} saved; estimated at {CHARS_PER_TOKEN} characters per token)")
+
+
+if __name__ == "__main__":
+    main()
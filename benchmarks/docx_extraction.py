@@ -0,0 +1,94 @@
+"""Time and peak memory of DOCX extraction: python-docx against the streaming reader.
+
+Builds a large synthetic resume (paragraphs plus skill tables) and runs each
+strategy in a fresh interpreter, best of ``--repeat`` for time and peak RSS
+for memory. ``chars`` shows what each one found; python-docx's
+``doc.paragraphs`` misses everything inside tables::
+
+    python benchmarks/docx_extraction.py --paragraphs 20000
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+LINE = "Led a cross-functional team to deliver a distributed data platform serving 40M requests/day. "
+
+
+def build_docx(path, paragraphs):
+    import docx
+
+    doc = docx.Document()
+    doc.sections[0].header.paragraphs[0].text = "Jordan Lee · jordan@example.com · +1 555 0100"
+    for number in range(paragraphs):
+        doc.add_paragraph(f"{number + 1}. {LINE}")
+        if number % 50 == 0:
+            table = doc.add_table(rows=4, cols=2)
+            for row, (name, skills) in enumerate([("Languages", "Python, Go, SQL"), ("Cloud", "AWS, GCP"),
+                                                  ("Data", "Spark, Kafka"), ("Ops", "Kubernetes, Terraform")]):
+                table.cell(row, 0).text = name
+                table.cell(row, 1).text = skills
+    doc.save(path)
+
+
+def peak_rss_mb():
+    # VmHWM is the peak resident set of this process image (Linux only).
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def run_strategy(strategy, path, repeat):
+    import docx  # noqa: F401  (imported up front so its footprint is part of the baseline)
+
+    from core.extraction import ExtractionLimits, extract_text_from_path
+
+    limits = ExtractionLimits(max_bytes=1 << 40, max_pages=1 << 20, max_chars=1 << 40)
+    baseline_mb = peak_rss_mb()
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        if strategy == "python-docx":
+            # The original app code: a full document model, paragraphs only.
+            text = "\n".join(para.text for para in docx.Document(path).paragraphs)
+        else:
+            text = extract_text_from_path(path, limits)
+        best = min(best, time.perf_counter() - started)
+    peak_mb = peak_rss_mb()
+    print(f"{strategy:<12} best {best * 1000:8.1f} ms   peak RSS {peak_mb:7.1f} MB  "
+          f"(+{peak_mb - baseline_mb:6.1f} MB over imports)   chars {len(text):,}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paragraphs", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--run", help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run_strategy(args.run, args.path, args.repeat)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "synthetic.docx")
+        build_docx(path, args.paragraphs)
+        print(f"{args.paragraphs} paragraphs, {os.path.getsize(path) / 1024 / 1024:.1f} MB on disk")
+        for strategy in ("python-docx", "streaming"):
+            subprocess.run(
+                [sys.executable, __file__, "--run", strategy, "--path", path, "--repeat", str(args.repeat)],
+                check=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
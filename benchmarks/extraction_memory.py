@@ -0,0 +1,100 @@
+"""Peak memory of PDF extraction on large synthetic documents.
+
+Each strategy runs in a fresh interpreter and reports its peak RSS, so the
+numbers are not polluted by earlier runs::
+
+    python benchmarks/extraction_memory.py --pages 300 --images
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+LINE = "Led a cross-functional team to deliver a distributed data platform serving 40M requests/day. "
+
+
+def build_pdf(path, pages, images):
+    import fitz
+
+    doc = fitz.open()
+    for number in range(pages):
+        page = doc.new_page()
+        page.insert_textbox(fitz.Rect(50, 50, 550, 400), f"Page {number + 1}\n" + LINE * 20, fontsize=9)
+        if images:
+            # A distinct, incompressible image per page, like a scanned portfolio.
+            pixmap = fitz.Pixmap(fitz.csRGB, 300, 300, os.urandom(300 * 300 * 3), False)
+            page.insert_image(fitz.Rect(50, 420, 550, 800), pixmap=pixmap)
+    doc.save(path)
+    doc.close()
+
+
+def peak_rss_mb():
+    # VmHWM is the peak resident set of this process image (Linux only);
+    # unlike ru_maxrss it does not carry over the parent's peak.
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def run_strategy(strategy, path, max_pages):
+    import fitz  # noqa: F401  (imported up front so its footprint is part of the baseline)
+
+    from core.extraction import ExtractionError, ExtractionLimits, iter_pdf_pages, parse_document
+
+    baseline_mb = peak_rss_mb()
+
+    if strategy == "legacy":
+        # The original app code: whole upload in memory, then one big join.
+        with open(path, "rb") as f:
+            doc = fitz.open(stream=f.read(), filetype="pdf")
+        text = "".join(page.get_text() for page in doc)
+        chars = len(text)
+    elif strategy == "bytes":
+        with open(path, "rb") as f:
+            limits = ExtractionLimits(max_bytes=1 << 40, max_pages=1 << 20, max_chars=1 << 40)
+            chars = len(parse_document(f.read(), "resume.pdf", limits))
+    elif strategy == "streaming":
+        limits = ExtractionLimits(max_bytes=1 << 40, max_pages=1 << 20, max_chars=1 << 40)
+        chars = sum(len(text) for text in iter_pdf_pages(path, limits))
+    elif strategy == "rejected":
+        try:
+            chars = sum(len(text) for text in iter_pdf_pages(path, ExtractionLimits(max_pages=max_pages)))
+        except ExtractionError:
+            chars = 0
+    peak_mb = peak_rss_mb()
+    print(f"{strategy:<10} peak RSS {peak_mb:8.1f} MB  (+{peak_mb - baseline_mb:6.1f} MB over imports)   chars {chars:,}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--images", action="store_true", help="Embed an image on every page")
+    parser.add_argument("--max-pages", type=int, default=100, help="Page limit for the rejection case")
+    parser.add_argument("--run", help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run_strategy(args.run, args.path, args.max_pages)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "synthetic.pdf")
+        build_pdf(path, args.pages, args.images)
+        print(f"{args.pages} pages, {os.path.getsize(path) / 1024 / 1024:.1f} MB on disk")
+        for strategy in ("legacy", "bytes", "streaming", "rejected"):
+            subprocess.run(
+                [sys.executable, __file__, "--run", strategy, "--path", path, "--max-pages", str(args.max_pages)],
+                check=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
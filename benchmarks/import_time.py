@@ -0,0 +1,51 @@
+"""Compare cold import time of the core package against the old eager imports.
+
+Each case runs in a fresh interpreter several times and the median wall time
+is reported::
+
+    python benchmarks/import_time.py --runs 7
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = {
+    # What app.py used to import before doing anything else.
+    "eager app dependencies": "import streamlit, google.generativeai, fitz, re, pandas, docx",
+    # What a batch worker or any non-UI caller imports now.
+    "core package": "import core.batch, core.extraction, core.llm, core.llm_cache, core.parse_cache, core.parsing, core.prompts",
+    # First PDF parse pays for PyMuPDF only.
+    "core + PDF extractor": "import core.extraction, fitz",
+}
+
+
+def time_import(statement, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], cwd=ROOT, check=True)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    baseline = time_import("pass", args.runs)
+    print(f"interpreter startup: {baseline * 1000:.0f} ms (subtracted below)")
+    results = {name: time_import(statement, args.runs) - baseline for name, statement in CASES.items()}
+    eager = results["eager app dependencies"]
+    for name, seconds in results.items():
+        print(f"{name:<24} {seconds * 1000:8.0f} ms  ({seconds / eager:.1%} of eager)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+"""How many concurrent sessions one app.py process sustains.
+
+Drives ``--sessions`` simulated users through the app with Streamlit's
+testing API, all in this one process as they would share one server worker
+(and its cached model client, caches, scheduler and job queue). Each user
+uploads a resume, runs the general analysis, the ATS analysis and a cover
+letter, ``--rounds`` times. The model is the stub backend with
+``--latency`` (see ``core.backends.parse_latency``), so only the app's own
+overhead and its handling of slow calls are measured.
+
+Reports flows and actions per second, p50/p95/p99 per action, errors and
+the process's peak RSS; ``--json`` writes the same numbers for comparing
+runs::
+
+    python benchmarks/load_test.py --sessions 20 --latency lognormal:1.5,0.4
+    python benchmarks/load_test.py --sessions 50 --latency constant:0.5 --json load.json
+
+The app's own limits apply (RESUME_ANALYZER_MAX_CONCURRENCY,
+RESUME_ANALYZER_JOB_WORKERS, ...); only the per-minute quota is lifted unless
+set. The response cache is bypassed unless ``--cache`` is given, since every
+simulated user uploads the same resume. Long analyses go through the
+background job queue (as in the app by default) unless ``--inline``; their
+time runs until the result is on the page.
+
+Sharing one process between sessions leans on AppTest internals, so this
+script is written against streamlit==1.47.0, the version pinned in
+requirements.txt; check ``share_test_runtime`` when upgrading.
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+JOB_DESCRIPTION = os.path.join(ROOT, "SampleJOBDesc", "Job Title AI Engineer.txt")
+ACTIONS = ("upload", "general", "ats", "cover_letter")
+
+# Streamlit's test runner has no file uploads, so the app runs under a small
+# driver script that answers the uploader with the resume from the environment.
+DRIVER = """
+import io
+import os
+import runpy
+
+import streamlit as st
+
+
+class _Upload(io.BytesIO):
+    name = os.path.basename(os.environ["LOAD_TEST_RESUME"])
+    size = property(lambda self: len(self.getvalue()))
+
+
+def _file_uploader(*args, **kwargs):
+    with open(os.environ["LOAD_TEST_RESUME"], "rb") as f:
+        return _Upload(f.read())
+
+
+st.file_uploader = _file_uploader
+os.chdir(os.environ["LOAD_TEST_ROOT"])
+runpy.run_path(os.path.join(os.environ["LOAD_TEST_ROOT"], "app.py"), run_name="__main__")
+"""
+
+
+@contextmanager
+def share_test_runtime():
+    # AppTest (streamlit 1.47.0) installs a mock Runtime for each script run
+    # and removes it when the run ends, which breaks the runs still going in
+    # other sessions. Keep the latest one visible to all of them, and set the
+    # config flag each run toggles once for the whole process. Both are put
+    # back on exit.
+    from streamlit import config
+    from streamlit.runtime import Runtime
+
+    latest = []
+    saved_instance, saved_exists = Runtime.__dict__["instance"], Runtime.__dict__["exists"]
+    saved_app_test = config.get_option("global.appTest")
+
+    def instance(cls):
+        if cls._instance is not None:
+            latest[:] = [cls._instance]
+        if not latest:
+            raise RuntimeError("Runtime hasn't been created!")
+        return latest[0]
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: cls._instance is not None or bool(latest))
+    config.set_option("global.appTest", True)
+    try:
+        yield
+    finally:
+        Runtime.instance, Runtime.exists = saved_instance, saved_exists
+        config.set_option("global.appTest", saved_app_test)
+
+
+def peak_rss_mb():
+    # VmHWM is the peak resident set of this process (Linux only).
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return float("nan")
+
+
+def percentiles(samples):
+    if not samples:
+        return {"count": 0}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive") if len(samples) > 1 else [samples[0]] * 99
+    return {"count": len(samples), "p50": cuts[49], "p95": cuts[94], "p99": cuts[98], "max": max(samples)}
+
+
+def _button(at, label):
+    return next(b for b in at.button if b.label == label)
+
+
+def _check(at, action):
+    if at.exception:
+        raise RuntimeError(f"{action}: {at.exception[0].value}")
+    errors = [e.value for e in at.error]
+    if errors:
+        raise RuntimeError(f"{action}: {errors[0]}")
+
+
+def _wait_for(at, has_result, timeout, poll=0.2):
+    # Background jobs finish between reruns; rerun like the page's poller does.
+    deadline = time.monotonic() + timeout
+    while not has_result(at):
+        if time.monotonic() > deadline:
+            raise TimeoutError("result did not arrive")
+        time.sleep(poll)
+        at.run()
+
+
+class Session:
+    """One simulated user; ``timings`` collects (action, seconds) pairs."""
+
+    def __init__(self, driver, job_description, args):
+        self.driver = driver
+        self.job_description = job_description
+        self.args = args
+        self.timings = []
+        self.errors = []
+
+    def _timed(self, action, step):
+        started = time.perf_counter()
+        step()
+        self.timings.append((action, time.perf_counter() - started))
+
+    def flow(self):
+        from streamlit.testing.v1 import AppTest
+
+        at = AppTest.from_file(self.driver, default_timeout=self.args.timeout)
+        self._timed("upload", at.run)
+        _check(at, "upload")
+        at.toggle(key="bypass_llm_cache").set_value(not self.args.cache)
+        at.toggle(key="background_jobs").set_value(not self.args.inline)
+        at.run()
+
+        self._timed("general", lambda: _button(at, "Run General Analysis").click().run())
+        _check(at, "general")
+
+        def ats():
+            at.text_area(key="ats_job_description").input(self.job_description).run()
+            _button(at, "Run ATS Analysis").click().run()
+
+        self._timed("ats", ats)
+        _check(at, "ats")
+
+        def cover_letter():
+            at.text_area(key="cover_letter_job_description").input(self.job_description).run()
+            _button(at, "Generate Cover Letter").click().run()
+            _wait_for(at, lambda at: any(b.label == "Download Cover Letter as TXT" for b in at.get("download_button")),
+                      self.args.timeout)
+
+        self._timed("cover_letter", cover_letter)
+        _check(at, "cover_letter")
+
+    def run(self, start_at):
+        time.sleep(max(0.0, start_at - time.monotonic()))
+        for _ in range(self.args.rounds):
+            try:
+                self.flow()
+            except Exception as e:
+                self.errors.append(f"{type(e).__name__}: {e}")
+                if self.args.verbose:
+                    traceback.print_exc()
+
+
+def configure_environment(args, workdir):
+    # Everything the app writes goes to a scratch folder; the stub answers.
+    os.environ.update({
+        "RESUME_ANALYZER_BACKEND": "stub",
+        "RESUME_ANALYZER_STUB_LATENCY": args.latency,
+        "RESUME_ANALYZER_STUB_ERROR_RATE": str(args.error_rate),
+        "RESUME_ANALYZER_LLM_CACHE": os.path.join(workdir, "responses.sqlite3"),
+        "RESUME_ANALYZER_SHARED_CACHE": os.path.join(workdir, "shared_results.sqlite3"),
+        "RESUME_ANALYZER_JOBS": os.path.join(workdir, "jobs.sqlite3"),
+        "RESUME_ANALYZER_SESSION_DIR": os.path.join(workdir, "sessions"),
+        "RESUME_ANALYZER_JD_LIBRARY": os.path.join(workdir, "jd_library"),
+        "LOAD_TEST_RESUME": os.path.abspath(args.resume),
+        "LOAD_TEST_ROOT": ROOT,
+    })
+    os.environ.setdefault("RESUME_ANALYZER_RPM", "100000")
+    os.environ.setdefault("RESUME_ANALYZER_BURST", "1000")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=10, help="Simulated users running at once")
+    parser.add_argument("--rounds", type=int, default=1, help="Flows per user")
+    parser.add_argument("--ramp", type=float, default=0.0, help="Seconds over which users join")
+    parser.add_argument("--latency", default="lognormal:1.5,0.4", help="Stub model latency, e.g. constant:1")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of model calls that fail with a 429")
+    parser.add_argument("--resume", default=os.path.join(ROOT, "SampleResume", "PriyaSE.pdf"))
+    parser.add_argument("--cache", action="store_true", help="Let users share cached responses")
+    parser.add_argument("--inline", action="store_true", help="Run long analyses in the script, not the job queue")
+    parser.add_argument("--timeout", type=float, default=300, help="Seconds allowed per script run")
+    parser.add_argument("--json", help="Also write the report to this file")
+    parser.add_argument("--verbose", action="store_true", help="Print tracebacks of failed flows")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="load-test-") as workdir:
+        configure_environment(args, workdir)
+        driver = os.path.join(workdir, "driver.py")
+        with open(driver, "w", encoding="utf-8") as f:
+            f.write(DRIVER)
+        with open(JOB_DESCRIPTION, encoding="utf-8") as f:
+            job_description = f.read()
+
+        from core import metrics
+
+        # Job-queue workers look up the shared model on their first job, which
+        # warns about a missing script context under test.
+        logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").setLevel(logging.ERROR)
+        baseline_mb = peak_rss_mb()
+        sessions = [Session(driver, job_description, args) for _ in range(args.sessions)]
+        with share_test_runtime():
+            started = time.monotonic()
+            threads = [
+                threading.Thread(
+                    target=session.run,
+                    args=(started + args.ramp * i / max(1, args.sessions - 1),),
+                    name=f"session-{i}",
+                )
+                for i, session in enumerate(sessions)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.monotonic() - started
+
+    timings = {action: [] for action in ACTIONS}
+    for session in sessions:
+        for action, seconds in session.timings:
+            timings[action].append(seconds)
+    errors = [error for session in sessions for error in session.errors]
+    flows = len(timings["cover_letter"])
+    report = {
+        "sessions": args.sessions,
+        "rounds": args.rounds,
+        "latency": args.latency,
+        "elapsed_s": elapsed,
+        "flows": flows,
+        "flows_per_s": flows / elapsed if elapsed else 0.0,
+        "actions_per_s": sum(len(samples) for samples in timings.values()) / elapsed if elapsed else 0.0,
+        "errors": len(errors),
+        "peak_rss_mb": peak_rss_mb(),
+        "baseline_rss_mb": baseline_mb,
+        "actions": {action: percentiles(samples) for action, samples in timings.items()},
+        "model_calls": sum(row["count"] for row in metrics.snapshot() if row["stage"] == "llm"),
+    }
+
+    print(f"{args.sessions} sessions × {args.rounds} rounds, stub latency {args.latency}: "
+          f"{flows} flows in {elapsed:.1f}s ({report['flows_per_s']:.2f} flows/s, "
+          f"{report['actions_per_s']:.2f} actions/s), {report['model_calls']} model calls")
+    print(f"{'action':<14}{'count':>6}{'p50 s':>9}{'p95 s':>9}{'p99 s':>9}{'max s':>9}")
+    for action, row in report["actions"].items():
+        if row["count"]:
+            print(f"{action:<14}{row['count']:>6}{row['p50']:>9.2f}{row['p95']:>9.2f}{row['p99']:>9.2f}{row['max']:>9.2f}")
+    print(f"peak RSS {report['peak_rss_mb']:.0f} MB ({report['baseline_rss_mb']:.0f} MB before the first session)")
+    if errors:
+        print(f"{len(errors)} failed flows, e.g. {errors[0]}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Scaling of parallel PDF page extraction across worker counts.
+
+Builds a dense synthetic PDF and times sequential extraction against the
+process-pool extractor with 1, 2, 4, ... workers (best of ``--repeat``)::
+
+    python benchmarks/parallel_extraction.py --pages 200
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.extraction import ExtractionLimits, iter_pdf_pages, iter_pdf_pages_parallel  # noqa: E402
+
+LINE = "Led a cross-functional team to deliver a distributed data platform serving 40M requests/day. "
+NO_LIMITS = ExtractionLimits(max_bytes=1 << 40, max_pages=1 << 20, max_chars=1 << 40)
+
+
+def build_pdf(pages):
+    import fitz
+
+    doc = fitz.open()
+    for _ in range(pages):
+        page = doc.new_page()
+        for block in range(8):
+            top = 50 + block * 90
+            page.insert_textbox(fitz.Rect(50, top, 550, top + 90), LINE * 6, fontsize=6)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def best_time(run, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    data = build_pdf(args.pages)
+    expected = "".join(iter_pdf_pages(data, NO_LIMITS))
+    sequential = best_time(lambda: "".join(iter_pdf_pages(data, NO_LIMITS)), args.repeat)
+    print(f"{args.pages} pages, {os.cpu_count()} CPUs")
+    print(f"sequential      {sequential * 1000:8.0f} ms")
+
+    workers = 1
+    while workers <= args.max_workers:
+        def run():
+            text = "".join(iter_pdf_pages_parallel(data, NO_LIMITS, workers=workers, threshold=0))
+            assert text == expected, "parallel extraction changed the text or its order"
+
+        elapsed = best_time(run, args.repeat)
+        print(f"{workers:>2} workers      {elapsed * 1000:8.0f} ms   {sequential / elapsed:5.2f}x")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""UI-free building blocks shared by the Streamlit app and offline tools."""
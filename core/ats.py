@@ -0,0 +1,105 @@
+"""Deterministic ATS keyword scoring that runs locally in milliseconds.
+
+The job description is broken into unigram and bigram terms. Each term is
+weighted by a BM25-style saturated term frequency (so a word repeated ten
+times does not drown out everything else), an optional IDF table from a
+larger corpus, and a boost for multi-word phrases. The resume earns full
+credit for a term it contains, half credit for a phrase whose words all
+appear separately, and nothing otherwise.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from core.resume import parse_resume
+from core.text import extract_terms
+
+K1 = 1.2
+BIGRAM_BOOST = 1.5
+PARTIAL_PHRASE_CREDIT = 0.5
+
+
+@dataclass
+class ATSResult:
+    score: int
+    coverage: float
+    missing_keywords: list = field(default_factory=list)
+    present_keywords: list = field(default_factory=list)
+
+
+def weigh_terms(terms, idf=None):
+    """Return ``(vocab, weights)`` for a list of terms from one job description."""
+    vocab, counts = np.unique(np.array(terms, dtype=object), return_counts=True)
+    vocab = vocab.tolist()
+    return vocab, weigh_counts(vocab, counts, idf)
+
+
+def weigh_counts(vocab, counts, idf=None):
+    """Weights for ``vocab`` given each term's count in the job description."""
+    counts = np.asarray(counts, dtype=float)
+    weights = counts * (K1 + 1) / (counts + K1)
+    weights *= np.where(np.char.count(np.array(vocab, dtype=str), " ") > 0, BIGRAM_BOOST, 1.0)
+    if idf:
+        weights *= np.array([idf.get(term, 1.0) for term in vocab])
+    return weights
+
+
+def score_terms(resume_terms, vocab, weights, surfaces, top_n=7):
+    """Score a resume's terms against a pre-weighted job description vocabulary."""
+    if not vocab:
+        return ATSResult(score=0, coverage=0.0)
+    present = Counter(resume_terms)
+    credit = np.fromiter(
+        (
+            1.0 if term in present
+            else PARTIAL_PHRASE_CREDIT if " " in term and all(word in present for word in term.split())
+            else 0.0
+            for term in vocab
+        ),
+        dtype=float,
+        count=len(vocab),
+    )
+    coverage = float(weights @ credit / weights.sum())
+    # Raw coverage of every JD term is naturally low; the square root puts
+    # typical resumes on the 0-100 scale people expect from the AI score.
+    score = int(round(100 * coverage ** 0.5))
+
+    order = np.argsort(-weights, kind="stable")
+    missing = _top_keywords((vocab[i] for i in order if credit[i] == 0), surfaces, top_n)
+    matched = _top_keywords((vocab[i] for i in order if credit[i] == 1), surfaces, top_n + 3)
+    return ATSResult(score, coverage, missing, matched)
+
+
+def score_ats(resume_text, job_description, idf=None, top_n=7):
+    """Return an ATSResult for ``resume_text`` against ``job_description``."""
+    jd_terms, surfaces = extract_terms(job_description)
+    resume_terms, _ = parse_resume(resume_text).terms()
+    vocab, weights = weigh_terms(jd_terms, idf) if jd_terms else ([], None)
+    return score_terms(resume_terms, vocab, weights, surfaces, top_n)
+
+
+def _top_keywords(terms, surfaces, limit):
+    # Skip terms sharing a word with one already listed, so "machine learning"
+    # is not followed by "learning" or "machine learning engineer".
+    chosen = []
+    covered = set()
+    for term in terms:
+        if covered.intersection(term.split()):
+            continue
+        chosen.append(surfaces.get(term, term))
+        covered.update(term.split())
+        if len(chosen) == limit:
+            break
+    return chosen
+
+
+def format_keyword_table(missing, present):
+    """Render the two keyword columns as the same Markdown table the AI returns."""
+    rows = ["| Missing Keywords | Present Keywords |", "|---|---|"]
+    for i in range(max(len(missing), len(present))):
+        left = missing[i] if i < len(missing) else ""
+        right = present[i] if i < len(present) else ""
+        rows.append(f"| {left} | {right} |")
+    return "\n".join(rows)
@@ -0,0 +1,436 @@
+"""Model backends behind ``generate_text`` and ``stream_text``.
+
+Every prompt flow talks to a "model": any object with a ``model_name`` and a
+Gemini-style ``generate_content(prompt, generation_config=None, stream=False)``
+that returns a response (or, when streaming, an iterator of responses) with
+``text`` and ``parts``. Besides the real Gemini model there are:
+
+* ``StubBackend``: a deterministic local model with a configurable latency
+  distribution, for load tests and benchmarks without a key or network;
+* ``RecordingBackend``: wraps another model and saves every response, with
+  its timing, to a folder;
+* ``ReplayBackend``: answers from such a folder, optionally at the recorded
+  speed, so real responses can be re-run on an air-gapped machine.
+
+``create_backend`` picks one from ``RESUME_ANALYZER_BACKEND`` (``gemini``,
+``stub``, ``record`` or ``replay``).
+"""
+
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+
+from core.llm_cache import config_to_dict, make_key
+from core.metrics import observe
+
+BACKENDS = ("gemini", "stub", "record", "replay")
+DEFAULT_RECORDINGS_DIR = os.path.join(".cache", "recordings")
+DEFAULT_STUB_LATENCY = "lognormal:1.5,0.4"
+STUB_CHUNKS = 8
+
+
+class ReplayMissError(LookupError):
+    """A replayed run asked for a prompt that was never recorded."""
+
+
+class StubRateLimitError(RuntimeError):
+    """Injected by the stub to exercise retry paths; looks like an HTTP 429."""
+
+    code = 429
+
+
+class Response:
+    def __init__(self, text):
+        self.text = text
+        self.parts = [text] if text else []
+
+
+# --- Latency distributions ---
+def parse_latency(spec):
+    """Return a ``sample(rng) -> seconds`` function for a spec like ``lognormal:1.5,0.4``.
+
+    Supported: ``constant:S``, ``uniform:LOW,HIGH``, ``normal:MEAN,SD``,
+    ``lognormal:MEDIAN,SIGMA`` and ``exponential:MEAN``. Samples are never
+    negative.
+    """
+    kind, _, params = spec.partition(":")
+    try:
+        values = [float(v) for v in params.split(",") if v.strip()]
+    except ValueError:
+        raise ValueError(f"Bad latency spec {spec!r}") from None
+    samplers = {
+        ("constant", 1): lambda rng: values[0],
+        ("uniform", 2): lambda rng: rng.uniform(values[0], values[1]),
+        ("normal", 2): lambda rng: rng.gauss(values[0], values[1]),
+        ("lognormal", 2): lambda rng: values[0] * rng.lognormvariate(0, values[1]),
+        ("exponential", 1): lambda rng: rng.expovariate(1 / values[0]) if values[0] else 0.0,
+    }
+    sampler = samplers.get((kind.strip().lower(), len(values)))
+    if sampler is None:
+        raise ValueError(f"Bad latency spec {spec!r}; expected e.g. 'constant:1', 'lognormal:1.5,0.4'")
+    return lambda rng: max(0.0, sampler(rng))
+
+
+def _split_chunks(text, count):
+    # Cut at spaces so every chunk ends on a whole word.
+    size = max(1, len(text) // count)
+    chunks, start = [], 0
+    while start < len(text):
+        end = text.find(" ", start + size)
+        end = len(text) if end < 0 else end + 1
+        chunks.append(text[start:end])
+        start = end
+    return chunks
+
+
+def _paced(chunks, first_delay, total_delay):
+    # Yield chunks so the first arrives after ``first_delay`` and the last after ``total_delay``.
+    started = time.monotonic()
+    step = (total_delay - first_delay) / max(1, len(chunks) - 1)
+    for i, chunk in enumerate(chunks):
+        remaining = started + first_delay + i * step - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+        yield Response(chunk)
+
+
+# --- Stub ---
+_STUB_KEYWORDS = ["Python", "SQL", "Docker", "AWS", "Machine Learning", "REST APIs", "Git", "Kubernetes"]
+
+
+def stub_text(prompt, length=1200):
+    """A deterministic answer for ``prompt`` that every response parser accepts."""
+    digest = hashlib.sha256(prompt.encode("utf-8")).digest()
+    score = 40 + digest[0] % 56
+    matched = [k for i, k in enumerate(_STUB_KEYWORDS) if digest[1 + i] % 2]
+    missing = [k for k in _STUB_KEYWORDS if k not in matched]
+    rows = [f"| {2022 + i} | {5 + digest[10 + i] % 20} |" for i in range(6)]
+    lines = [
+        f"Resume Score: {score}/100",
+        f"ATS Score: {score}/100",
+        f"Section Score: {score}/100",
+        f"Matched Keywords: {', '.join(matched) or 'none'}",
+        "",
+        "| Missing Keywords | Present Keywords |",
+        "|---|---|",
+        *[f"| {m} | {p} |" for m, p in zip(missing + [""] * 8, matched + [""] * 8) if m or p],
+        "",
+        "| Year | Demand Growth (%) |",
+        "|---|---|",
+        *rows,
+        "",
+        "### Notes",
+    ]
+    text = "\n".join(lines)
+    filler = " ".join(re.findall(r"[A-Za-z]{4,}", prompt)[:400]) or "stub response"
+    while len(text) < length:
+        text += "\n- " + filler[: length - len(text)]
+    return text
+
+
+def stub_json(prompt):
+    """A deterministic answer to the structured prompt that passes ``ANALYSIS_SCHEMA``."""
+    digest = hashlib.sha256(prompt.encode("utf-8")).digest()
+    matched = [k for i, k in enumerate(_STUB_KEYWORDS) if digest[1 + i] % 2]
+    return json.dumps({
+        "resume_score": 40 + digest[0] % 56,
+        "archetype": "Pragmatic Builder",
+        "summary": "A solid resume with clear experience; quantify more outcomes.",
+        "strengths": ["Relevant experience", "Clear structure", "Modern tools"],
+        "weaknesses": ["Few metrics: add numbers to each role", "Generic summary: tailor it to the role"],
+        "ats": {"score": 40 + digest[2] % 56, "missing_keywords": [k for k in _STUB_KEYWORDS if k not in matched],
+                "present_keywords": matched},
+        "fit": {"score": 40 + digest[3] % 56, "justification": "Core skills line up with the role."},
+        "career_paths": [{"title": "Data Analyst", "kind": "Obvious Fit", "score": 80, "justification": "Direct match."}],
+        "trends": {"summary": "Demand keeps growing.",
+                   "rows": [{"year": 2022 + i, "demand_growth_pct": 5 + digest[10 + i] % 20} for i in range(6)]},
+    })
+
+
+class StubBackend:
+    """Local stand-in for Gemini: same answer for the same prompt, sampled latency.
+
+    ``latency`` is the time until the whole answer is available and
+    ``first_chunk`` the fraction of it spent before the first streamed chunk.
+    ``error_rate`` makes that share of calls fail with a 429-like error.
+    """
+
+    def __init__(self, model_name="stub", latency=DEFAULT_STUB_LATENCY, seed=0, length=1200,
+                 first_chunk=0.3, error_rate=0.0):
+        self.model_name = f"stub/{model_name}"
+        self.latency = latency
+        self.length = length
+        self.first_chunk = first_chunk
+        self.error_rate = error_rate
+        self._sample = parse_latency(latency)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _draw(self):
+        with self._lock:
+            return self._sample(self._rng), self._rng.random() < self.error_rate
+
+    def generate_content(self, prompt, generation_config=None, stream=False, **kwargs):
+        delay, fail = self._draw()
+        wants_json = config_to_dict(generation_config).get("response_mime_type") == "application/json"
+        text = stub_json(prompt) if wants_json else stub_text(prompt, self.length)
+        if not stream:
+            time.sleep(delay)
+            if fail:
+                raise StubRateLimitError("429 Resource has been exhausted (stub)")
+            return Response(text)
+        if fail:
+            time.sleep(delay * self.first_chunk)
+            raise StubRateLimitError("429 Resource has been exhausted (stub)")
+        return _paced(_split_chunks(text, STUB_CHUNKS), delay * self.first_chunk, delay)
+
+
+# --- Record / replay ---
+class RecordingBackend:
+    """Pass calls through to ``model`` and save each response under ``directory``."""
+
+    def __init__(self, model, directory=DEFAULT_RECORDINGS_DIR):
+        self.model = model
+        self.model_name = model.model_name
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _save(self, prompt, generation_config, chunks, first_s, total_s):
+        key = make_key(self.model_name, generation_config, prompt)
+        record = {"model": self.model_name, "chunks": chunks, "first_chunk_s": round(first_s, 4),
+                  "latency_s": round(total_s, 4), "recorded_at": time.time()}
+        tmp = os.path.join(self.directory, f".{key}.{threading.get_ident()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(record, f)
+        os.replace(tmp, os.path.join(self.directory, f"{key}.json"))
+
+    def generate_content(self, prompt, generation_config=None, stream=False, **kwargs):
+        started = time.monotonic()
+        if not stream:
+            response = self.model.generate_content(prompt, generation_config=generation_config, **kwargs)
+            elapsed = time.monotonic() - started
+            self._save(prompt, generation_config, [response.text], elapsed, elapsed)
+            return response
+        return self._record_stream(prompt, generation_config, started, **kwargs)
+
+    def _record_stream(self, prompt, generation_config, started, **kwargs):
+        chunks, first = [], None
+        for chunk in self.model.generate_content(prompt, generation_config=generation_config, stream=True, **kwargs):
+            if first is None:
+                first = time.monotonic() - started
+            if chunk.parts:
+                chunks.append(chunk.text)
+            yield chunk
+        # Only complete streams are saved, so a replay never ends early.
+        self._save(prompt, generation_config, chunks, first or 0.0, time.monotonic() - started)
+
+
+class ReplayBackend:
+    """Answer from responses saved by ``RecordingBackend``.
+
+    With ``realtime`` the recorded time to first chunk and total latency are
+    reproduced; otherwise answers come back immediately.
+    """
+
+    def __init__(self, directory=DEFAULT_RECORDINGS_DIR, model_name="gemini-1.5-flash", realtime=True):
+        self.directory = directory
+        self.model_name = model_name if model_name.startswith("models/") else f"models/{model_name}"
+        self.realtime = realtime
+
+    def _load(self, prompt, generation_config):
+        key = make_key(self.model_name, generation_config, prompt)
+        try:
+            with open(os.path.join(self.directory, f"{key}.json"), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise ReplayMissError(f"No recorded response for this prompt in {self.directory}") from None
+
+    def generate_content(self, prompt, generation_config=None, stream=False, **kwargs):
+        record = self._load(prompt, generation_config)
+        first, total = (record["first_chunk_s"], record["latency_s"]) if self.realtime else (0.0, 0.0)
+        if not stream:
+            time.sleep(total)
+            return Response("".join(record["chunks"]))
+        return _paced(record["chunks"], first, total)
+
+
+def create_backend(kind=None, model_name="gemini-1.5-flash", api_key=None):
+    """Build the backend named by ``kind`` (default: ``RESUME_ANALYZER_BACKEND`` or ``gemini``).
+
+    The stub reads ``RESUME_ANALYZER_STUB_LATENCY``, ``_STUB_SEED`` and
+    ``_STUB_ERROR_RATE``; record and replay use ``RESUME_ANALYZER_RECORDINGS``.
+    """
+    kind = (kind or os.environ.get("RESUME_ANALYZER_BACKEND") or "gemini").lower()
+    recordings = os.environ.get("RESUME_ANALYZER_RECORDINGS", DEFAULT_RECORDINGS_DIR)
+    if kind == "stub":
+        return StubBackend(
+            model_name,
+            latency=os.environ.get("RESUME_ANALYZER_STUB_LATENCY", DEFAULT_STUB_LATENCY),
+            seed=int(os.environ.get("RESUME_ANALYZER_STUB_SEED", 0)),
+            error_rate=float(os.environ.get("RESUME_ANALYZER_STUB_ERROR_RATE", 0)),
+        )
+    if kind == "replay":
+        return ReplayBackend(recordings, model_name)
+    if kind not in ("gemini", "record"):
+        raise ValueError(f"Unknown model backend {kind!r}; expected one of {BACKENDS}")
+
+    model = _gemini_model(model_name, api_key)
+    return RecordingBackend(model, recordings) if kind == "record" else model
+
+
+# gRPC keep-alive pings hold the HTTP/2 connection open between requests, so
+# a quiet spell does not cost a fresh TCP/TLS handshake on the next click.
+KEEPALIVE_OPTIONS = [
+    ("grpc.keepalive_time_ms", 30_000),
+    ("grpc.keepalive_timeout_ms", 10_000),
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.max_pings_without_data", 0),
+]
+
+
+def _gemini_model(model_name, api_key):
+    # The SDK pulls in gRPC and protobuf; only pay for that when a model is needed.
+    import google.generativeai as genai
+    from google.ai import generativelanguage as glm
+    from google.ai.generativelanguage_v1beta.services.generative_service.transports.grpc import (
+        GenerativeServiceGrpcTransport,
+    )
+
+    genai.configure(api_key=api_key)
+
+    def channel(*args, options=(), **kwargs):
+        return GenerativeServiceGrpcTransport.create_channel(*args, options=[*options, *KEEPALIVE_OPTIONS], **kwargs)
+
+    def transport(**kwargs):
+        return GenerativeServiceGrpcTransport(channel=channel, **kwargs)
+
+    model = genai.GenerativeModel(model_name)
+    # GenerativeModel creates its client lazily in the private ``_client``
+    # (google-generativeai 0.8, pinned in requirements.txt); handing it one
+    # built on the keep-alive channel means the first request reuses it. An
+    # SDK without the attribute keeps its default client.
+    if hasattr(model, "_client"):
+        model._client = glm.GenerativeServiceClient(client_options={"api_key": api_key}, transport=transport)
+    return model
+
+
+# --- Shared client ---
+# Errors that suggest a broken connection rather than a bad request or quota.
+_CONNECTION_ERRORS = (ConnectionError, TimeoutError)
+_CONNECTION_ERROR_NAMES = {"ServiceUnavailable", "DeadlineExceeded", "RetryError"}
+HEALTH_CHECK_PROMPT = "Reply with OK."
+HEALTH_CHECK_TIMEOUT = 10
+
+
+def is_connection_error(error):
+    return isinstance(error, _CONNECTION_ERRORS) or type(error).__name__ in _CONNECTION_ERROR_NAMES
+
+
+class SharedModel:
+    """One model per process, shared by every session, that replaces itself when it breaks.
+
+    ``factory()`` returns ``(model, generation_config)`` and is called again
+    to build a fresh client after ``max_failures`` consecutive connection
+    errors or a failed health check. ``warm_up()`` sends one tiny request so
+    connection setup happens before the first user request does;
+    ``start_health_checks(interval)`` repeats it in a background thread.
+    """
+
+    def __init__(self, factory, max_failures=2):
+        self.factory = factory
+        self.max_failures = max_failures
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._stats = {"replacements": 0, "warm_up_s": None, "last_check_ok": None, "last_check_at": None}
+        self.model, self.generation_config = factory()
+        self._stats["created_at"] = time.time()
+
+    @property
+    def model_name(self):
+        return self.model.model_name
+
+    def _replace(self):
+        model, generation_config = self.factory()
+        with self._lock:
+            self.model, self.generation_config = model, generation_config
+            self._failures = 0
+            self._stats["replacements"] += 1
+            self._stats["created_at"] = time.time()
+
+    def _record(self, error):
+        if error is None or not is_connection_error(error):
+            with self._lock:
+                self._failures = 0
+            return
+        with self._lock:
+            self._failures += 1
+            broken = self._failures >= self.max_failures
+        if broken:
+            self._replace()
+
+    def generate_content(self, prompt, generation_config=None, stream=False, **kwargs):
+        # Calls already in flight finish on the client they started with.
+        model = self.model
+        try:
+            response = model.generate_content(prompt, generation_config=generation_config, stream=stream, **kwargs)
+        except Exception as e:
+            self._record(e)
+            raise
+        if stream:
+            return self._watch_stream(response)
+        self._record(None)
+        return response
+
+    def _watch_stream(self, chunks):
+        try:
+            yield from chunks
+        except Exception as e:
+            self._record(e)
+            raise
+        self._record(None)
+
+    def check_health(self):
+        """Send a minimal request; on failure swap in a fresh client. Returns True if healthy."""
+        started = time.perf_counter()
+        try:
+            model = self.model
+            if hasattr(model, "count_tokens"):
+                # Goes over the same connection as generation, at no generation cost.
+                # The SDK's default retry would keep retrying an unreachable
+                # service for a minute; one attempt bounded by the timeout is the check.
+                model.count_tokens(HEALTH_CHECK_PROMPT, request_options={"timeout": HEALTH_CHECK_TIMEOUT, "retry": None})
+            else:
+                model.generate_content(HEALTH_CHECK_PROMPT, generation_config=self.generation_config)
+            ok = True
+        except Exception:
+            ok = False
+        observe("model_health_check", time.perf_counter() - started, {"ok": ok})
+        with self._lock:
+            self._stats["last_check_ok"] = ok
+            self._stats["last_check_at"] = time.time()
+        if not ok:
+            self._replace()
+        return ok
+
+    def warm_up(self):
+        started = time.monotonic()
+        ok = self.check_health()
+        with self._lock:
+            self._stats["warm_up_s"] = time.monotonic() - started
+        return ok
+
+    def start_health_checks(self, interval):
+        def loop():
+            while True:
+                time.sleep(interval)
+                self.check_health()
+
+        threading.Thread(target=loop, name="model-health-check", daemon=True).start()
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, consecutive_failures=self._failures)
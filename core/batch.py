@@ -0,0 +1,239 @@
+"""Headless ATS screening of a folder of resumes against one job description.
+
+Usage::
+
+    python -m core.batch SampleResume "SampleJOBDesc/Job Title AI Engineer.txt"
+
+Resumes are extracted in a process pool and scored by the model with bounded
+concurrency. Results are appended to ``results.jsonl`` as each one completes,
+so memory stays flat however large the batch is, and ``ranked.csv`` is written
+at the end ordered by ATS score.
+
+With ``--dedupe-threshold``, a resume that is a near-duplicate of one
+already screened in the run (the same candidate with a new phone number, a
+reordered skill) reuses that resume's result instead of another model call,
+and its row names the resume it matched in ``similar_to``.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field, replace
+
+from core import metrics
+from core.backends import BACKENDS
+from core.extraction import extract_text_from_path, is_supported
+from core.llm import MODEL_NAME, create_model, generate_text
+from core.llm_cache import ResponseCache
+from core.near_dup import DEFAULT_THRESHOLD, NearDuplicateIndex
+from core.parsing import parse_keyword_table, parse_score
+from core.prompts import build_ats_prompt
+
+
+@dataclass
+class ScreeningResult:
+    path: str
+    ats_score: int | None = None
+    missing_keywords: list = field(default_factory=list)
+    present_keywords: list = field(default_factory=list)
+    error: str | None = None
+    similar_to: str | None = None   # the earlier resume this one nearly duplicates
+    similarity: float | None = None
+
+
+def iter_resume_paths(directory):
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if os.path.isfile(path) and is_supported(name):
+            yield path
+
+
+def extract_resume(path):
+    # Runs in a worker process; errors travel back as strings.
+    try:
+        text = extract_text_from_path(path)
+        if text is None:
+            return path, None, "no extractable text"
+        return path, text, None
+    except Exception as e:
+        return path, None, f"could not read file: {e}"
+
+
+def score_resume(path, resume_text, job_description, model, generation_config=None, cache=None):
+    """Run the ATS prompt for one resume and parse the score and keyword table."""
+    try:
+        response = generate_text(
+            model, build_ats_prompt(resume_text, job_description), generation_config,
+            feature="ats", cache=cache,
+        )
+    except Exception as e:
+        return ScreeningResult(path, error=f"model call failed: {e}")
+    missing, present = parse_keyword_table(response)
+    return ScreeningResult(path, parse_score(response), missing, present)
+
+
+def screen_resumes(paths, job_description, model, generation_config=None, cache=None,
+                   extract_workers=None, max_concurrency=4, near_duplicates=None, rerun_duplicates=False):
+    """Yield a ScreeningResult per path, in completion order.
+
+    At most ``2 * max_concurrency`` documents are extracted, scored or waiting
+    at any moment, so extracted texts never pile up ahead of the model.
+
+    With a ``near_duplicates`` index, a resume matching an earlier one gets
+    a copy of that resume's result (once it is ready) marked with
+    ``similar_to``; with ``rerun_duplicates`` it is scored anyway and only marked.
+    """
+    paths = iter(paths)
+    window = 2 * max_concurrency
+    extracting, scoring = set(), set()
+    originals = {}                # path -> result, for resumes in the near-duplicate index
+    waiting = defaultdict(list)   # original path -> [(path, similarity, text)] to copy once it is scored
+    marks = {}                    # path -> (original path, similarity) for re-run duplicates
+    with ProcessPoolExecutor(max_workers=extract_workers) as processes, \
+            ThreadPoolExecutor(max_workers=max_concurrency) as threads:
+
+        def refill():
+            while len(extracting) + len(scoring) + sum(map(len, waiting.values())) < window:
+                path = next(paths, None)
+                if path is None:
+                    return
+                extracting.add(processes.submit(extract_resume, path))
+
+        refill()
+        while extracting or scoring:
+            done, _ = wait(extracting | scoring, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in extracting:
+                    extracting.discard(future)
+                    path, text, error = future.result()
+                    if error:
+                        yield ScreeningResult(path, error=error)
+                        continue
+                    if near_duplicates is not None:
+                        signature = near_duplicates.signature(text)
+                        match = near_duplicates.best(signature)
+                        if match is None:
+                            near_duplicates.add(path, signature)
+                        elif rerun_duplicates:
+                            marks[path] = match
+                        elif match[0] in originals:
+                            if not originals[match[0]].error:
+                                yield replace(originals[match[0]], path=path, similar_to=match[0], similarity=match[1])
+                                continue
+                            # Nothing worth copying; score the duplicate itself.
+                            marks[path] = match
+                        else:
+                            waiting[match[0]].append((path, match[1], text))
+                            continue
+                    scoring.add(threads.submit(
+                        score_resume, path, text, job_description, model, generation_config, cache,
+                    ))
+                else:
+                    scoring.discard(future)
+                    result = future.result()
+                    if result.path in marks:
+                        result.similar_to, result.similarity = marks.pop(result.path)
+                    if near_duplicates is not None and result.path in near_duplicates:
+                        originals[result.path] = result
+                    yield result
+                    for path, similarity, text in waiting.pop(result.path, []):
+                        if result.error:
+                            # Nothing worth copying; score the duplicate itself.
+                            marks[path] = (result.path, similarity)
+                            scoring.add(threads.submit(
+                                score_resume, path, text, job_description, model, generation_config, cache,
+                            ))
+                        else:
+                            yield replace(result, path=path, similar_to=result.path, similarity=similarity)
+            refill()
+
+
+def write_reports(results, output_dir, on_result=None):
+    """Stream results to ``results.jsonl`` and then write ``ranked.csv``.
+
+    Only ``(score, offset)`` pairs are kept in memory; the ranked CSV is
+    rebuilt by seeking back into the JSONL file.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    jsonl_path = os.path.join(output_dir, "results.jsonl")
+    csv_path = os.path.join(output_dir, "ranked.csv")
+    ranking = []
+    with open(jsonl_path, "w+", encoding="utf-8") as jsonl:
+        for result in results:
+            offset = jsonl.tell()
+            jsonl.write(json.dumps(asdict(result)) + "\n")
+            jsonl.flush()
+            score = result.ats_score if result.ats_score is not None else -1
+            ranking.append((-score, result.path, offset))
+            if on_result:
+                on_result(result)
+
+        ranking.sort()
+        with open(csv_path, "w", newline="", encoding="utf-8") as out:
+            writer = csv.writer(out)
+            writer.writerow(["rank", "file", "ats_score", "missing_keywords", "present_keywords", "error", "similar_to"])
+            for rank, (_, _, offset) in enumerate(ranking, start=1):
+                jsonl.seek(offset)
+                row = json.loads(jsonl.readline())
+                writer.writerow([
+                    rank,
+                    os.path.basename(row["path"]),
+                    "" if row["ats_score"] is None else row["ats_score"],
+                    "; ".join(row["missing_keywords"]),
+                    "; ".join(row["present_keywords"]),
+                    row["error"] or "",
+                    os.path.basename(row["similar_to"]) if row.get("similar_to") else "",
+                ])
+    return jsonl_path, csv_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score every resume in a folder against a job description.")
+    parser.add_argument("resume_dir", help="Folder of PDF/DOCX resumes, e.g. SampleResume/")
+    parser.add_argument("job_description", help="Text file with the job description, e.g. one from SampleJOBDesc/")
+    parser.add_argument("-o", "--output-dir", default="screening_results")
+    parser.add_argument("--workers", type=int, default=None, help="Extraction processes (default: CPU count)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Simultaneous model calls")
+    parser.add_argument("--model", default=MODEL_NAME)
+    parser.add_argument("--backend", choices=BACKENDS, default=os.environ.get("RESUME_ANALYZER_BACKEND", "gemini"),
+                        help="stub and replay run offline; record saves real responses for replay")
+    parser.add_argument("--api-key", default=os.environ.get("GEMINI_API_KEY"))
+    parser.add_argument("--cache", default=os.environ.get("RESUME_ANALYZER_LLM_CACHE", os.path.join(".cache", "llm_responses.sqlite3")))
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the response cache")
+    parser.add_argument("--dedupe-threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Reuse the result of an earlier resume at least this similar (0-1; 0 disables)")
+    parser.add_argument("--rerun-duplicates", action="store_true",
+                        help="Score near-duplicates anyway and only mark them")
+    args = parser.parse_args(argv)
+
+    if not args.api_key and args.backend in ("gemini", "record"):
+        parser.error("set GEMINI_API_KEY or pass --api-key")
+    with open(args.job_description, encoding="utf-8") as f:
+        job_description = f.read()
+
+    metrics.configure_from_env()
+    model, generation_config = create_model(args.api_key, args.model, backend=args.backend)
+    cache = None if args.no_cache else ResponseCache(args.cache)
+    results = screen_resumes(
+        iter_resume_paths(args.resume_dir), job_description, model, generation_config,
+        cache=cache, extract_workers=args.workers, max_concurrency=args.concurrency,
+        near_duplicates=NearDuplicateIndex(args.dedupe_threshold) if args.dedupe_threshold > 0 else None,
+        rerun_duplicates=args.rerun_duplicates,
+    )
+
+    def report(result):
+        status = result.error or f"ATS {result.ats_score}/100"
+        if result.similar_to:
+            status += f" (similar to {os.path.basename(result.similar_to)}, {result.similarity:.0%})"
+        print(f"{os.path.basename(result.path)}: {status}", file=sys.stderr)
+
+    jsonl_path, csv_path = write_reports(results, args.output_dir, on_result=report)
+    print(f"Wrote {jsonl_path} and {csv_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Normalize and shrink resume text before it is embedded in a prompt.
+
+PDF extraction leaves artifacts that cost tokens without adding meaning:
+hyphenated line breaks, visual line wrapping, trailing spaces, decorative
+bullet glyphs and page headers/footers repeated on every page (PDF text
+marks its page boundaries with ``PAGE_BREAK``; nothing is dropped from
+anywhere but the edges of a page). The resume is
+also re-sent in up to seven prompts, so each feature gets a token budget;
+when a resume is over budget, the sections that feature cares least about
+are trimmed first.
+"""
+
+import math
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from core.extraction import PAGE_BREAK
+from core.resume import CACHE_SIZE, parse_resume
+
+# Rough Gemini ratio for English prose; good enough to compare before/after.
+CHARS_PER_TOKEN = 4
+
+# None means never truncate: the rewrite must keep every original fact.
+FEATURE_BUDGETS = {
+    "general": 3000,
+    "ats": 2500,
+    "enhancement": None,
+    "roadmap": 2000,
+    "opportunities": 2000,
+    "cover_letter": 1500,
+    "structured": 3000,
+}
+
+_CORE = ["header", "summary", "experience", "skills", "projects", "education"]
+_EXTRAS = ["certifications", "achievements", "publications", "other", "volunteering", "languages",
+           "interests", "references"]
+# Sections each feature keeps first when trimming; unlisted ones go last.
+FEATURE_PRIORITIES = {
+    "general": _CORE + _EXTRAS,
+    "ats": ["header", "skills", "experience", "projects", "certifications", "summary", "education"] + _EXTRAS,
+    "roadmap": ["header", "skills", "experience", "projects", "certifications", "education", "summary"] + _EXTRAS,
+    "opportunities": _CORE + _EXTRAS,
+    "cover_letter": ["header", "summary", "experience", "skills", "projects", "achievements", "education"] + _EXTRAS,
+    "structured": _CORE + _EXTRAS,
+}
+
+BULLET_GLYPHS = "•●▪■◦‣∙·○◆◇►▸➢➤✓✔"
+_BULLET_LINE = re.compile(rf"^\s*[{BULLET_GLYPHS}*–—]\s*")
+_PAGE_NUMBER_LINE = re.compile(r"^(?:page\s*\d+(?:\s*(?:of|/)\s*\d+)?|\d+\s*(?:of|/)\s*\d+)$", re.IGNORECASE)
+_BARE_NUMBER = re.compile(r"^\d+$")
+# Non-blank lines at the top and bottom of a page that may be a running
+# header or footer.
+PAGE_EDGE_LINES = 2
+_HYPHEN_BREAK = re.compile(r"(\w)-\n\s*([a-z])")
+_SENTENCE_END = (".", ":", ";", "!", "?", "|")
+# Lines at least this long were most likely wrapped by the PDF layout.
+WRAPPED_LINE_LENGTH = 60
+
+
+@dataclass
+class CompactionReport:
+    chars_before: int
+    chars_after: int
+    tokens_before: int
+    tokens_after: int
+    trimmed_sections: list = field(default_factory=list)
+
+    @property
+    def saved_ratio(self):
+        return 1 - self.tokens_after / self.tokens_before if self.tokens_before else 0.0
+
+
+def estimate_tokens(text):
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _page_edges(page):
+    content = [i for i, line in enumerate(page) if line]
+    return set(content[:PAGE_EDGE_LINES] + content[-PAGE_EDGE_LINES:])
+
+
+def _drop_page_furniture(pages):
+    # Running headers/footers: a line with letters in it at the edge of at
+    # least half the pages (and two or more). The first copy is kept. Page
+    # numbers ("Page 2", "2 of 3", or a bare "2" on page 2) are dropped from
+    # page edges only; a number anywhere else is content.
+    def key(line):
+        return re.sub(r"\d+", "#", line.lower())
+
+    edges = [_page_edges(page) for page in pages]
+    counts = Counter()
+    for page, edge in zip(pages, edges):
+        counts.update({key(page[i]) for i in edge})
+    needed = max(2, math.ceil(len(pages) / 2))
+    running = {k for k, n in counts.items() if n >= needed and len(k) <= 80 and re.search(r"[a-z]", k)}
+    seen = set()
+    kept = []
+    for number, (page, edge) in enumerate(zip(pages, edges), start=1):
+        for i, line in enumerate(page):
+            if i in edge:
+                if _PAGE_NUMBER_LINE.match(line) or (len(pages) > 1 and _BARE_NUMBER.match(line) and int(line) == number):
+                    continue
+                k = key(line)
+                if k in running:
+                    if k in seen:
+                        continue
+                    seen.add(k)
+            kept.append(line)
+    return kept
+
+
+def normalize_resume_text(text):
+    """Return ``text`` without extraction artifacts; the wording is unchanged."""
+    text = unicodedata.normalize("NFKC", text).replace("\r\n", "\n").replace("\r", "\n")
+    text = _HYPHEN_BREAK.sub(r"\1\2", text)
+    pages = [[re.sub(r"[ \t]+", " ", line).strip() for line in page.split("\n")] for page in text.split(PAGE_BREAK)]
+    pages = [[_BULLET_LINE.sub("- ", line) if _BULLET_LINE.match(line) else line for line in page] for page in pages]
+    lines = _drop_page_furniture(pages)
+
+    # Re-join visually wrapped lines: a long line that does not end a
+    # sentence, followed by one that starts in lower case, is the same sentence.
+    merged = []
+    for line in lines:
+        previous = merged[-1] if merged else ""
+        if line and line[0].islower() and len(previous) >= WRAPPED_LINE_LENGTH and not previous.endswith(_SENTENCE_END):
+            merged[-1] = f"{merged[-1]} {line}"
+        else:
+            merged.append(line)
+    text = "\n".join(merged)
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+
+_normalized = lru_cache(maxsize=CACHE_SIZE)(normalize_resume_text)
+
+
+def fit_to_budget(text, budget_tokens, priorities):
+    """Trim whole sections, lowest priority first, until ``text`` fits the budget.
+
+    The section that crosses the budget is cut at a line boundary and marked
+    with "[...]". Returns ``(text, trimmed_section_names)``.
+    """
+    if budget_tokens is None or estimate_tokens(text) <= budget_tokens:
+        return text, []
+    sections = parse_resume(text).sections
+    rank = {name: i for i, name in enumerate(priorities)}
+    order = sorted(range(len(sections)), key=lambda i: (rank.get(sections[i].name, len(rank)), i))
+
+    budget_chars = budget_tokens * CHARS_PER_TOKEN
+    kept = {}
+    trimmed = []
+    for i in order:
+        body = sections[i].text_in(text)
+        if len(body) <= budget_chars:
+            kept[i] = body
+            budget_chars -= len(body)
+            continue
+        trimmed.append(sections[i].name)
+        if budget_chars > 200:
+            cut = body.rfind("\n", 0, budget_chars - 6)
+            if cut > 0:
+                kept[i] = body[:cut] + "\n[...]\n"
+        budget_chars = 0
+    compacted = "".join(kept[i] for i in sorted(kept))
+    return compacted.strip(), trimmed
+
+
+def compact_resume(text, feature):
+    """Normalize ``text`` and fit it to ``feature``'s token budget."""
+    # Up to seven features compact the same editor text on one click.
+    normalized = _normalized(text)
+    priorities = FEATURE_PRIORITIES.get(feature, _CORE + _EXTRAS)
+    compacted, trimmed = fit_to_budget(normalized, FEATURE_BUDGETS.get(feature), priorities)
+    report = CompactionReport(
+        chars_before=len(text),
+        chars_after=len(compacted),
+        tokens_before=estimate_tokens(text),
+        tokens_after=estimate_tokens(compacted),
+        trimmed_sections=trimmed,
+    )
+    return compacted, report
@@ -0,0 +1,317 @@
+"""Plain-text extraction for uploaded resumes (PDF and DOCX).
+
+Uploads are checked before any real parsing: the size and magic bytes
+first, then the PDF page count, so an oversized or mislabeled file is
+rejected without building its document model. PDF text is produced one page
+at a time and the document is closed as soon as the last page is read; the
+pages are joined with ``PAGE_BREAK``.
+
+DOCX text is streamed straight out of the ZIP archive with an incremental
+XML parser instead of building a python-docx document: headers, the body
+and footers are read in order, tables row by row and text boxes where they
+are anchored, and each finished element is discarded as soon as it is read.
+
+PyMuPDF is imported on first use of the PDF branch, so importing this module
+(or a worker that only handles DOCX) stays cheap.
+"""
+
+import io
+import multiprocessing
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from xml.etree import ElementTree
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx")
+MAGIC_BYTES = {
+    ".pdf": b"%PDF-",
+    ".docx": b"PK\x03\x04",  # DOCX files are ZIP archives
+}
+
+# Below this many pages the pool is never started. Only callers that ask for
+# workers (benchmarks, scripts) split pages; the app reads them in-process.
+PARALLEL_PAGE_THRESHOLD = 32
+# Page ranges handed out per worker; more than one keeps fast workers busy.
+CHUNKS_PER_WORKER = 4
+
+# Bump whenever parsing output changes so cached texts from older code are ignored.
+EXTRACTOR_VERSION = "4"
+# Separates the pages of a PDF's text (a form feed, as pdftotext writes), so
+# later steps can tell a running header or footer from content.
+PAGE_BREAK = "\f"
+
+
+class ExtractionError(ValueError):
+    """A document was rejected or could not be read; the message is user-facing."""
+
+
+@dataclass(frozen=True)
+class ExtractionLimits:
+    max_bytes: int = 10 * 1024 * 1024
+    max_pages: int = 100
+    max_chars: int = 200_000
+
+    @classmethod
+    def from_env(cls):
+        """Read overrides from RESUME_ANALYZER_MAX_BYTES / _MAX_PAGES / _MAX_CHARS."""
+        defaults = cls()
+        return cls(
+            max_bytes=int(os.environ.get("RESUME_ANALYZER_MAX_BYTES", defaults.max_bytes)),
+            max_pages=int(os.environ.get("RESUME_ANALYZER_MAX_PAGES", defaults.max_pages)),
+            max_chars=int(os.environ.get("RESUME_ANALYZER_MAX_CHARS", defaults.max_chars)),
+        )
+
+
+DEFAULT_LIMITS = ExtractionLimits()
+
+
+def is_supported(filename):
+    return filename.lower().endswith(SUPPORTED_EXTENSIONS)
+
+
+def _extension(filename):
+    return os.path.splitext(filename)[1].lower()
+
+
+def check_upload(head, size, filename, limits=DEFAULT_LIMITS):
+    """Validate a document from its first bytes and total size, before parsing it."""
+    extension = _extension(filename)
+    if extension not in MAGIC_BYTES:
+        raise ExtractionError(f"Unsupported file type: {extension or filename}")
+    if size > limits.max_bytes:
+        raise ExtractionError(
+            f"File is {size / 1024 / 1024:.1f} MB; the limit is {limits.max_bytes / 1024 / 1024:.0f} MB."
+        )
+    if not head.startswith(MAGIC_BYTES[extension]):
+        raise ExtractionError(f"This file does not look like a real {extension.lstrip('.').upper()} document.")
+
+
+def _open_pdf(source):
+    import fitz  # PyMuPDF
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return fitz.open(stream=source, filetype="pdf")
+    return fitz.open(source, filetype="pdf")
+
+
+def iter_pdf_pages(source, limits=DEFAULT_LIMITS):
+    """Yield the text of each page of a PDF given as bytes or a file path.
+
+    The page count is checked before any page is parsed, and the character
+    limit is enforced as pages stream out.
+    """
+    doc = _open_pdf(source)
+    try:
+        if doc.page_count > limits.max_pages:
+            raise ExtractionError(f"Document has {doc.page_count} pages; the limit is {limits.max_pages}.")
+        chars = 0
+        for number in range(doc.page_count):
+            text = doc.load_page(number).get_text()
+            chars += len(text)
+            if chars > limits.max_chars:
+                raise ExtractionError(f"Document has more than {limits.max_chars:,} characters of text.")
+            yield text
+    finally:
+        doc.close()
+
+
+# --- Parallel page extraction ---
+# Workers come from a fork server (or are spawned where there is none, as on
+# Windows) rather than a fork of the caller, which is unsafe in a
+# multi-threaded process.
+_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+_worker_doc = None
+
+
+def _init_page_worker(source):
+    # Each worker opens the document once from the bytes (or path) it was
+    # started with, then serves any number of page ranges from it.
+    global _worker_doc
+    _worker_doc = _open_pdf(source)
+
+
+def _extract_page_range(start, stop):
+    return [_worker_doc.load_page(number).get_text() for number in range(start, stop)]
+
+
+def iter_pdf_pages_parallel(source, limits=DEFAULT_LIMITS, workers=None, threshold=PARALLEL_PAGE_THRESHOLD):
+    """Like ``iter_pdf_pages`` but splits page ranges across a process pool.
+
+    Pages are still yielded in order. Documents shorter than ``threshold``
+    pages, or ``workers=1``, fall back to the sequential extractor.
+    """
+    workers = workers or os.cpu_count() or 1
+    with _open_pdf(source) as doc:
+        page_count = doc.page_count
+    if page_count > limits.max_pages:
+        raise ExtractionError(f"Document has {page_count} pages; the limit is {limits.max_pages}.")
+    if workers <= 1 or page_count < threshold:
+        yield from iter_pdf_pages(source, limits)
+        return
+
+    if isinstance(source, memoryview):
+        source = source.tobytes()
+    chunk = -(-page_count // (workers * CHUNKS_PER_WORKER))
+    starts = range(0, page_count, chunk)
+    stops = [min(start + chunk, page_count) for start in starts]
+    chars = 0
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(_START_METHOD),
+                             initializer=_init_page_worker, initargs=(source,)) as pool:
+        try:
+            for texts in pool.map(_extract_page_range, starts, stops):
+                for text in texts:
+                    chars += len(text)
+                    if chars > limits.max_chars:
+                        raise ExtractionError(f"Document has more than {limits.max_chars:,} characters of text.")
+                    yield text
+        except BaseException:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+
+
+def _pdf_text(source, limits, workers):
+    if workers == 1:
+        return PAGE_BREAK.join(iter_pdf_pages(source, limits))
+    return PAGE_BREAK.join(iter_pdf_pages_parallel(source, limits, workers))
+
+
+# --- Streaming DOCX extraction ---
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+# Drawings repeat their text box in a legacy fallback; only the first copy is read.
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+_CONTAINERS = {f"{_W}p", f"{_W}tc", f"{_W}tr", f"{_W}txbxContent"}
+# Text-like elements of a run. Only a run's own children count: a w:tab under
+# w:pPr/w:tabs defines a tab stop and is not text.
+_INLINE = {f"{_W}tab": "\t", f"{_W}br": "\n", f"{_W}cr": "\n", f"{_W}noBreakHyphen": "-"}
+_RUN = f"{_W}r"
+_PART_NUMBER = re.compile(r"(\d+)\.xml$")
+
+
+def _docx_parts(names):
+    # Headers, then the body, then footers, each group in part-number order.
+    def numbered(prefix):
+        parts = [n for n in names if n.startswith(prefix) and n.endswith(".xml")]
+        return sorted(parts, key=lambda n: int(_PART_NUMBER.search(n).group(1)) if _PART_NUMBER.search(n) else 0)
+
+    return numbered("word/header") + ["word/document.xml"] + numbered("word/footer")
+
+
+def _join(tag, pieces):
+    if tag == f"{_W}p":
+        return "".join(pieces)
+    if tag == f"{_W}tc":
+        return " ".join(p for p in pieces if p.strip())
+    if tag == f"{_W}tr":
+        return " | ".join(p for p in pieces if p)
+    # A text box's paragraphs become lines of the paragraph it is anchored in.
+    return "\n" + "\n".join(pieces) + "\n"
+
+
+def iter_docx_blocks(stream):
+    """Yield the paragraphs and table rows of one DOCX XML part, in reading order.
+
+    Table cells are joined with " | ", one row per block. Elements are freed
+    as they close, so memory stays flat however long the part is.
+    """
+    open_elements, containers = [], []  # containers: [tag, pieces] for open p/tc/tr/text boxes
+    skipping = 0
+    for event, element in ElementTree.iterparse(stream, events=("start", "end")):
+        tag = element.tag
+        if event == "start":
+            open_elements.append(element)
+            if tag == _MC_FALLBACK:
+                skipping += 1
+            elif not skipping and tag in _CONTAINERS:
+                containers.append([tag, []])
+            continue
+
+        open_elements.pop()
+        if tag == _MC_FALLBACK:
+            skipping -= 1
+        elif skipping:
+            pass
+        elif tag == f"{_W}t":
+            if containers:
+                containers[-1][1].append(element.text or "")
+        elif tag in _INLINE:
+            if containers and open_elements and open_elements[-1].tag == _RUN:
+                containers[-1][1].append(_INLINE[tag])
+        elif tag in _CONTAINERS:
+            _, pieces = containers.pop()
+            text = _join(tag, pieces)
+            if containers:
+                containers[-1][1].append(text)
+            else:
+                yield text
+        element.clear()
+        if open_elements:
+            # The parent only ever holds the child being read.
+            open_elements[-1].remove(element)
+
+
+def iter_docx_text(source, limits=DEFAULT_LIMITS):
+    """Yield the text blocks of a DOCX given as bytes or a file path.
+
+    Repeated headers and footers (first page, even pages) are yielded once,
+    and the character limit is enforced as blocks stream out.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    try:
+        with zipfile.ZipFile(source) as archive:
+            names = archive.namelist()
+            if "word/document.xml" not in names:
+                raise ExtractionError("This file does not look like a real DOCX document.")
+            chars = 0
+            seen = set()
+            for part in _docx_parts(names):
+                with archive.open(part) as stream:
+                    if part == "word/document.xml":
+                        blocks = iter_docx_blocks(stream)
+                    else:
+                        # Headers and footers are small; read whole to skip repeats.
+                        blocks = list(iter_docx_blocks(stream))
+                        key = "\n".join(blocks)
+                        if not key.strip() or key in seen:
+                            continue
+                        seen.add(key)
+                    for block in blocks:
+                        chars += len(block) + 1
+                        if chars > limits.max_chars:
+                            raise ExtractionError(f"Document has more than {limits.max_chars:,} characters of text.")
+                        yield block
+    except (zipfile.BadZipFile, ElementTree.ParseError) as e:
+        raise ExtractionError("This DOCX document is damaged and could not be read.") from e
+
+
+def _docx_text(source, limits):
+    return "\n".join(iter_docx_text(source, limits))
+
+
+def parse_document(data, filename, limits=DEFAULT_LIMITS, workers=1):
+    """Return the text of a PDF/DOCX document given its bytes, or None if it has none.
+
+    ``workers`` other than 1 lets long PDFs be split across processes
+    (``None`` means one per CPU). Raises ExtractionError when the upload
+    breaks a limit or is not what its extension claims.
+    """
+    check_upload(bytes(data[:8]), len(data), filename, limits)
+    if _extension(filename) == ".pdf":
+        text = _pdf_text(data, limits, workers)
+    else:
+        text = _docx_text(data, limits)
+    return text if text.strip() else None
+
+
+def extract_text_from_path(path, limits=DEFAULT_LIMITS, workers=1):
+    """Like ``parse_document`` but reads from disk, so PDFs are never loaded whole."""
+    with open(path, "rb") as f:
+        head = f.read(8)
+    check_upload(head, os.path.getsize(path), path, limits)
+    if _extension(path) == ".pdf":
+        text = _pdf_text(path, limits, workers)
+    else:
+        text = _docx_text(path, limits)
+    return text if text.strip() else None
@@ -0,0 +1,166 @@
+"""Re-analyze only the resume sections that changed since the last run.
+
+The resume is split into sections, and each section is fingerprinted by its
+whitespace-normalized text. Findings are stored per (feature, context,
+fingerprint), where the context is e.g. the job description for ATS. After an
+edit, only sections with a new fingerprint go back to the model. The merged
+report combines fresh and stored findings, with a length-weighted overall
+score on the usual ``Resume Score: N/100`` line.
+"""
+
+import hashlib
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from core.ats import format_keyword_table, score_ats
+from core.parsing import parse_score
+from core.prompts import build_section_ats_prompt, build_section_general_prompt
+from core.resume import parse_resume
+from core.sections import Section
+
+SUPPORTED_FEATURES = ("general", "ats")
+# The name/contact block is not worth a model call of its own.
+SKIPPED_SECTIONS = {"header"}
+# Oldest findings are dropped past this many, so a long editing session stays small.
+MAX_STORED_FINDINGS = 256
+_MATCHED_KEYWORDS = re.compile(r"Matched Keywords:\s*(.+)", re.IGNORECASE)
+
+
+@dataclass
+class SectionFindings:
+    name: str
+    heading: str
+    fingerprint: str
+    score: int | None
+    findings: str
+    keywords: list = field(default_factory=list)
+    reused: bool = False
+
+
+@dataclass
+class IncrementalReport:
+    analyzed: list = field(default_factory=list)   # section headings sent to the model
+    reused: list = field(default_factory=list)     # section headings served from stored findings
+    removed: list = field(default_factory=list)    # sections present last time but gone now
+
+
+def fingerprint(text):
+    return hashlib.sha1(" ".join(text.split()).encode("utf-8")).hexdigest()
+
+
+def _context_digest(context):
+    return hashlib.sha1((context or "").encode("utf-8")).hexdigest()[:12]
+
+
+def fingerprint_sections(text):
+    """Return ``[(section, section_text, fingerprint)]`` for the analyzable sections.
+
+    A resume without recognizable headings is one section covering all of it.
+    """
+    result = []
+    for section in parse_resume(text).sections:
+        body = section.text_in(text)
+        if section.name in SKIPPED_SECTIONS or not body.strip():
+            continue
+        result.append((section, body, fingerprint(body)))
+    if not result and text.strip():
+        result.append((Section("resume", "", 0, len(text)), text, fingerprint(text)))
+    return result
+
+
+def _section_prompt(feature, section, body, job_description):
+    label = section.heading or section.name
+    if feature == "ats":
+        return build_section_ats_prompt(label, body, job_description)
+    return build_section_general_prompt(label, body)
+
+
+def _findings_from_response(feature, section, digest, response):
+    keywords = []
+    if feature == "ats":
+        match = _MATCHED_KEYWORDS.search(response)
+        if match:
+            keywords = [k.strip(" *`.") for k in match.group(1).split(",")]
+            keywords = [k for k in keywords if k and k.lower() != "none"]
+    return SectionFindings(section.name, section.heading, digest, parse_score(response), response.strip(), keywords)
+
+
+def run_incremental(feature, resume_text, generate, store, job_description=None, max_workers=4):
+    """Analyze ``resume_text`` section by section, reusing stored findings.
+
+    ``generate(prompt, feature)`` returns model text and may be called from
+    worker threads. ``store`` is a dict (e.g. kept in session state) that
+    holds findings between runs. Returns ``(markdown, IncrementalReport)``.
+    """
+    if feature not in SUPPORTED_FEATURES:
+        raise ValueError(f"Incremental analysis supports {SUPPORTED_FEATURES}, not {feature!r}")
+    context = job_description if feature == "ats" else None
+    findings_store = store.setdefault("findings", {})
+    previous = store.setdefault("last_sections", {}).get(feature, {})
+    digest_prefix = f"{feature}:{_context_digest(context)}:"
+
+    sections = fingerprint_sections(resume_text)
+    if not sections:
+        raise ValueError("The resume has no text to analyze")
+    report = IncrementalReport()
+    results = [None] * len(sections)
+    pending = []
+    for i, (section, body, digest) in enumerate(sections):
+        stored = findings_store.get(digest_prefix + digest)
+        if stored is not None:
+            stored.reused = True
+            results[i] = stored
+            report.reused.append(section.heading or section.name)
+        else:
+            pending.append(i)
+            report.analyzed.append(section.heading or section.name)
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as pool:
+            responses = pool.map(
+                lambda i: generate(_section_prompt(feature, sections[i][0], sections[i][1], job_description), feature),
+                pending,
+            )
+            for i, response in zip(pending, responses):
+                section, _, digest = sections[i]
+                findings = _findings_from_response(feature, section, digest, response)
+                findings_store[digest_prefix + digest] = findings
+                results[i] = findings
+        while len(findings_store) > MAX_STORED_FINDINGS:
+            del findings_store[next(iter(findings_store))]
+
+    current = {digest: section.heading or section.name for section, _, digest in sections}
+    report.removed = [label for label in previous.values() if label not in current.values()]
+    store["last_sections"][feature] = current
+
+    weights = [len(body) for _, body, _ in sections]
+    return _merge(feature, results, weights, resume_text, job_description), report
+
+
+def _merge(feature, results, weights, resume_text, job_description):
+    scored = [(r.score, w) for r, w in zip(results, weights) if r.score is not None]
+    total = sum(w for _, w in scored)
+    overall = round(sum(s * w for s, w in scored) / total) if total else 0
+    label = "ATS Score" if feature == "ats" else "Resume Score"
+    lines = [f"{label}: {overall}/100", ""]
+
+    if feature == "ats":
+        # Keywords the model matched anywhere count as present; the local
+        # scorer supplies the job's important terms to report as missing.
+        matched, seen = [], set()
+        for r in results:
+            for keyword in r.keywords:
+                if keyword.lower() not in seen:
+                    seen.add(keyword.lower())
+                    matched.append(keyword)
+        matched_text = " ".join(seen)
+        local = score_ats(resume_text, job_description or "")
+        missing = [k for k in local.missing_keywords if k.lower() not in matched_text]
+        lines += [format_keyword_table(missing, matched), ""]
+
+    for r in results:
+        marker = " _(unchanged, reused)_" if r.reused else ""
+        score = f" — {r.score}/100" if r.score is not None else ""
+        lines += [f"#### {r.heading or r.name.title()}{score}{marker}", r.findings, ""]
+    return "\n".join(lines).strip()
@@ -0,0 +1,207 @@
+"""A library of saved job descriptions, preprocessed once and memory-mapped.
+
+``build_library`` reads a folder of job descriptions (``.txt``, or PDF/DOCX)
+and writes, for every role, its normalized text and its term counts:
+
+* ``manifest.json``: format version, source fingerprints, and per role the
+  id, title and offsets into the files below;
+* ``vocab.json``: every term once, with how it was first written;
+* ``texts.bin``: the normalized texts, concatenated UTF-8;
+* ``term_ids.npy`` / ``term_counts.npy``: per-role term ids and counts,
+  concatenated (``int32``).
+
+``JobLibrary`` opens these with ``mmap``/``np.load(mmap_mode="r")``, so
+processes share the pages and opening costs nothing per role. The ATS score
+and the resume matcher start from the stored counts instead of re-tokenizing
+the job description on every rerun.
+
+Usage::
+
+    python -m core.jd_library SampleJOBDesc .cache/jd_library
+"""
+
+import argparse
+import json
+import mmap
+import os
+import re
+import shutil
+import tempfile
+
+import numpy as np
+
+from core.ats import score_terms, weigh_counts
+from core.compaction import normalize_resume_text
+from core.extraction import extract_text_from_path, is_supported
+from core.resume import parse_resume
+from core.text import extract_terms
+
+LIBRARY_VERSION = 1
+DEFAULT_LIBRARY_DIR = os.path.join(".cache", "jd_library")
+_TITLE_LINE = re.compile(r"^\s*(?:job\s+title|title|position|role)\s*:\s*(.+)$", re.IGNORECASE | re.MULTILINE)
+
+
+def _is_job_description(name):
+    return name.lower().endswith(".txt") or is_supported(name)
+
+
+def _fingerprint(source_dir):
+    # Rebuild when any file is added, removed or modified.
+    entries = []
+    for name in sorted(os.listdir(source_dir)):
+        path = os.path.join(source_dir, name)
+        if _is_job_description(name) and os.path.isfile(path):
+            stat = os.stat(path)
+            entries.append([name, stat.st_size, stat.st_mtime_ns])
+    return entries
+
+
+def _read(path):
+    if path.lower().endswith(".txt"):
+        with open(path, encoding="utf-8", errors="replace") as f:
+            return f.read()
+    return extract_text_from_path(path)
+
+
+def _title(text, role_id):
+    match = _TITLE_LINE.search(text[:500])
+    return match.group(1).strip() if match else role_id
+
+
+def build_library(source_dir, library_dir=DEFAULT_LIBRARY_DIR):
+    """Preprocess every job description in ``source_dir`` into ``library_dir``."""
+    fingerprint = _fingerprint(source_dir)
+    vocab, surfaces = {}, []
+    roles, texts = [], []
+    term_ids, term_counts = [], []
+    text_offset = term_offset = 0
+    for name, _, _ in fingerprint:
+        text = normalize_resume_text(_read(os.path.join(source_dir, name)))
+        if not text:
+            continue
+        terms, role_surfaces = extract_terms(text)
+        counts = {}
+        for term in terms:
+            counts[term] = counts.get(term, 0) + 1
+        for term, count in counts.items():
+            if term not in vocab:
+                vocab[term] = len(surfaces)
+                surfaces.append([term, role_surfaces.get(term, term)])
+            term_ids.append(vocab[term])
+            term_counts.append(count)
+        data = text.encode("utf-8")
+        role_id = os.path.splitext(name)[0]
+        roles.append({
+            "id": role_id,
+            "title": _title(text, role_id),
+            "source": name,
+            "text": [text_offset, len(data)],
+            "terms": [term_offset, len(counts)],
+        })
+        texts.append(data)
+        text_offset += len(data)
+        term_offset += len(counts)
+
+    # Written to a sibling folder and swapped in, so readers never see half a library.
+    parent = os.path.dirname(os.path.abspath(library_dir))
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(dir=parent, prefix=".jd_library-")
+    with open(os.path.join(staging, "texts.bin"), "wb") as f:
+        f.write(b"".join(texts))
+    np.save(os.path.join(staging, "term_ids.npy"), np.asarray(term_ids, dtype=np.int32))
+    np.save(os.path.join(staging, "term_counts.npy"), np.asarray(term_counts, dtype=np.int32))
+    with open(os.path.join(staging, "vocab.json"), "w", encoding="utf-8") as f:
+        json.dump(surfaces, f)
+    with open(os.path.join(staging, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({"version": LIBRARY_VERSION, "source_dir": os.path.abspath(source_dir),
+                   "fingerprint": fingerprint, "roles": roles}, f, indent=1)
+    if os.path.isdir(library_dir):
+        shutil.rmtree(library_dir)
+    os.replace(staging, library_dir)
+    return JobLibrary(library_dir)
+
+
+def open_library(source_dir, library_dir=DEFAULT_LIBRARY_DIR):
+    """Open the library for ``source_dir``, rebuilding it first if the folder changed."""
+    try:
+        library = JobLibrary(library_dir)
+        if library.version == LIBRARY_VERSION and library.fingerprint == _fingerprint(source_dir):
+            return library
+        library.close()
+    except (OSError, ValueError, KeyError):
+        pass
+    return build_library(source_dir, library_dir)
+
+
+class JobLibrary:
+    def __init__(self, library_dir=DEFAULT_LIBRARY_DIR):
+        self.library_dir = library_dir
+        with open(os.path.join(library_dir, "manifest.json"), encoding="utf-8") as f:
+            manifest = json.load(f)
+        self.version = manifest["version"]
+        self.fingerprint = manifest["fingerprint"]
+        self.roles = manifest["roles"]
+        self._by_id = {role["id"]: role for role in self.roles}
+        with open(os.path.join(library_dir, "vocab.json"), encoding="utf-8") as f:
+            pairs = json.load(f)
+        self._terms = [term for term, _ in pairs]
+        self._surfaces = {term: surface for term, surface in pairs}
+        self._term_ids = np.load(os.path.join(library_dir, "term_ids.npy"), mmap_mode="r")
+        self._term_counts = np.load(os.path.join(library_dir, "term_counts.npy"), mmap_mode="r")
+        self._texts_file = open(os.path.join(library_dir, "texts.bin"), "rb")
+        size = os.fstat(self._texts_file.fileno()).st_size
+        # mmap cannot map an empty file; an empty library has no texts to read.
+        self._texts = mmap.mmap(self._texts_file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    def __len__(self):
+        return len(self.roles)
+
+    def __contains__(self, role_id):
+        return role_id in self._by_id
+
+    def close(self):
+        if isinstance(self._texts, mmap.mmap):
+            self._texts.close()
+        self._texts_file.close()
+
+    def title(self, role_id):
+        return self._by_id[role_id]["title"]
+
+    def text(self, role_id):
+        offset, length = self._by_id[role_id]["text"]
+        return self._texts[offset:offset + length].decode("utf-8")
+
+    def term_counts(self, role_id):
+        """Return ``{term: count}`` for a role, as ``core.matching`` accepts it."""
+        offset, length = self._by_id[role_id]["terms"]
+        ids = self._term_ids[offset:offset + length]
+        counts = self._term_counts[offset:offset + length]
+        return {self._terms[i]: int(c) for i, c in zip(ids.tolist(), counts.tolist())}
+
+    def all_term_counts(self):
+        return {role["id"]: self.term_counts(role["id"]) for role in self.roles}
+
+    def score_ats(self, role_id, resume_text, idf=None, top_n=7):
+        """``core.ats.score_ats`` against a saved role, without re-reading its text."""
+        counts = self.term_counts(role_id)
+        vocab = sorted(counts)
+        if not vocab:
+            return score_terms([], [], None, self._surfaces, top_n)
+        weights = weigh_counts(vocab, [counts[t] for t in vocab], idf)
+        resume_terms, _ = parse_resume(resume_text).terms()
+        return score_terms(resume_terms, vocab, weights, self._surfaces, top_n)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Preprocess a folder of job descriptions into a saved-role library.")
+    parser.add_argument("source_dir", help="Folder of job descriptions, e.g. SampleJOBDesc/")
+    parser.add_argument("library_dir", nargs="?", default=DEFAULT_LIBRARY_DIR)
+    args = parser.parse_args(argv)
+    library = build_library(args.source_dir, args.library_dir)
+    for role in library.roles:
+        print(f"{role['id']}: {role['title']} ({role['terms'][1]} terms)")
+    print(f"Wrote {len(library)} roles to {args.library_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""Background queue for long analyses, persisted in a local SQLite file.
+
+An analysis run inline in the Streamlit script is cut short by any widget
+interaction or reconnect, and the user clicks again. Jobs submitted here run
+on worker threads that outlive the script run; each job's prompt, status and
+result live in the ``jobs`` table, so a page that reconnects under the same
+session id picks up finished results, and jobs left queued or running by a
+server process that died are run again by the next one.
+
+A running job is held on a lease: its queue renews the job's ``heartbeat``
+every few seconds, and a running job whose heartbeat is older than ``lease``
+seconds (its process died, or its queue was dropped) goes back to the queue.
+Unlike process ids, leases survive PID reuse and work the same on every OS.
+
+A job is plain data (feature, prompt, options); the ``runner`` passed to the
+queue turns it into text, so the queue knows nothing about models.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import namedtuple
+
+DAY = 24 * 60 * 60
+HOUR = 60 * 60
+ACTIVE = ("queued", "running")
+# Longest pause of a worker that keeps failing to read or write the job table.
+MAX_BACKOFF = 30.0
+
+logger = logging.getLogger(__name__)
+
+Job = namedtuple("Job", "id session_id feature result_key status result error created started finished")
+_COLUMNS = ", ".join(Job._fields)
+
+
+class JobQueue:
+    def __init__(self, path, runner, workers=2, keep_for=DAY, poll_interval=1.0, purge_interval=HOUR, lease=60.0):
+        self.path = path
+        self.runner = runner
+        self.keep_for = keep_for
+        self.poll_interval = poll_interval
+        self.purge_interval = purge_interval
+        self.lease = lease
+        # Identifies this queue's running jobs; a new queue in the same
+        # process (a cleared cache_resource) gets a new one.
+        self.owner = uuid.uuid4().hex
+        self._next_purge = 0.0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._counters = {"submitted": 0, "joined": 0, "done": 0, "failed": 0, "recovered": 0, "errors": 0}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                session_id TEXT NOT NULL,
+                feature TEXT NOT NULL,
+                result_key TEXT NOT NULL,
+                prompt TEXT NOT NULL,
+                options TEXT NOT NULL,
+                status TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                owner TEXT,
+                delivered INTEGER NOT NULL DEFAULT 0,
+                created REAL NOT NULL,
+                started REAL,
+                finished REAL,
+                heartbeat REAL
+            )"""
+        )
+        if "heartbeat" not in {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}:
+            try:
+                self._conn.execute("ALTER TABLE jobs ADD COLUMN heartbeat REAL")
+            except sqlite3.OperationalError:
+                pass  # another process added it first
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_by_session ON jobs (session_id, delivered)")
+        self._recover()
+        self._workers = [
+            threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True) for i in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+        threading.Thread(target=self._keep_leases, name="job-leases", daemon=True).start()
+
+    def _recover(self):
+        # Running jobs whose lease ran out go back to the queue.
+        with self._lock:
+            recovered = self._conn.execute(
+                "UPDATE jobs SET status = 'queued', owner = NULL, heartbeat = NULL "
+                "WHERE status = 'running' AND (heartbeat IS NULL OR heartbeat < ?)",
+                (time.time() - self.lease,),
+            ).rowcount
+            self._counters["recovered"] += recovered
+        if recovered:
+            self._wake.set()
+        self._purge()
+
+    def _keep_leases(self):
+        # Renew this queue's leases well before they run out, and take back
+        # jobs whose owner stopped renewing.
+        while True:
+            time.sleep(self.lease / 4)
+            try:
+                with self._lock:
+                    self._conn.execute(
+                        "UPDATE jobs SET heartbeat = ? WHERE owner = ? AND status = 'running'",
+                        (time.time(), self.owner),
+                    )
+                self._recover()
+            except Exception:
+                logger.exception("Could not renew job leases in %s", self.path)
+
+    def _purge(self):
+        # Finished jobs (and their results) older than ``keep_for`` are
+        # deleted at startup and then at most once per ``purge_interval``.
+        now = time.time()
+        with self._lock:
+            if now < self._next_purge:
+                return
+            self._next_purge = now + self.purge_interval
+            self._conn.execute("DELETE FROM jobs WHERE finished < ?", (now - self.keep_for,))
+
+    # --- Submitting and polling (script thread) ---
+    def submit(self, session_id, feature, result_key, prompt, options=None):
+        """Queue a job and return its id; an identical active job is returned instead of a second one."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id FROM jobs WHERE session_id = ? AND result_key = ? AND prompt = ? AND status IN (?, ?)",
+                (session_id, result_key, prompt, *ACTIVE),
+            ).fetchone()
+            if row is not None:
+                self._counters["joined"] += 1
+                return row[0]
+            job_id = uuid.uuid4().hex
+            self._conn.execute(
+                "INSERT INTO jobs (id, session_id, feature, result_key, prompt, options, status, created) "
+                "VALUES (?, ?, ?, ?, ?, ?, 'queued', ?)",
+                (job_id, session_id, feature, result_key, prompt, json.dumps(options or {}), time.time()),
+            )
+            self._counters["submitted"] += 1
+        self._wake.set()
+        return job_id
+
+    def get(self, job_id):
+        with self._lock:
+            row = self._conn.execute(f"SELECT {_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return Job(*row) if row else None
+
+    def undelivered(self, session_id):
+        """The session's jobs whose results it has not taken yet, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM jobs WHERE session_id = ? AND delivered = 0 ORDER BY created",
+                (session_id,),
+            ).fetchall()
+        return [Job(*row) for row in rows]
+
+    def mark_delivered(self, job_id):
+        with self._lock:
+            self._conn.execute("UPDATE jobs SET delivered = 1 WHERE id = ?", (job_id,))
+
+    # --- Workers ---
+    def _claim(self):
+        # BEGIN IMMEDIATE takes the write lock before the read, so two
+        # processes sharing the file never take the same job. (UPDATE ...
+        # RETURNING would do it in one statement but needs SQLite 3.35.)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT id, feature, prompt, options FROM jobs WHERE status = 'queued' ORDER BY created LIMIT 1"
+                ).fetchone()
+                if row is not None:
+                    claimed = self._conn.execute(
+                        "UPDATE jobs SET status = 'running', owner = ?, started = ?, heartbeat = ? "
+                        "WHERE id = ? AND status = 'queued'",
+                        (self.owner, time.time(), time.time(), row[0]),
+                    ).rowcount
+                    if not claimed:
+                        row = None
+                self._conn.execute("COMMIT")
+            except BaseException:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                raise
+        return row
+
+    def _finish(self, job_id, status, result=None, error=None):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished = ? WHERE id = ?",
+                (status, result, error, time.time(), job_id),
+            )
+            self._counters[status] += 1
+
+    def _work(self):
+        # A database error (locked past the timeout, disk full) must not end
+        # the thread: nothing would restart it and queued jobs would wait forever.
+        backoff = self.poll_interval
+        while True:
+            try:
+                self._work_once()
+            except Exception:
+                logger.exception("Job worker could not use %s; retrying in %.1fs", self.path, backoff)
+                with self._lock:
+                    self._counters["errors"] += 1
+                time.sleep(backoff)
+                backoff = min(backoff * 2, MAX_BACKOFF)
+            else:
+                backoff = self.poll_interval
+
+    def _work_once(self):
+        job = self._claim()
+        if job is None:
+            # Also picks up jobs queued by other processes sharing the file.
+            self._purge()
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            return
+        job_id, feature, prompt, options = job
+        try:
+            result = self.runner(feature, prompt, json.loads(options))
+        except Exception as e:
+            self._finish(job_id, "failed", error=str(e) or type(e).__name__)
+            return
+        try:
+            self._finish(job_id, "done", result=result)
+        except Exception as e:
+            self._finish(job_id, "failed", error=f"The result could not be saved: {e}")
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+            return {"queued": counts.get("queued", 0), "running": counts.get("running", 0), **self._counters}
@@ -0,0 +1,116 @@
+"""Thin helpers around ``model.generate_content`` shared by every prompt flow."""
+
+import os
+import time
+
+from core.backends import create_backend
+from core.compaction import estimate_tokens
+from core.llm_cache import make_key
+from core.metrics import observe
+
+MODEL_NAME = "gemini-1.5-flash"
+TEMPERATURE = 0.2
+
+
+def create_model(api_key, model_name=MODEL_NAME, temperature=TEMPERATURE, backend=None):
+    """Return ``(model, generation_config)`` for ``backend`` (see ``core.backends``)."""
+    backend = backend or os.environ.get("RESUME_ANALYZER_BACKEND") or "gemini"
+    model = create_backend(backend, model_name, api_key)
+    if backend in ("stub", "replay"):
+        # Same cache key as the SDK's GenerationConfig, without importing the SDK.
+        return model, {"temperature": temperature}
+    import google.generativeai as genai
+
+    return model, genai.types.GenerationConfig(temperature=temperature)
+
+
+def _observe_call(feature, source, started, prompt, response):
+    # Token counts are estimates (see core.compaction), not billed usage.
+    observe("llm", time.perf_counter() - started, {"feature": feature, "source": source}, {
+        "prompt_chars": len(prompt),
+        "prompt_tokens": estimate_tokens(prompt),
+        "response_chars": len(response),
+        "response_tokens": estimate_tokens(response),
+    })
+
+
+def _accepted(text, validate):
+    if validate is None:
+        return True
+    try:
+        validate(text)
+    except Exception:
+        return False
+    return True
+
+
+def generate_text(model, prompt, generation_config=None, feature="general", cache=None, bypass_cache=False,
+                  scheduler=None, session_id=None, validate=None):
+    """Return the response text for ``prompt``, going through ``cache`` when given.
+
+    With ``bypass_cache`` the cached copy is ignored but the fresh response
+    still replaces it, so a forced rerun also refreshes the cache. Cache
+    misses are sent through ``scheduler`` (rate limits, retries, fairness
+    across ``session_id``s) when one is given. ``validate(text)`` may raise
+    to reject an answer: a rejected answer is never cached (a cached one is
+    treated as a miss) and the error reaches the caller.
+    """
+    started = time.perf_counter()
+    key = None
+    if cache is not None:
+        key = make_key(model.model_name, generation_config, prompt)
+        if not bypass_cache:
+            cached = cache.get(key, feature)
+            if cached is not None and _accepted(cached, validate):
+                _observe_call(feature, "cache", started, prompt, cached)
+                return cached
+
+    def call():
+        return model.generate_content(prompt, generation_config=generation_config).text
+
+    text = scheduler.call(session_id, call) if scheduler is not None else call()
+    _observe_call(feature, "model", started, prompt, text)
+    if validate is not None:
+        validate(text)
+    if key is not None:
+        cache.put(key, feature, text)
+    return text
+
+
+def stream_text(model, prompt, generation_config=None, feature="general", cache=None, bypass_cache=False,
+                scheduler=None, session_id=None):
+    """Yield the response for ``prompt`` in chunks as the model produces them.
+
+    A cached answer is yielded as a single chunk. The full text is only
+    written to the cache once the stream has finished, so an interrupted
+    generation never leaves a truncated entry behind.
+    """
+    started = time.perf_counter()
+    key = None
+    if cache is not None:
+        key = make_key(model.model_name, generation_config, prompt)
+        if not bypass_cache:
+            cached = cache.get(key, feature)
+            if cached is not None:
+                _observe_call(feature, "cache", started, prompt, cached)
+                yield cached
+                return
+
+    def start():
+        return model.generate_content(prompt, generation_config=generation_config, stream=True)
+
+    chunks = scheduler.stream(session_id, start) if scheduler is not None else start()
+    parts = []
+    for chunk in chunks:
+        # The closing chunk of a stream may carry only finish metadata.
+        text = chunk.text if chunk.parts else ""
+        if text:
+            if not parts:
+                observe("llm_first_chunk", time.perf_counter() - started, {"feature": feature})
+            parts.append(text)
+            yield text
+    text = "".join(parts)
+    # Time spent rendering in the caller between chunks is included here.
+    _observe_call(feature, "model", started, prompt, text)
+    if key is not None:
+        cache.put(key, feature, text)
@@ -0,0 +1,140 @@
+"""Persistent cache for model responses.
+
+Responses are stored in a local SQLite file keyed on the model name, the
+generation config and a whitespace-normalized prompt. Each feature has its own
+time-to-live, and the store is trimmed least-recently-used first once it grows
+past ``max_bytes``.
+"""
+
+import dataclasses
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+DAY = 24 * 60 * 60
+
+# Market trends go stale quickly; rewrites of the same resume do not.
+DEFAULT_TTLS = {
+    "general": 7 * DAY,
+    "ats": 7 * DAY,
+    "enhancement": 7 * DAY,
+    "roadmap": 3 * DAY,
+    "opportunities": 3 * DAY,
+    "trends": 1 * DAY,
+    "cover_letter": 7 * DAY,
+    # One answer covering every scored analysis, trends included.
+    "structured": 1 * DAY,
+}
+FALLBACK_TTL = 1 * DAY
+
+
+def normalize_prompt(prompt):
+    """Strip indentation and collapse whitespace so cosmetic edits share a key."""
+    lines = (re.sub(r"[ \t]+", " ", line).strip() for line in prompt.strip().splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def config_to_dict(generation_config):
+    if generation_config is None:
+        return {}
+    if dataclasses.is_dataclass(generation_config):
+        generation_config = dataclasses.asdict(generation_config)
+    return {k: v for k, v in dict(generation_config).items() if v is not None}
+
+
+def make_key(model_name, generation_config, prompt):
+    payload = json.dumps(
+        [model_name, config_to_dict(generation_config), normalize_prompt(prompt)],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, path, max_bytes=256 * 1024 * 1024, ttls=None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                feature TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                accessed REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+
+    def ttl_for(self, feature):
+        return self.ttls.get(feature, FALLBACK_TTL)
+
+    def get(self, key, feature):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_for(feature):
+                if row is not None:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def put(self, key, feature, value):
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, feature, value, size, created, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, feature, value, size, now, now),
+            )
+            self._evict()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall()
+        doomed = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+    def stats(self):
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": entries,
+                "bytes": total,
+                "max_bytes": self.max_bytes,
+            }
@@ -0,0 +1,194 @@
+"""Rank many resumes against many job descriptions at once.
+
+``ResumeIndex`` keeps inverted postings (term -> resume, term frequency) over
+extracted resume texts. Adding a resume only appends to its terms' postings,
+and IDF and length statistics are computed at query time, so the index never
+needs rebuilding. ``match`` scores every resume against every job description
+with BM25 in one matrix product.
+
+Usage::
+
+    python -m core.matching SampleResume SampleJOBDesc --top 5
+"""
+
+import argparse
+import os
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from core.ats import BIGRAM_BOOST
+from core.text import extract_terms
+
+K1 = 1.2
+B = 0.75
+# Resumes scored per matrix product; bounds the dense block to
+# DOC_CHUNK x (distinct JD terms) floats.
+DOC_CHUNK = 4096
+
+
+@dataclass
+class MatchResult:
+    role_ids: list
+    doc_ids: list
+    scores: np.ndarray  # shape (len(role_ids), len(doc_ids)), 0-100
+
+    def top_for_roles(self, k=10):
+        """Return ``{role_id: [(doc_id, score), ...]}`` with the best ``k`` resumes per role."""
+        return {
+            role: self._top(self.scores[i], self.doc_ids, k)
+            for i, role in enumerate(self.role_ids)
+        }
+
+    def top_for_candidates(self, k=3):
+        """Return ``{doc_id: [(role_id, score), ...]}`` with the best ``k`` roles per resume."""
+        return {
+            doc: self._top(self.scores[:, j], self.role_ids, k)
+            for j, doc in enumerate(self.doc_ids)
+        }
+
+    @staticmethod
+    def _top(row, labels, k):
+        k = min(k, len(row))
+        if k == 0:
+            return []
+        best = np.argpartition(-row, k - 1)[:k]
+        best = best[np.argsort(-row[best], kind="stable")]
+        return [(labels[i], float(row[i])) for i in best]
+
+
+def _term_counts(job_description):
+    if isinstance(job_description, str):
+        return Counter(extract_terms(job_description)[0])
+    return job_description
+
+
+class ResumeIndex:
+    def __init__(self):
+        self.doc_ids = []
+        self._positions = {}
+        self._doc_lengths = []
+        self._postings = defaultdict(lambda: ([], []))  # term -> (doc positions, term frequencies)
+
+    def __len__(self):
+        return len(self.doc_ids)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._positions
+
+    def add(self, doc_id, text):
+        """Index one resume. Re-adding an existing ``doc_id`` is ignored."""
+        if doc_id in self._positions:
+            return
+        position = len(self.doc_ids)
+        self.doc_ids.append(doc_id)
+        self._positions[doc_id] = position
+        terms, _ = extract_terms(text)
+        self._doc_lengths.append(len(terms))
+        for term, count in Counter(terms).items():
+            docs, freqs = self._postings[term]
+            docs.append(position)
+            freqs.append(count)
+
+    def add_many(self, items):
+        for doc_id, text in items:
+            self.add(doc_id, text)
+
+    def idf(self, terms):
+        """Return BM25 IDF values for ``terms`` as a NumPy array."""
+        n = len(self.doc_ids)
+        df = np.array([len(self._postings[t][0]) if t in self._postings else 0 for t in terms], dtype=float)
+        return np.log1p((n - df + 0.5) / (df + 0.5))
+
+    def idf_table(self, terms):
+        """Return ``{term: idf}``, e.g. to pass to ``core.ats.score_ats``."""
+        terms = list(terms)
+        return dict(zip(terms, self.idf(terms).tolist()))
+
+    def match(self, job_descriptions):
+        """Score every indexed resume against every job description.
+
+        ``job_descriptions`` maps role ids to job description text, or to
+        precomputed ``{term: count}`` mappings (see ``core.jd_library``). Scores are
+        0-100, built from the share of a role's IDF-weighted terms a resume
+        covers, with BM25 length normalization and term-frequency saturation.
+        """
+        role_ids = list(job_descriptions)
+        if not role_ids or not self.doc_ids:
+            return MatchResult(role_ids, list(self.doc_ids), np.zeros((len(role_ids), len(self.doc_ids))))
+
+        # Query side: one weight row per role over the union of their terms.
+        role_counts = [_term_counts(job_descriptions[role]) for role in role_ids]
+        vocab = sorted(set().union(*role_counts))
+        column = {term: i for i, term in enumerate(vocab)}
+        query = np.zeros((len(role_ids), len(vocab)), dtype=np.float32)
+        for i, counts in enumerate(role_counts):
+            for term, count in counts.items():
+                query[i, column[term]] = count * (K1 + 1) / (count + K1)
+        boosts = np.array([BIGRAM_BOOST if " " in term else 1.0 for term in vocab], dtype=np.float32)
+        query *= boosts * self.idf(vocab).astype(np.float32)
+        totals = query.sum(axis=1, keepdims=True)
+        query /= np.where(totals > 0, totals, 1)
+
+        # Resume side: gather the postings of the query terms as triplets.
+        doc_parts, col_parts, tf_parts = [], [], []
+        for term, col in column.items():
+            if term in self._postings:
+                docs, freqs = self._postings[term]
+                doc_parts.append(np.asarray(docs, dtype=np.int64))
+                tf_parts.append(np.asarray(freqs, dtype=np.float32))
+                col_parts.append(np.full(len(docs), col, dtype=np.int64))
+        scores = np.zeros((len(role_ids), len(self.doc_ids)), dtype=np.float32)
+        if doc_parts:
+            docs = np.concatenate(doc_parts)
+            cols = np.concatenate(col_parts)
+            tfs = np.concatenate(tf_parts)
+            lengths = np.asarray(self._doc_lengths, dtype=np.float32)
+            norm = 1 - B + B * lengths[docs] / max(lengths.mean(), 1.0)
+            # Saturated term frequency, capped so one mention in an average
+            # length resume already earns full credit (as in core.ats).
+            values = np.minimum(1.0, tfs * (K1 + 1) / (tfs + K1 * norm))
+
+            order = np.argsort(docs, kind="stable")
+            docs, cols, values = docs[order], cols[order], values[order]
+            for start in range(0, len(self.doc_ids), DOC_CHUNK):
+                stop = min(start + DOC_CHUNK, len(self.doc_ids))
+                lo, hi = np.searchsorted(docs, [start, stop])
+                block = np.zeros((stop - start, len(vocab)), dtype=np.float32)
+                block[docs[lo:hi] - start, cols[lo:hi]] = values[lo:hi]
+                scores[:, start:stop] = query @ block.T
+        # Same square-root calibration as the instant ATS score.
+        return MatchResult(role_ids, list(self.doc_ids), 100 * np.sqrt(scores))
+
+
+def main(argv=None):
+    from core.batch import extract_resume, iter_resume_paths
+    from core.jd_library import DEFAULT_LIBRARY_DIR, open_library
+
+    parser = argparse.ArgumentParser(description="Rank a folder of resumes against a folder of job descriptions.")
+    parser.add_argument("resume_dir")
+    parser.add_argument("jd_dir", help="Folder of job descriptions, e.g. SampleJOBDesc/")
+    parser.add_argument("--library", default=DEFAULT_LIBRARY_DIR,
+                        help="Where the preprocessed job descriptions are kept (rebuilt when jd_dir changes)")
+    parser.add_argument("--top", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    index = ResumeIndex()
+    with ProcessPoolExecutor() as pool:
+        for path, text, error in pool.map(extract_resume, iter_resume_paths(args.resume_dir)):
+            if error:
+                print(f"skipped {os.path.basename(path)}: {error}")
+            else:
+                index.add(os.path.basename(path), text)
+
+    result = index.match(open_library(args.jd_dir, args.library).all_term_counts())
+    for role, ranked in result.top_for_roles(args.top).items():
+        print(f"\n{role}")
+        for rank, (doc_id, score) in enumerate(ranked, start=1):
+            print(f"  {rank}. {doc_id}  {score:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""Per-stage latency spans, aggregated into histograms.
+
+Code under measurement wraps itself in ``span(stage, **labels)`` (or the
+``timed`` decorator). Each finished span updates a histogram keyed by the
+stage and its labels, adds any numeric fields it recorded (character and
+token counts, say) to running totals, and, when a log file is configured, is
+appended to it as one JSON line.
+
+Everything lives in one process-wide registry. It can be read with
+``snapshot()``, exported in Prometheus text format by ``serve()`` or written
+to a log with ``configure_log()``. ``configure_from_env`` does both from
+``RESUME_ANALYZER_METRICS_PORT`` and ``RESUME_ANALYZER_METRICS_LOG``.
+"""
+
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Upper bounds in seconds; the last bucket is +Inf.
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+# Percentiles come from this many most recent samples per histogram.
+RECENT_SAMPLES = 1024
+METRIC_PREFIX = "resume_analyzer"
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+        self.totals = {}
+
+    def observe(self, seconds, fields):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+        for name, value in fields.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                self.totals[name] = self.totals.get(name, 0) + value
+
+    def percentile(self, q):
+        samples = sorted(self.recent)
+        return samples[int(q * (len(samples) - 1))] if samples else 0.0
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}  # (stage, ((label, value), ...)) -> Histogram
+        self._log = None
+
+    def observe(self, stage, seconds, labels=None, fields=None):
+        labels = tuple(sorted((k, str(v)) for k, v in (labels or {}).items()))
+        fields = fields or {}
+        with self._lock:
+            histogram = self._histograms.get((stage, labels))
+            if histogram is None:
+                histogram = self._histograms[(stage, labels)] = Histogram()
+            histogram.observe(seconds, fields)
+            if self._log is not None:
+                record = {"ts": round(time.time(), 3), "stage": stage, **dict(labels),
+                          "seconds": round(seconds, 6), **fields}
+                self._log.write(json.dumps(record, default=str) + "\n")
+                self._log.flush()
+
+    @contextmanager
+    def span(self, stage, **labels):
+        """Time the ``with`` block; the yielded dict collects extra fields for it."""
+        fields = {}
+        started = time.perf_counter()
+        try:
+            yield fields
+        finally:
+            self.observe(stage, time.perf_counter() - started, labels, fields)
+
+    def timed(self, stage, **labels):
+        def decorate(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(stage, **labels):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def snapshot(self):
+        """One row per (stage, labels) with count, mean, p50/p95/p99, max and field totals."""
+        with self._lock:
+            rows = []
+            for (stage, labels), h in sorted(self._histograms.items()):
+                rows.append({
+                    "stage": stage,
+                    "labels": ", ".join(f"{k}={v}" for k, v in labels),
+                    "count": h.count,
+                    "mean_ms": 1000 * h.sum / h.count,
+                    "p50_ms": 1000 * h.percentile(0.50),
+                    "p95_ms": 1000 * h.percentile(0.95),
+                    "p99_ms": 1000 * h.percentile(0.99),
+                    "max_ms": 1000 * h.max,
+                    **h.totals,
+                })
+            return rows
+
+    def prometheus_text(self):
+        def label_text(labels, extra=()):
+            pairs = [f'{k}="{v}"' for k, v in labels + tuple(extra)]
+            return "{" + ",".join(pairs) + "}"
+
+        name = f"{METRIC_PREFIX}_stage_seconds"
+        lines = [f"# TYPE {name} histogram"]
+        totals = {}
+        with self._lock:
+            for (stage, labels), h in sorted(self._histograms.items()):
+                labels = (("stage", stage),) + labels
+                cumulative = 0
+                for bound, count in zip(BUCKETS + ("+Inf",), h.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{label_text(labels, [('le', bound)])} {cumulative}")
+                lines.append(f"{name}_sum{label_text(labels)} {h.sum:.6f}")
+                lines.append(f"{name}_count{label_text(labels)} {h.count}")
+                for field, value in h.totals.items():
+                    totals.setdefault(field, []).append((labels, value))
+        for field, series in sorted(totals.items()):
+            lines.append(f"# TYPE {METRIC_PREFIX}_{field}_total counter")
+            lines += [f"{METRIC_PREFIX}_{field}_total{label_text(labels)} {value}" for labels, value in series]
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def configure_log(self, path):
+        """Append every finished span to ``path`` as a JSON line."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+            self._log = open(path, "a", encoding="utf-8")
+
+    def serve(self, port, host="127.0.0.1"):
+        """Serve ``/metrics`` (Prometheus text) and ``/metrics.json`` from a daemon thread."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body, content_type = registry.prometheus_text(), "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body, content_type = json.dumps(registry.snapshot()), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name="metrics-exporter", daemon=True).start()
+        return server
+
+
+REGISTRY = MetricsRegistry()
+observe = REGISTRY.observe
+span = REGISTRY.span
+timed = REGISTRY.timed
+snapshot = REGISTRY.snapshot
+
+
+def configure_from_env():
+    """Start the exporter and/or log file named by the environment; returns the server or None."""
+    path = os.environ.get("RESUME_ANALYZER_METRICS_LOG")
+    if path:
+        REGISTRY.configure_log(path)
+    port = os.environ.get("RESUME_ANALYZER_METRICS_PORT")
+    return REGISTRY.serve(int(port)) if port else None
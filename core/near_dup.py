@@ -0,0 +1,110 @@
+"""Near-duplicate resume detection with MinHash signatures and LSH banding.
+
+A resume is reduced to its set of word 5-gram shingles. ``NUM_PERM`` hashed
+permutations of that set give a MinHash signature, and the share of equal
+positions in two signatures estimates the Jaccard similarity of the sets. A
+new phone number or a reordered skill changes a handful of shingles, so the
+estimate stays high, while different candidates share almost none.
+
+Signatures are split into bands; two resumes are candidates when any band
+matches exactly, which finds likely duplicates without comparing against
+every stored resume. Candidates are then confirmed against ``threshold``.
+"""
+
+import hashlib
+import re
+from collections import defaultdict
+
+import numpy as np
+
+NUM_PERM = 128
+SHINGLE_SIZE = 5
+DEFAULT_THRESHOLD = 0.9
+# Pairs exactly at the threshold must become candidates at least this often.
+MIN_CANDIDATE_PROBABILITY = 0.99
+_MERSENNE = np.uint64((1 << 61) - 1)
+_WORD = re.compile(r"[a-z0-9+#]+")
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    words = _WORD.findall((text or "").lower())
+    if len(words) < size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def candidate_probability(similarity, bands, rows):
+    """Chance that two documents this similar share at least one band."""
+    return 1 - (1 - similarity ** rows) ** bands
+
+
+def _band_layout(threshold, num_perm):
+    # The (bands, rows) with the most rows per band, so the fewest dissimilar
+    # pairs become candidates, that still makes a pair exactly at the
+    # threshold a candidate with MIN_CANDIDATE_PROBABILITY; the exact check
+    # afterwards removes the extra candidates. 128 at 0.9 gives 16 x 8.
+    layouts = [(b, num_perm // b) for b in range(1, num_perm + 1) if num_perm % b == 0]
+    for bands, rows in layouts:
+        if candidate_probability(threshold, bands, rows) >= MIN_CANDIDATE_PROBABILITY:
+            return bands, rows
+    return layouts[-1]
+
+
+class NearDuplicateIndex:
+    def __init__(self, threshold=DEFAULT_THRESHOLD, num_perm=NUM_PERM, seed=1):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands, self.rows = _band_layout(threshold, num_perm)
+        rng = np.random.default_rng(seed)
+        # a * x + b stays below 2**64 for 32-bit shingle hashes and a < 2**31.
+        self._a = rng.integers(1, 1 << 31, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 31, num_perm, dtype=np.uint64)
+        self._buckets = [defaultdict(list) for _ in range(self.bands)]
+        self._signatures = {}
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._signatures
+
+    def signature(self, text):
+        """MinHash signature of ``text`` (``uint32[num_perm]``)."""
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little")
+             for s in shingles(text)),
+            dtype=np.uint64,
+        )
+        if not len(hashes):
+            return np.full(self.num_perm, np.iinfo(np.uint32).max, dtype=np.uint32)
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE
+        return (permuted.min(axis=0) & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+
+    def _band_keys(self, signature):
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def add(self, doc_id, signature):
+        if doc_id in self._signatures:
+            return
+        self._signatures[doc_id] = signature
+        for bucket, key in zip(self._buckets, self._band_keys(signature)):
+            bucket[key].append(doc_id)
+
+    def query(self, signature, threshold=None):
+        """Return ``[(doc_id, similarity)]`` at or above ``threshold``, most similar first."""
+        threshold = self.threshold if threshold is None else threshold
+        candidates = set()
+        for bucket, key in zip(self._buckets, self._band_keys(signature)):
+            candidates.update(bucket.get(key, ()))
+        matches = [(doc_id, similarity(signature, self._signatures[doc_id])) for doc_id in candidates]
+        return sorted((m for m in matches if m[1] >= threshold), key=lambda m: -m[1])
+
+    def best(self, signature):
+        """The most similar stored document as ``(doc_id, similarity)``, or None."""
+        matches = self.query(signature)
+        return matches[0] if matches else None
+
+
+def similarity(a, b):
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return float(np.mean(a == b))
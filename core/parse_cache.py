@@ -0,0 +1,122 @@
+"""Content-addressed cache for extracted resume text.
+
+Uploads are keyed by a SHA-256 of their bytes plus the extractor version, so
+the same document is parsed once no matter how many reruns or sessions see it.
+Entries live in an in-memory LRU bounded by total text size, with an optional
+on-disk tier that survives process restarts.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+
+def make_key(data, filename, version):
+    """Return the cache key for a document's raw bytes."""
+    digest = hashlib.sha256(data).hexdigest()
+    extension = os.path.splitext(filename)[1].lower()
+    return f"{version}-{extension.lstrip('.')}-{digest}"
+
+
+class ParseCache:
+    def __init__(self, max_bytes=64 * 1024 * 1024, disk_dir=None):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def get_or_parse(self, data, filename, version, parse):
+        """Return cached text for ``data``, calling ``parse(data, filename)`` on a miss."""
+        key = make_key(data, filename, version)
+        text = self._get_memory(key)
+        if text is not None:
+            return text
+
+        text = self._read_disk(key)
+        if text is not None:
+            with self._lock:
+                self.disk_hits += 1
+            self._put_memory(key, text)
+            return text
+
+        with self._lock:
+            self.misses += 1
+        text = parse(data, filename)
+        # Failed parses (None) are not cached so a fixed extractor can retry them.
+        if text is not None:
+            self._put_memory(key, text)
+            self._write_disk(key, text)
+        return text
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    # --- Memory tier ---
+    def _get_memory(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def _put_memory(self, key, text):
+        size = len(text.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = (text, size)
+            self._size += size
+            while self._size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+
+    # --- Disk tier ---
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.txt")
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key), encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_disk(self, key, text):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
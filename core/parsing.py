@@ -0,0 +1,62 @@
+"""Parsers that pull structured values out of the model's Markdown answers."""
+
+import re
+
+from core.metrics import timed
+
+SCORE_PATTERN = re.compile(r"(\d+)\s*/\s*100")
+TREND_ROW_PATTERN = re.compile(r"\|\s*(\d{4})\s*\|\s*([\d.-]+)\s*\|")
+_EMPTY_CELLS = {"", "-", "--", "n/a", "none", "na"}
+
+
+@timed("parse", parser="score")
+def parse_score(text):
+    """Return the first ``N/100`` score in ``text``, or None."""
+    match = SCORE_PATTERN.search(text or "")
+    return int(match.group(1)) if match else None
+
+
+@timed("parse", parser="trend_rows")
+def parse_trend_rows(text):
+    """Return ``[(year, growth_percent), ...]`` from the trends Markdown table."""
+    rows = []
+    for year, growth in TREND_ROW_PATTERN.findall(text or ""):
+        try:
+            rows.append((year, float(growth)))
+        except ValueError:
+            continue
+    return rows
+
+
+def _split_row(line):
+    return [cell.strip().strip("*").strip() for cell in line.strip().strip("|").split("|")]
+
+
+@timed("parse", parser="keyword_table")
+def parse_keyword_table(text):
+    """Return ``(missing, present)`` keyword lists from the ATS keyword table.
+
+    The ATS prompt asks for a two-column table with missing keywords on the
+    left and matched keywords on the right; the first table whose header
+    mentions "missing" is used.
+    """
+    missing, present = [], []
+    in_table = False
+    for line in (text or "").splitlines():
+        stripped = line.strip()
+        if not stripped.startswith("|"):
+            if in_table:
+                break
+            continue
+        cells = _split_row(stripped)
+        if not in_table:
+            if "missing" in cells[0].lower():
+                in_table = True
+            continue
+        if all(set(cell) <= set("-: ") for cell in cells):
+            continue
+        if cells and cells[0].lower() not in _EMPTY_CELLS:
+            missing.append(cells[0])
+        if len(cells) > 1 and cells[1].lower() not in _EMPTY_CELLS:
+            present.append(cells[1])
+    return missing, present
@@ -0,0 +1,201 @@
+"""Prompt templates for every analysis the toolkit offers.
+
+Each builder returns the exact prompt text sent to the model, so the app,
+the batch engine and the full-report fan-out all ask the same questions.
+"""
+
+from core.metrics import timed
+
+
+@timed("prompt_build", feature="general")
+def build_general_prompt(resume_text):
+    return f"""
+    You are a top-tier executive recruiter from a leading tech firm like Google or Goldman Sachs, known for your brutally honest but invaluable feedback. Your task is to conduct a professional-grade analysis of the following resume.
+    **Analysis Steps:**
+    1.  **Headline:** Provide a single, powerful headline that describes the candidate's professional identity.
+    2.  **Overall Resume Score:** Provide a score on its own line in the format: `Resume Score: [score]/100`.
+    3.  **Candidate Archetype:** Classify the candidate into a professional archetype (e.g., 'The Specialist', 'The Generalist', 'The Rising Star', 'The Career Transitioner') and provide a one-sentence justification.
+    4.  **Verdict:** In one bolded sentence, state whether you would move forward with this candidate for an interview and why.
+    5.  **Strengths vs. Weaknesses:** Create a two-column Markdown table. The left column will list the top 3 strengths. The right column will list the top 3 weaknesses.
+    6.  **Actionable Improvements:** Provide a bulleted list of the three most critical, specific, and actionable pieces of advice the candidate can implement right now.
+    **Perform this analysis on the following resume text:**
+    ---
+    {resume_text}
+    ---
+    """
+
+
+@timed("prompt_build", feature="ats")
+def build_ats_prompt(resume_text, job_description):
+    return f"""
+    You are an advanced Applicant Tracking System (ATS) combined with an expert HR recruiter. Your primary goal is to analyze the provided resume against the provided job description.
+    **Analysis Steps:**
+    1.  **ATS Compatibility Score:** Provide an ATS compatibility score on its own line in the format: `ATS Score: [score]/100`.
+    2.  **Keyword Analysis:** Compare the resume to the job description. Create a two-column Markdown table. The left column will list the top 5-7 most important keywords missing from the resume. The right column will list the top keywords that are correctly included.
+    3.  **Formatting Check:** Analyze the resume for any formatting that could be problematic for an ATS.
+    4.  **Actionable Feedback:** Provide a bulleted list of the top 3 most critical changes the user must make to improve their ATS score for this specific job.
+    **Perform this ATS analysis:**
+    ---
+    **USER'S RESUME:**
+    {resume_text}
+    ---
+    **TARGET JOB DESCRIPTION:**
+    {job_description}
+    ---
+    """
+
+
+@timed("prompt_build", feature="enhancement")
+def build_enhancement_prompt(resume_text):
+    return f"""
+    You are a world-class resume writer and editor for a top tech company. Your task is to take the user's resume text and rewrite it from scratch to be as powerful, professional, and impactful as possible.
+    **Instructions:**
+    1.  Preserve all original facts, job titles, companies, and dates. Do not invent new experiences.
+    2.  Rewrite every bullet point to use the STAR (Situation, Task, Action, Result) method. Emphasize quantifiable results.
+    3.  Ensure the language is professional, confident, and uses strong action verbs.
+    4.  Correct any spelling or grammar mistakes.
+    5.  Structure the output in a clean, standard resume format.
+    **Rewrite this resume:**
+    ---
+    {resume_text}
+    ---
+    """
+
+
+@timed("prompt_build", feature="roadmap")
+def build_roadmap_prompt(resume_text, target_job, personalization=""):
+    return f"""
+    You are a world-class academic advisor and career coach from an elite university's career services department. Your task is to create a personalized, flexible learning roadmap for a user who wants to become a "{target_job}".
+    **Instructions:**
+    1.  Analyze the user's resume to identify their current skill level.
+    2.  Identify the top 3 most critical **technical skill gaps**.
+    3.  Identify the single most important **soft skill** they should develop for this role.
+    4.  For each of the 3 technical gaps, create a "Learning Module" containing a concept, a recommended paid course, a free resource, and a portfolio project idea.
+    5.  Create a final "Soft Skill Development" module with actionable advice.
+    6.  **Personalization:** The user has provided the following special request: "{personalization}". You must incorporate this request into the plan.
+    **Generate this roadmap based on the following resume text:**
+    ---
+    {resume_text}
+    ---
+    """
+
+
+@timed("prompt_build", feature="opportunities")
+def build_opportunity_prompt(resume_text, target_job):
+    return f"""
+    You are a seasoned career strategist and futurist. Analyze the resume for the target role of "{target_job}".
+    **Analysis:**
+    1.  **Fit Score for Target Role:** Provide a "Fit Score" from 1-100 and a brief justification.
+    2.  **Recruiter's Red Flag:** Identify the single biggest potential "red flag" a recruiter might see in this resume for this specific role and suggest how to mitigate it.
+    3.  **Career Suggestions:** Suggest and score three career opportunities:
+        * **Obvious Fit:** The most direct path. Provide an 'Opportunity Score' (1-100) and justification.
+        * **Related Fit:** A similar role in a different industry. Provide score and justification.
+        * **Wildcard Fit:** An unexpected but high-potential role. Provide score and justification.
+    **Perform this analysis on the following resume text:**
+    ---
+    {resume_text}
+    ---
+    """
+
+
+@timed("prompt_build", feature="trends")
+def build_trends_prompt(target_job):
+    return f"""
+    Act as a senior market analyst from Gartner providing a direct report.
+    Your task is to generate a job market trend analysis for the role of "{target_job}".
+    **Output Requirements:**
+    1.  **Executive Summary:** A concise, one-paragraph summary of the future outlook for this role. This summary must describe strong, positive growth.
+    2.  **Data Table:** A Markdown table with columns 'Year' and 'Demand Growth (%)', showing plausible data for the last 3 years and a forecast for the next 3.
+    **CRITICAL RULE:** For a high-growth role like AI Engineer or Data Scientist, the numbers in the 'Demand Growth (%)' column MUST show a generally increasing trend for future years. Do not show a declining trend. All numbers must be positive.
+    **Constraint:**
+    - Do not include any conversational introductions, questions, or conclusions.
+    - Your entire output must consist of only the Executive Summary and the Markdown Data Table.
+    Generate the report now.
+    """
+
+
+@timed("prompt_build", feature="cover_letter")
+def build_cover_letter_prompt(resume_text, job_description):
+    return f"""
+    You are a professional career writer. Your task is to write a concise and compelling cover letter and suggest an email subject line.
+    **Instructions:**
+    1.  Write a professional email subject line for the application.
+    2.  Write a cover letter (no more than 250 words) that highlights the top 2-3 most relevant skills from the resume that match the job description.
+    **User's Resume:**
+    ---
+    {resume_text}
+    ---
+    **Target Job Description:**
+    ---
+    {job_description}
+    ---
+    """
+
+
+@timed("prompt_build", feature="section_general")
+def build_section_general_prompt(section_name, section_text):
+    return f"""
+    You are a top-tier executive recruiter reviewing one section of a candidate's resume. Judge only this section.
+    **Output Format:**
+    1.  On its own line: `Section Score: [score]/100`.
+    2.  **Strengths:** up to two short bullets.
+    3.  **Weaknesses:** up to two short bullets.
+    4.  **Fix:** the single most important, specific change for this section.
+    **Resume section ({section_name}):**
+    ---
+    {section_text}
+    ---
+    """
+
+
+@timed("prompt_build", feature="section_ats")
+def build_section_ats_prompt(section_name, section_text, job_description):
+    return f"""
+    You are an advanced Applicant Tracking System (ATS). Compare one section of a resume with the job description.
+    **Output Format:**
+    1.  On its own line: `Section ATS Score: [score]/100` for how well this section supports the job.
+    2.  On its own line: `Matched Keywords: ` followed by a comma-separated list of important job description keywords this section contains (or `none`).
+    3.  **Fix:** the single most important change to this section for this job.
+    **Resume section ({section_name}):**
+    ---
+    {section_text}
+    ---
+    **TARGET JOB DESCRIPTION:**
+    {job_description}
+    ---
+    """
+
+
+@timed("prompt_build", feature="structured")
+def build_structured_prompt(resume_text, job_description="", target_job=""):
+    ats_rule = (
+        '"ats" must compare the resume against the job description below.'
+        if job_description else '"ats" must be null (no job description was given).'
+    )
+    role_rule = (
+        f'"fit", "career_paths" and "trends" are for the target role "{target_job}".'
+        if target_job else '"fit" and "trends" must be null and "career_paths" empty (no target role was given).'
+    )
+    job_block = f"""
+    **Job Description:**
+    ---
+    {job_description}
+    ---""" if job_description else ""
+    return f"""
+    You are a top-tier executive recruiter, an ATS expert and a job market analyst in one. Analyze the resume below and answer with a single JSON object and nothing else, with exactly these fields:
+    - "resume_score": integer 0-100, the overall quality of the resume.
+    - "archetype": the candidate's professional archetype in a few words (e.g. "Data-Driven Product Builder").
+    - "summary": two or three sentences of overall feedback.
+    - "strengths": three to five short strings.
+    - "weaknesses": three to five short strings, each with a concrete fix.
+    - "ats": {{"score": integer 0-100, "missing_keywords": [strings], "present_keywords": [strings]}} with the most important job description keywords.
+    - "fit": {{"score": integer 0-100, "justification": string}} for the target role.
+    - "career_paths": up to three {{"title": string, "kind": "Obvious Fit" | "Related Fit" | "Wildcard Fit", "score": integer 0-100, "justification": string}}.
+    - "trends": {{"summary": string, "rows": [{{"year": integer, "demand_growth_pct": number}}]}} with plausible demand growth for the last 3 years and a forecast for the next 3.
+    {ats_rule}
+    {role_rule}
+    **Resume:**
+    ---
+    {resume_text}
+    ---{job_block}
+    """
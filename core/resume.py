@@ -0,0 +1,228 @@
+"""A structured view of a resume, built once per version of its text.
+
+``parse_resume`` splits the text into sections and picks out the contact
+details, experience entries (title line, dates, bullets), skills and every
+date range. Each piece is a ``Span`` holding its text and character offsets
+into the original string, so the editor, prompts and local scorers can cut
+out exactly the part they need without re-scanning the whole resume.
+
+Results are cached by the text itself: a rerun with the same editor
+contents gets the same ``Resume`` object, and its derived data (terms,
+sections by name) is computed on first use and kept with it.
+"""
+
+import hashlib
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from core.sections import split_sections
+from core.text import extract_terms
+
+# Versions of recently seen texts kept parsed; each is a few KB of spans.
+CACHE_SIZE = 128
+
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_PHONE = re.compile(r"(?<![\w/])(?:\+?\d|\(\d)[\d\s().-]{7,}\d(?![\w/])")
+_LINK = re.compile(r"(?:https?://)?(?:www\.)?(?:linkedin\.com|github\.com|gitlab\.com|[\w-]+\.(?:dev|io|me))/?[\w./%-]*",
+                   re.IGNORECASE)
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+_DATE = rf"(?:{_MONTH}\s+\d{{4}}|\d{{1,2}}/\d{{4}}|(?:19|20)\d{{2}})"
+_CURRENT = r"(?:present|current|now|today)"
+_DATE_RANGE = re.compile(rf"\b(?P<begin>{_DATE})(?:\s*(?:-|–|—|to)\s*(?P<finish>{_DATE}|{_CURRENT}))?\b",
+                         re.IGNORECASE)
+_BULLET = re.compile(r"^\s*(?:[-*•●▪■◦‣∙·○◆◇►▸➢➤✓✔–—]|\d+[.)])\s+")
+_SKILL_LABEL = re.compile(r"^\s*[A-Za-z &/]{2,30}:\s*")
+_SKILL_SPLIT = re.compile(r"[,;|•·]")
+
+
+@dataclass(slots=True, frozen=True)
+class Span:
+    text: str
+    start: int   # character offsets into Resume.text
+    end: int
+
+
+@dataclass(slots=True, frozen=True)
+class DateRange:
+    span: Span
+    begin: str
+    finish: str | None   # None for a single date
+    current: bool        # the range runs to "present"
+
+
+@dataclass(slots=True, frozen=True)
+class Contact:
+    name: Span | None = None
+    email: Span | None = None
+    phone: Span | None = None
+    links: tuple = ()
+
+
+@dataclass(slots=True, frozen=True)
+class ExperienceEntry:
+    title: Span                  # the entry's first line, e.g. "Engineer | Acme | 2021 - Present"
+    dates: DateRange | None
+    bullets: tuple               # Span per bullet, wrapped lines included
+    start: int
+    end: int
+
+
+@dataclass(slots=True)
+class Resume:
+    text: str
+    version: str                 # SHA-1 of the text
+    sections: tuple
+    contact: Contact
+    experience: tuple
+    skills: tuple
+    dates: tuple
+    _terms: tuple | None = field(default=None, repr=False)
+
+    def section(self, name):
+        """The first section called ``name`` (see ``core.sections``), or None."""
+        return next((s for s in self.sections if s.name == name), None)
+
+    def section_text(self, name):
+        section = self.section(name)
+        return section.text_in(self.text) if section else ""
+
+    def terms(self):
+        """``core.text.extract_terms`` of the whole text, computed once."""
+        if self._terms is None:
+            self._terms = extract_terms(self.text)
+        return self._terms
+
+
+def _span(text, start, end):
+    # Offsets of ``text[start:end]`` without its surrounding whitespace.
+    raw = text[start:end]
+    stripped = raw.strip()
+    if not stripped:
+        return None
+    start += len(raw) - len(raw.lstrip())
+    return Span(stripped, start, start + len(stripped))
+
+
+def _lines(text, start, end):
+    # (line start, line end without the newline) for each line in the range.
+    offset = start
+    for line in text[start:end].splitlines(keepends=True):
+        yield offset, offset + len(line.rstrip("\r\n"))
+        offset += len(line)
+
+
+def _date_ranges(text, start=0, end=None):
+    ranges = []
+    for match in _DATE_RANGE.finditer(text, start, len(text) if end is None else end):
+        finish = match.group("finish")
+        ranges.append(DateRange(
+            span=Span(match.group(), match.start(), match.end()),
+            begin=match.group("begin"),
+            finish=finish,
+            current=bool(finish and re.fullmatch(_CURRENT, finish, re.IGNORECASE)),
+        ))
+    return ranges
+
+
+def _contact(text, header):
+    # Contact details normally sit before the first heading; fall back to
+    # the top of the resume when there is no header section.
+    start, end = (header.start, header.end) if header and header.end > header.start else (0, min(len(text), 600))
+
+    def first(pattern):
+        match = pattern.search(text, start, end)
+        return Span(match.group(), match.start(), match.end()) if match else None
+
+    name = None
+    for line_start, line_end in _lines(text, start, end):
+        line = text[line_start:line_end].strip()
+        if line and not re.search(r"[\d@|/:]", line) and len(line.split()) <= 5:
+            name = _span(text, line_start, line_end)
+            break
+    links = tuple(Span(m.group(), m.start(), m.end()) for m in _LINK.finditer(text, start, end) if "@" not in m.group())
+    return Contact(name=name, email=first(_EMAIL), phone=first(_PHONE), links=links)
+
+
+def _experience(text, section):
+    # A new entry starts at a non-bullet line after a blank line (or at the
+    # top of the section), or at any non-bullet line carrying a date range.
+    # Bullets run on over wrapped lines until the next bullet or entry.
+    entries, current, bullets = [], None, []
+    blank = True
+    first = True
+    for line_start, line_end in _lines(text, section.start, section.end):
+        if first:
+            first = False
+            if section.heading:
+                continue
+        line = text[line_start:line_end]
+        if not line.strip():
+            blank = True
+            continue
+        is_bullet = bool(_BULLET.match(line))
+        if not is_bullet and (blank or current is None or _DATE_RANGE.search(line)):
+            if current is not None:
+                entries.append(current + [bullets])
+            current, bullets = [line_start, line_end, line_end], []
+        elif current is not None:
+            if is_bullet or not bullets:
+                bullets.append([line_start + _BULLET.match(line).end() if is_bullet else line_start, line_end])
+            else:
+                bullets[-1][1] = line_end
+            current[2] = line_end
+        blank = False
+    if current is not None:
+        entries.append(current + [bullets])
+
+    result = []
+    for title_start, title_end, entry_end, entry_bullets in entries:
+        dates = _date_ranges(text, title_start, title_end)
+        result.append(ExperienceEntry(
+            title=_span(text, title_start, title_end),
+            dates=dates[0] if dates else None,
+            bullets=tuple(filter(None, (_span(text, s, e) for s, e in entry_bullets))),
+            start=title_start,
+            end=entry_end,
+        ))
+    return result
+
+
+def _skills(text, section):
+    skills = []
+    lines = _lines(text, section.start, section.end)
+    if section.heading:
+        next(lines, None)
+    for line_start, line_end in lines:
+        line = text[line_start:line_end]
+        prefix = _BULLET.match(line) or _SKILL_LABEL.match(line)
+        offset = line_start + (prefix.end() if prefix else 0)
+        for piece in _SKILL_SPLIT.split(text[offset:line_end]):
+            span = _span(text, offset, offset + len(piece))
+            if span and len(span.text) <= 60:
+                skills.append(span)
+            offset += len(piece) + 1
+    return skills
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_resume(text):
+    """Return the ``Resume`` for ``text``; the same text returns the same object."""
+    sections = tuple(split_sections(text))
+    header = next((s for s in sections if s.name == "header"), None)
+    experience, skills = [], []
+    for section in sections:
+        if section.name == "experience":
+            experience.extend(_experience(text, section))
+        elif section.name == "skills":
+            skills.extend(_skills(text, section))
+    return Resume(
+        text=text,
+        version=hashlib.sha1(text.encode("utf-8")).hexdigest(),
+        sections=sections,
+        contact=_contact(text, header),
+        experience=tuple(experience),
+        skills=tuple(skills),
+        dates=tuple(_date_ranges(text)),
+    )
+
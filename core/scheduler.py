@@ -0,0 +1,177 @@
+"""Process-wide scheduling of model requests.
+
+Every model call from every session goes through one ``LLMScheduler``:
+
+* a token bucket keeps the request rate inside the API quota,
+* at most ``max_concurrency`` calls are in flight at once,
+* waiting requests are granted round-robin across sessions, so one user
+  queueing many generations cannot starve everyone else, and
+* rate-limit and server errors (429/5xx) are retried with exponential
+  backoff and full jitter.
+
+Queue depth, wait times and retry counts are exposed through ``metrics()``.
+"""
+
+import itertools
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+_RETRYABLE_NAMES = {"ResourceExhausted", "TooManyRequests", "ServiceUnavailable", "InternalServerError",
+                    "DeadlineExceeded", "GatewayTimeout", "BadGateway"}
+
+
+class QuotaExceededError(RuntimeError):
+    """The API kept refusing a request after every retry; the message is user-facing."""
+
+
+def is_retryable(error):
+    code = getattr(error, "code", None)
+    if isinstance(code, int) and code in RETRYABLE_STATUS_CODES:
+        return True
+    return type(error).__name__ in _RETRYABLE_NAMES
+
+
+class TokenBucket:
+    """Allows ``rate`` requests per second on average, in bursts of up to ``capacity``."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_take(self):
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    def time_until_token(self):
+        self._refill()
+        return max(0.0, (1 - self._tokens) / self.rate)
+
+
+class LLMScheduler:
+    def __init__(self, requests_per_minute=60, burst=10, max_concurrency=4,
+                 max_retries=4, base_delay=1.0, max_delay=30.0):
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._bucket = TokenBucket(requests_per_minute / 60.0, burst)
+        self._cond = threading.Condition()
+        self._queues = OrderedDict()  # session id -> deque of waiting tickets, in round-robin order
+        self._tickets = itertools.count()
+        self._active = 0
+        self._waits = deque(maxlen=1000)
+        self._counters = {"granted": 0, "retries": 0, "failed": 0}
+
+    # --- Admission ---
+    def _is_next(self, session_id, ticket):
+        # The next grant goes to the session at the front of the rotation.
+        if not self._queues:
+            return False
+        head_session, queue = next(iter(self._queues.items()))
+        return head_session == session_id and queue[0] == ticket
+
+    @contextmanager
+    def slot(self, session_id):
+        """Block until this session's turn, a free slot and a rate token line up."""
+        ticket = next(self._tickets)
+        queued_at = time.monotonic()
+        with self._cond:
+            self._queues.setdefault(session_id, deque()).append(ticket)
+            while True:
+                if self._is_next(session_id, ticket) and self._active < self.max_concurrency:
+                    if self._bucket.try_take():
+                        break
+                    self._cond.wait(self._bucket.time_until_token())
+                else:
+                    self._cond.wait()
+            queue = self._queues.pop(session_id)
+            queue.popleft()
+            if queue:
+                self._queues[session_id] = queue  # back of the rotation
+            self._active += 1
+            self._counters["granted"] += 1
+            self._waits.append(time.monotonic() - queued_at)
+            self._cond.notify_all()
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._cond.notify_all()
+
+    # --- Calls with retries ---
+    def _backoff(self, attempt):
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _give_up(self, error):
+        with self._cond:
+            self._counters["failed"] += 1
+        if is_retryable(error):
+            raise QuotaExceededError(
+                "The AI service is busy right now (rate limit or server error). Please try again in a minute."
+            ) from error
+        raise error
+
+    def call(self, session_id, fn, *args, **kwargs):
+        """Run ``fn(*args, **kwargs)`` under the scheduler, retrying 429/5xx errors."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                with self.slot(session_id):
+                    return fn(*args, **kwargs)
+            except Exception as e:
+                if not is_retryable(e) or attempt == self.max_retries:
+                    self._give_up(e)
+                with self._cond:
+                    self._counters["retries"] += 1
+            time.sleep(self._backoff(attempt))
+
+    def stream(self, session_id, start):
+        """Yield from the iterator returned by ``start()`` under the scheduler.
+
+        A failed attempt is retried only if it broke before the first chunk,
+        so the caller never sees duplicated output.
+        """
+        for attempt in range(self.max_retries + 1):
+            started = False
+            try:
+                with self.slot(session_id):
+                    for chunk in start():
+                        started = True
+                        yield chunk
+                return
+            except Exception as e:
+                if started or not is_retryable(e) or attempt == self.max_retries:
+                    self._give_up(e)
+                with self._cond:
+                    self._counters["retries"] += 1
+            time.sleep(self._backoff(attempt))
+
+    # --- Metrics ---
+    def metrics(self):
+        with self._cond:
+            waits = sorted(self._waits)
+            depth = {session: len(queue) for session, queue in self._queues.items()}
+            return {
+                "queue_depth": sum(depth.values()),
+                "waiting_sessions": len(depth),
+                "active": self._active,
+                "max_concurrency": self.max_concurrency,
+                "wait_avg_s": sum(waits) / len(waits) if waits else 0.0,
+                "wait_p95_s": waits[int(0.95 * (len(waits) - 1))] if waits else 0.0,
+                "wait_max_s": waits[-1] if waits else 0.0,
+                **self._counters,
+            }
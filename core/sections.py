@@ -0,0 +1,70 @@
+"""Split resume text into its conventional sections."""
+
+import re
+from dataclasses import dataclass
+
+# Canonical section name -> headings that introduce it (compared lower-cased,
+# without punctuation).
+SECTION_ALIASES = {
+    "summary": ["summary", "professional summary", "profile", "professional profile", "objective",
+                "career objective", "about me", "about"],
+    "experience": ["experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "career history", "relevant experience"],
+    "education": ["education", "academic background", "qualifications", "academic qualifications"],
+    "skills": ["skills", "technical skills", "core skills", "key skills", "transferable skills",
+               "core competencies", "competencies", "technologies", "tools", "tech stack"],
+    "projects": ["projects", "personal projects", "academic projects", "key projects", "portfolio"],
+    "certifications": ["certifications", "certificates", "licenses", "licenses and certifications", "courses"],
+    "achievements": ["achievements", "awards", "honors", "honours", "awards and achievements", "accomplishments"],
+    "publications": ["publications", "research", "papers"],
+    "volunteering": ["volunteering", "volunteer experience", "leadership", "extracurricular activities",
+                     "activities"],
+    "languages": ["languages"],
+    "interests": ["interests", "hobbies", "hobbies and interests"],
+    "references": ["references"],
+}
+_HEADING_LOOKUP = {alias: name for name, aliases in SECTION_ALIASES.items() for alias in aliases}
+MAX_HEADING_LENGTH = 40
+
+
+@dataclass(slots=True)
+class Section:
+    name: str      # canonical name, "header" for the text before the first heading, or "other"
+    heading: str   # the heading line as written ("" for the header)
+    start: int     # character offsets of the whole section in the source text
+    end: int
+
+    def text_in(self, source):
+        return source[self.start:self.end]
+
+
+def _heading_name(line):
+    stripped = line.strip()
+    if not stripped or len(stripped) > MAX_HEADING_LENGTH:
+        return None
+    key = re.sub(r"[^a-z& ]+", " ", stripped.lower()).replace("&", "and")
+    key = " ".join(key.split())
+    if key in _HEADING_LOOKUP:
+        return _HEADING_LOOKUP[key]
+    # Unknown all-caps lines such as "VOLUNTEER WORK" still start a section.
+    letters = [c for c in stripped if c.isalpha()]
+    if len(letters) >= 4 and all(c.isupper() for c in letters) and not re.search(r"[|@,.\d]", stripped):
+        return "other"
+    return None
+
+
+def split_sections(text):
+    """Return the sections of ``text`` in order; together they cover all of it."""
+    sections = []
+    current_name, current_heading, current_start = "header", "", 0
+    offset = 0
+    for line in text.splitlines(keepends=True):
+        name = _heading_name(line)
+        if name is not None:
+            if offset > current_start or current_name != "header":
+                sections.append(Section(current_name, current_heading, current_start, offset))
+            current_name, current_heading, current_start = name, line.strip(), offset
+        offset += len(line)
+    if offset > current_start or not sections:
+        sections.append(Section(current_name, current_heading, current_start, offset))
+    return sections
@@ -0,0 +1,244 @@
+"""Compressed, deduplicated storage for per-session analysis results.
+
+Each session's long Markdown answers used to sit in ``st.session_state`` as
+plain strings, so memory grew with every user and idle session. Here every
+text is zlib-compressed and stored once under its SHA-256, however many
+sessions hold it (a cached answer served to ten users is kept once). When
+the compressed texts in memory exceed ``max_memory_bytes``, the least
+recently used ones are written to ``spill_dir`` and read back on demand; the
+texts of an idle session go cold together, so whole sessions move to disk.
+Sessions untouched for ``session_ttl`` seconds are dropped.
+"""
+
+import hashlib
+import os
+import shutil
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+DAY = 24 * 60 * 60
+# Every per-session result the app keeps, with its empty value.
+RESULT_KEYS = ("general_result", "ats_result", "roadmap_result", "opportunity_result", "enhanced_resume",
+               "cover_letter_result", "trends_result")
+COMPRESSION_LEVEL = 6
+# Win32 constants for _pid_alive.
+_PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+_ERROR_ACCESS_DENIED = 5
+_STILL_ACTIVE = 259
+
+
+class _Blob:
+    __slots__ = ("data", "size", "stored", "refs", "on_disk")
+
+    def __init__(self, data, size):
+        self.data = data          # compressed bytes, or None while spilled
+        self.size = size          # uncompressed UTF-8 bytes
+        self.stored = len(data)   # compressed bytes
+        self.refs = 0
+        self.on_disk = False
+
+
+def _pid_alive(pid):
+    if os.name == "nt":
+        # os.kill on Windows terminates the process for any signal other
+        # than the console control events, so ask for its exit code instead.
+        import ctypes
+
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        handle = kernel32.OpenProcess(_PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return ctypes.get_last_error() == _ERROR_ACCESS_DENIED
+        try:
+            code = ctypes.c_ulong()
+            return bool(kernel32.GetExitCodeProcess(handle, ctypes.byref(code))) and code.value == _STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class SessionStore:
+    def __init__(self, max_memory_bytes=64 * 1024 * 1024, spill_dir=None, session_ttl=DAY):
+        self.max_memory_bytes = max_memory_bytes
+        self.session_ttl = session_ttl
+        self._lock = threading.Lock()
+        self._blobs = OrderedDict()  # digest -> _Blob, least recently used first
+        self._sessions = {}          # session id -> {"keys": {key: digest}, "touched": time}
+        self._resident = 0
+        self._counters = {"spills": 0, "loads": 0, "expired_sessions": 0}
+        self.spill_dir = None
+        if spill_dir:
+            # Spilled texts only mean something to this process; clear out
+            # what earlier (now dead) server processes left behind.
+            os.makedirs(spill_dir, exist_ok=True)
+            for name in os.listdir(spill_dir):
+                if name.isdigit() and not _pid_alive(int(name)):
+                    shutil.rmtree(os.path.join(spill_dir, name), ignore_errors=True)
+            self.spill_dir = os.path.join(spill_dir, str(os.getpid()))
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+            os.makedirs(self.spill_dir)
+
+    def session(self, session_id):
+        """Attribute-style view of one session's results, like ``st.session_state``."""
+        return SessionResults(self, session_id)
+
+    # --- Blobs ---
+    def _path(self, digest):
+        return os.path.join(self.spill_dir, f"{digest}.zlib")
+
+    def _load(self, digest, blob):
+        # A blob larger than the whole memory budget is read but not kept.
+        with open(self._path(digest), "rb") as f:
+            data = f.read()
+        self._counters["loads"] += 1
+        if blob.stored <= self.max_memory_bytes:
+            blob.data = data
+            self._resident += blob.stored
+        return data
+
+    def _spill(self):
+        if self.spill_dir is None:
+            return
+        for digest, blob in list(self._blobs.items()):
+            if self._resident <= self.max_memory_bytes:
+                break
+            if blob.data is None:
+                continue
+            if not blob.on_disk:
+                tmp = self._path(digest) + ".tmp"
+                with open(tmp, "wb") as f:
+                    f.write(blob.data)
+                os.replace(tmp, self._path(digest))
+                blob.on_disk = True
+            blob.data = None
+            self._resident -= blob.stored
+            self._counters["spills"] += 1
+
+    def _release(self, digest):
+        blob = self._blobs[digest]
+        blob.refs -= 1
+        if blob.refs > 0:
+            return
+        del self._blobs[digest]
+        if blob.data is not None:
+            self._resident -= blob.stored
+        if blob.on_disk:
+            try:
+                os.remove(self._path(digest))
+            except FileNotFoundError:
+                pass
+
+    # --- Sessions ---
+    def _entry(self, session_id):
+        entry = self._sessions.setdefault(session_id, {"keys": {}, "touched": 0.0})
+        entry["touched"] = time.time()
+        return entry
+
+    def get(self, session_id, key, default=""):
+        with self._lock:
+            digest = self._entry(session_id)["keys"].get(key)
+            if digest is None:
+                return default
+            blob = self._blobs[digest]
+            self._blobs.move_to_end(digest)
+            data = blob.data
+            if data is None:
+                data = self._load(digest, blob)
+                self._spill()
+        return zlib.decompress(data).decode("utf-8")
+
+    def set(self, session_id, key, text):
+        """Store ``text`` (an empty value or None clears the key)."""
+        if text:
+            raw = text.encode("utf-8")
+            digest = hashlib.sha256(raw).hexdigest()
+        with self._lock:
+            keys = self._entry(session_id)["keys"]
+            old = keys.pop(key, None)
+            if text:
+                blob = self._blobs.get(digest)
+                if blob is None:
+                    blob = self._blobs[digest] = _Blob(zlib.compress(raw, COMPRESSION_LEVEL), len(raw))
+                    self._resident += blob.stored
+                self._blobs.move_to_end(digest)
+                blob.refs += 1
+                keys[key] = digest
+            if old is not None:
+                self._release(old)
+            self._spill()
+        self.expire_idle()
+
+    def drop_session(self, session_id):
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+            for digest in (entry or {"keys": {}})["keys"].values():
+                self._release(digest)
+
+    def expire_idle(self):
+        cutoff = time.time() - self.session_ttl
+        with self._lock:
+            idle = [sid for sid, entry in self._sessions.items() if entry["touched"] < cutoff]
+            self._counters["expired_sessions"] += len(idle)
+        for session_id in idle:
+            self.drop_session(session_id)
+
+    # --- Footprint ---
+    def session_stats(self, session_id):
+        with self._lock:
+            blobs = [self._blobs[d] for d in self._sessions.get(session_id, {"keys": {}})["keys"].values()]
+            return {
+                "results": len(blobs),
+                "text_bytes": sum(b.size for b in blobs),
+                "memory_bytes": sum(b.stored for b in blobs if b.data is not None),
+                "disk_bytes": sum(b.stored for b in blobs if b.data is None),
+                "shared": sum(1 for b in blobs if b.refs > 1),
+            }
+
+    def stats(self):
+        with self._lock:
+            referenced = sum(b.size * b.refs for b in self._blobs.values())
+            unique = sum(b.size for b in self._blobs.values())
+            return {
+                "sessions": len(self._sessions),
+                "texts": len(self._blobs),
+                "text_bytes": referenced,            # what plain session_state would hold
+                "dedup_saved_bytes": referenced - unique,
+                "memory_bytes": self._resident,
+                "disk_bytes": sum(b.stored for b in self._blobs.values() if b.data is None),
+                **self._counters,
+            }
+
+
+class SessionResults:
+    """``results.general_result`` reads and ``results.general_result = text`` writes the store."""
+
+    def __init__(self, store, session_id):
+        object.__setattr__(self, "_store", store)
+        object.__setattr__(self, "_session_id", session_id)
+
+    def __getattr__(self, key):
+        if key not in RESULT_KEYS:
+            raise AttributeError(key)
+        return self._store.get(self._session_id, key)
+
+    def __setattr__(self, key, value):
+        if key not in RESULT_KEYS:
+            raise AttributeError(f"Unknown result {key!r}; expected one of {RESULT_KEYS}")
+        self._store.set(self._session_id, key, value)
+
+    __getitem__ = __getattr__
+    __setitem__ = __setattr__
+
+    def update(self, values):
+        for key, value in values.items():
+            self[key] = value
+
+    def stats(self):
+        return self._store.session_stats(self._session_id)
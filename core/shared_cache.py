@@ -0,0 +1,139 @@
+"""Cross-user cache for analyses that do not depend on the resume.
+
+Market trends depend only on the job title, so one answer can serve every
+user asking about the same role. Entries are keyed by feature and canonical
+title (see ``core.titles``), not by prompt text, and are refreshed in the
+background rather than expiring under a user:
+
+* fresh entries are served as is; once an entry is ``refresh_ahead`` of the
+  way through its TTL, a hit also schedules a background refresh;
+* expired entries younger than ``max_stale`` are still served while a
+  background refresh replaces them;
+* on a miss, concurrent requests for the same key share one model call.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from core.llm_cache import DAY, DEFAULT_TTLS
+
+
+class SharedCache:
+    def __init__(self, path, ttls=None, refresh_ahead=0.8, max_stale=7 * DAY, refresh_workers=2):
+        self.path = path
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.refresh_ahead = refresh_ahead
+        self.max_stale = max_stale
+        self._lock = threading.Lock()
+        self._inflight = {}  # key -> Future of the one model call serving it
+        self._pool = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix="shared-cache-refresh")
+        self._counters = {"fresh": 0, "stale": 0, "computed": 0, "joined": 0, "refreshes": 0, "refresh_errors": 0}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS shared_results (
+                key TEXT PRIMARY KEY,
+                feature TEXT NOT NULL,
+                title TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0
+            )"""
+        )
+
+    def _read(self, key):
+        with self._lock:
+            return self._conn.execute("SELECT value, created FROM shared_results WHERE key = ?", (key,)).fetchone()
+
+    def _write(self, key, feature, title, value):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO shared_results (key, feature, title, value, created) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, created = excluded.created",
+                (key, feature, title, value, time.time()),
+            )
+
+    def _count(self, outcome, key=None):
+        with self._lock:
+            self._counters[outcome] += 1
+            if key is not None:
+                self._conn.execute("UPDATE shared_results SET hits = hits + 1 WHERE key = ?", (key,))
+
+    def _single_flight(self, key, feature, title, compute, background):
+        # Returns (future, started): the call already running for ``key``, or a
+        # new one, run on the refresh pool or (for a miss) on the caller's thread.
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future, False
+            future = self._inflight[key] = Future()
+
+        def run():
+            try:
+                value = compute()
+                self._write(key, feature, title, value)
+                future.set_result(value)
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+
+        if background:
+            self._pool.submit(run)
+        else:
+            run()
+        return future, True
+
+    def _refresh(self, key, feature, title, compute):
+        future, started = self._single_flight(key, feature, title, compute, background=True)
+        if started:
+            self._count("refreshes")
+            future.add_done_callback(lambda f: f.exception() and self._count("refresh_errors"))
+
+    def get_or_compute(self, feature, key, title, compute, force=False):
+        """Return ``(value, status)`` with status "fresh", "stale", "computed" or "joined".
+
+        ``compute()`` produces a new value; it may run on a background thread.
+        ``force`` skips the stored entry and replaces it with a new value.
+        """
+        key = f"{feature}:{key}"
+        ttl = self.ttls.get(feature, DAY)
+        row = None if force else self._read(key)
+        if row is not None:
+            value, created = row
+            age = time.time() - created
+            if age <= ttl:
+                if age > self.refresh_ahead * ttl:
+                    self._refresh(key, feature, title, compute)
+                self._count("fresh", key)
+                return value, "fresh"
+            if age <= ttl + self.max_stale:
+                self._refresh(key, feature, title, compute)
+                self._count("stale", key)
+                return value, "stale"
+        future, started = self._single_flight(key, feature, title, compute, background=False)
+        self._count("computed" if started else "joined")
+        return future.result(), "computed" if started else "joined"
+
+    def titles(self, feature):
+        """Display titles with a cached entry, most requested first (seeds ``TitleIndex``)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT title FROM shared_results WHERE feature = ? ORDER BY hits DESC", (feature,)
+            ).fetchall()
+        return [title for (title,) in rows]
+
+    def stats(self):
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM shared_results").fetchone()[0]
+            served = self._counters["fresh"] + self._counters["stale"] + self._counters["joined"]
+            total = served + self._counters["computed"]
+            return {"entries": entries, "hit_rate": served / total if total else 0.0,
+                    "refreshing": len(self._inflight), **self._counters}
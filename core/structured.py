@@ -0,0 +1,174 @@
+"""One model call for every scored analysis, answered as validated JSON.
+
+Instead of four prompts whose Markdown answers are scraped with regexes,
+the structured mode asks once for a JSON object (``ANALYSIS_SCHEMA``)
+holding the resume score, archetype, strengths/weaknesses, ATS keywords, fit
+score, career paths and trend rows. The answer is validated against the
+schema; an invalid answer is retried once with the validation error
+appended to the prompt. ``render_results`` then turns the object into the
+Markdown each tab already displays, and ``result_fields`` gives the scores
+and trend rows behind that Markdown, so the tabs' metrics and charts read the
+validated fields instead of scraping the text.
+"""
+
+import dataclasses
+import json
+import re
+
+from core.ats import format_keyword_table
+
+FEATURE = "structured"
+# The session results a structured report writes; all are replaced together.
+RESULT_KEYS = ("general_result", "ats_result", "opportunity_result", "trends_result")
+
+_SCORE = {"type": "integer", "minimum": 0, "maximum": 100}
+_STRINGS = {"type": "array", "items": {"type": "string"}}
+ANALYSIS_SCHEMA = {
+    "type": "object",
+    "required": ["resume_score", "archetype", "summary", "strengths", "weaknesses"],
+    "properties": {
+        "resume_score": _SCORE,
+        "archetype": {"type": "string"},
+        "summary": {"type": "string"},
+        "strengths": _STRINGS,
+        "weaknesses": _STRINGS,
+        "ats": {
+            "type": ["object", "null"],
+            "required": ["score", "missing_keywords", "present_keywords"],
+            "properties": {"score": _SCORE, "missing_keywords": _STRINGS, "present_keywords": _STRINGS},
+        },
+        "fit": {
+            "type": ["object", "null"],
+            "required": ["score", "justification"],
+            "properties": {"score": _SCORE, "justification": {"type": "string"}},
+        },
+        "career_paths": {
+            "type": "array",
+            "maxItems": 5,
+            "items": {
+                "type": "object",
+                "required": ["title", "score", "justification"],
+                "properties": {
+                    "title": {"type": "string"},
+                    "kind": {"type": "string"},
+                    "score": _SCORE,
+                    "justification": {"type": "string"},
+                },
+            },
+        },
+        "trends": {
+            "type": ["object", "null"],
+            "required": ["rows"],
+            "properties": {
+                "summary": {"type": "string"},
+                "rows": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "required": ["year", "demand_growth_pct"],
+                        "properties": {"year": {"type": "integer"}, "demand_growth_pct": {"type": "number"}},
+                    },
+                },
+            },
+        },
+    },
+}
+_FENCE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$")
+
+
+class StructuredResponseError(ValueError):
+    """The model's answer was not valid JSON for the schema; the message is user-facing."""
+
+
+def json_generation_config(generation_config):
+    """``generation_config`` with Gemini's JSON output mode switched on."""
+    if generation_config is None:
+        return {"response_mime_type": "application/json"}
+    if dataclasses.is_dataclass(generation_config):
+        return dataclasses.replace(generation_config, response_mime_type="application/json")
+    return dict(generation_config, response_mime_type="application/json")
+
+
+def parse_analysis(text):
+    """Decode and validate the model's JSON answer; raises ``StructuredResponseError``."""
+    import jsonschema
+
+    try:
+        data = json.loads(_FENCE.sub("", text or ""))
+    except json.JSONDecodeError as e:
+        raise StructuredResponseError(f"The AI's answer was not valid JSON ({e.msg} at line {e.lineno}).") from None
+    try:
+        jsonschema.validate(data, ANALYSIS_SCHEMA)
+    except jsonschema.ValidationError as e:
+        where = "/".join(str(p) for p in e.absolute_path) or "top level"
+        raise StructuredResponseError(f"The AI's answer did not match the expected format at {where}: {e.message}") from None
+    return data
+
+
+def analyze(generate, prompt):
+    """Return the validated analysis for ``prompt``; ``generate(prompt)`` returns model text.
+
+    One retry is made with the validation error spelled out, which fixes the
+    usual slips (a missing field, a score given as a string). A cached
+    ``generate`` should reject invalid answers before storing them
+    (``generate_text(..., validate=parse_analysis)``), or a bad answer keeps
+    failing from the cache.
+    """
+    try:
+        return parse_analysis(generate(prompt))
+    except StructuredResponseError as e:
+        repair = f"{prompt}\n\nYour previous answer was rejected: {e} Answer again with only the corrected JSON object."
+        return parse_analysis(generate(repair))
+
+
+def _bullets(items):
+    return "\n".join(f"- {item}" for item in items)
+
+
+def render_results(analysis):
+    """Markdown for each of ``RESULT_KEYS``; keys the analysis has nothing for are empty."""
+    results = dict.fromkeys(RESULT_KEYS, "")
+    results["general_result"] = "\n\n".join([
+        f"Resume Score: {analysis['resume_score']}/100",
+        f"**Archetype:** {analysis['archetype']}",
+        analysis["summary"],
+        f"**Strengths**\n{_bullets(analysis['strengths'])}",
+        f"**Weaknesses**\n{_bullets(analysis['weaknesses'])}",
+    ])
+    ats = analysis.get("ats")
+    if ats:
+        results["ats_result"] = "\n\n".join([
+            f"ATS Score: {ats['score']}/100",
+            format_keyword_table(ats["missing_keywords"], ats["present_keywords"]),
+        ])
+    fit = analysis.get("fit")
+    if fit:
+        paths = [
+            f"- **{p.get('kind') or 'Opportunity'}: {p['title']}** (Opportunity Score: {p['score']}/100): {p['justification']}"
+            for p in analysis.get("career_paths") or []
+        ]
+        results["opportunity_result"] = "\n\n".join(
+            [f"**Fit Score:** {fit['score']}/100", fit["justification"]] + (["**Career Suggestions**\n" + "\n".join(paths)] if paths else [])
+        )
+    trends = analysis.get("trends")
+    if trends and trends["rows"]:
+        table = ["| Year | Demand Growth (%) |", "|---|---|"]
+        table += [f"| {row['year']} | {row['demand_growth_pct']:g} |" for row in trends["rows"]]
+        results["trends_result"] = "\n\n".join(filter(None, [trends.get("summary"), "\n".join(table)]))
+    return results
+
+
+def result_fields(analysis):
+    """The validated values behind ``render_results``: each key's score, and the trend rows.
+
+    Trend rows are ``[(year, growth_percent)]`` like ``core.parsing.parse_trend_rows``.
+    """
+    fields = {"general_result": {"score": analysis["resume_score"]}}
+    if analysis.get("ats"):
+        fields["ats_result"] = {"score": analysis["ats"]["score"]}
+    if analysis.get("fit"):
+        fields["opportunity_result"] = {"score": analysis["fit"]["score"]}
+    trends = analysis.get("trends")
+    if trends and trends["rows"]:
+        fields["trends_result"] = {"rows": [(str(row["year"]), float(row["demand_growth_pct"])) for row in trends["rows"]]}
+    return fields
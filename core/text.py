@@ -0,0 +1,78 @@
+"""Tokenization shared by the local scorers and indexes."""
+
+import re
+
+# Keeps skill tokens such as "c++", "c#", "node.js" and ".net" intact.
+TOKEN_PATTERN = re.compile(r"[a-z0-9.][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+# Phrases never span line breaks, list punctuation or sentence ends.
+PHRASE_BREAK = re.compile(r"[\n\r,;:()\[\]|/•●▪■–—!?]|\.\s")
+
+STOP_WORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each etc few for from further
+had has have having he her here hers herself him himself his how i if in into is it its itself
+just may me might more most must my myself no nor not now of off on once only or other our ours
+ourselves out over own per same shall she should so some such than that the their theirs them
+themselves then there these they this those through to too under until up upon us very via was
+we were what when where which while who whom why will with within without would you your yours
+yourself yourselves
+""".split())
+
+# Words that appear in nearly every job posting or resume and say nothing
+# about the specific role.
+GENERIC_TERMS = frozenset("""
+ability able applicant applicants apply candidate candidates company excellent experience
+experienced good great including job jobs join knowledge looking new opportunity preferred
+position plus related requirement requirements required responsibilities responsibility
+responsible role roles skill skills strong team teams understanding using work working year
+years
+""".split())
+
+IGNORED = STOP_WORDS | GENERIC_TERMS
+
+
+def normalize_token(token):
+    """Fold simple plurals so "models" matches "model" (but not "kubernetes")."""
+    if len(token) > 4 and token.endswith("s") and not token.endswith(("ss", "us", "is", "es")):
+        return token[:-1]
+    return token
+
+
+def tokenize(text):
+    """Return ``(normalized, surface)`` pairs for each word of ``text``.
+
+    Stop words, numbers and punctuation breaks are kept as ``None``
+    placeholders so callers can tell where phrases are broken.
+    """
+    pairs = []
+    for segment in PHRASE_BREAK.split(text.lower()):
+        for match in TOKEN_PATTERN.finditer(segment):
+            surface = match.group()
+            if surface.replace(".", "").isdigit() or surface in IGNORED or (len(surface) == 1 and surface not in "cr"):
+                pairs.append(None)
+            else:
+                pairs.append((normalize_token(surface), surface))
+        pairs.append(None)
+    return pairs
+
+
+def extract_terms(text, ngram_range=(1, 2)):
+    """Return ``(terms, surfaces)``: the unigram/bigram terms of ``text`` and a
+    mapping from each term to how it was first written.
+
+    Stop words break n-grams, so "experience with python" never produces
+    "with python".
+    """
+    tokens = tokenize(text)
+    terms = []
+    surfaces = {}
+    low, high = ngram_range
+    for n in range(low, high + 1):
+        for i in range(len(tokens) - n + 1):
+            window = tokens[i:i + n]
+            if None in window:
+                continue
+            term = " ".join(t[0] for t in window)
+            terms.append(term)
+            surfaces.setdefault(term, " ".join(t[1] for t in window))
+    return terms, surfaces
@@ -0,0 +1,126 @@
+"""Canonical job titles, so "AI Engineer", "ai engineer " and "A.I. Engineer" are one role.
+
+``canonical_key`` folds case, punctuation, abbreviations and synonyms into a
+stable key. ``TitleIndex`` adds a fuzzy-match table on top: a key that is a
+typo of a known title (a missing letter in one long word) maps to that title,
+and the first way a role was written becomes its display form. Titles that
+differ in a seniority word or a whole short word ("R" and "C") never merge.
+"""
+
+import difflib
+import re
+import threading
+import unicodedata
+
+# Whole phrases first, then single words, applied to the lower-cased title.
+PHRASE_SYNONYMS = {
+    "artificial intelligence": "ai",
+    "machine learning": "ml",
+    "user experience": "ux",
+    "user interface": "ui",
+    "quality assurance": "qa",
+    "site reliability": "sre",
+    "full stack": "fullstack",
+    "front end": "frontend",
+    "back end": "backend",
+    "dev ops": "devops",
+    "software development engineer": "software engineer",
+    "software developer": "software engineer",
+}
+WORD_SYNONYMS = {
+    "sr": "senior", "snr": "senior", "jr": "junior", "jnr": "junior",
+    "eng": "engineer", "engr": "engineer", "engg": "engineer",
+    "dev": "developer", "devs": "developer", "developers": "developer", "engineers": "engineer",
+    "mgr": "manager", "mngr": "manager", "assoc": "associate", "asst": "assistant",
+    "swe": "software engineer", "sde": "software engineer",
+    "ds": "data scientist", "pm": "product manager",
+    "fullstack": "fullstack", "fe": "frontend", "be": "backend",
+}
+# Seniority words are kept, but "level" noise such as "ii" or "iii" is not.
+DROPPED_WORDS = {"i", "ii", "iii", "iv", "level", "the", "a", "an", "remote", "hybrid"}
+ACRONYMS = {"ai", "ml", "ux", "ui", "qa", "sre", "it", "hr", "nlp", "cv", "bi", "etl", "seo", "aws", "gcp", "ios", "cto",
+            "ceo", "cfo", "vp"}
+# Words that change the role; a title differing in one is never a typo.
+SENIORITY_WORDS = {"junior", "senior", "lead", "principal", "staff", "head", "chief", "associate", "assistant",
+                   "intern", "trainee", "entry", "mid", "manager", "director", "vp"}
+# Only one word may differ, it must be at least this long in both titles,
+# and the two spellings at least this similar.
+MIN_TYPO_LENGTH = 5
+FUZZY_CUTOFF = 0.9
+
+
+def canonical_key(title):
+    text = unicodedata.normalize("NFKC", title or "").lower()
+    # "A.I." -> "ai", "front-end" -> "front end", "R&D" -> "r and d"
+    text = re.sub(r"\b([a-z])\.(?=[a-z]\.?)", r"\1", text).replace(".", " ")
+    text = text.replace("&", " and ").replace("+", " plus ")
+    text = re.sub(r"[^a-z0-9#]+", " ", text)
+    text = f" {' '.join(text.split())} "
+    for phrase, replacement in PHRASE_SYNONYMS.items():
+        text = text.replace(f" {phrase} ", f" {replacement} ")
+    words = []
+    for word in text.split():
+        for part in WORD_SYNONYMS.get(word, word).split():
+            if part not in DROPPED_WORDS:
+                words.append(part)
+    return " ".join(words)
+
+
+def _is_typo(a, b):
+    if min(len(a), len(b)) < MIN_TYPO_LENGTH or a in SENIORITY_WORDS or b in SENIORITY_WORDS:
+        return False
+    return difflib.SequenceMatcher(None, a, b).ratio() >= FUZZY_CUTOFF
+
+
+def typo_match(key, known):
+    """The known key that ``key`` is a one-word typo of, or None."""
+    words = key.split()
+    for other in known:
+        other_words = other.split()
+        if len(other_words) != len(words):
+            continue
+        differing = [(a, b) for a, b in zip(words, other_words) if a != b]
+        if len(differing) == 1 and _is_typo(*differing[0]):
+            return other
+    return None
+
+
+def display_title(key):
+    # Readable fallback for a key nobody has typed nicely yet.
+    return " ".join(word.upper() if word in ACRONYMS else word.capitalize() for word in key.split())
+
+
+class TitleIndex:
+    """Known titles by canonical key, with fuzzy lookup for near misses."""
+
+    def __init__(self, titles=()):
+        self._lock = threading.Lock()
+        self._display = {}
+        for title in titles:
+            self.add(title)
+
+    def add(self, title):
+        key = canonical_key(title)
+        if key:
+            with self._lock:
+                self._display.setdefault(key, title.strip())
+        return key
+
+    def resolve(self, title):
+        """Return ``(key, display title)`` for ``title``, learning it if it is new."""
+        key = canonical_key(title)
+        if not key:
+            return "", ""
+        with self._lock:
+            if key not in self._display:
+                close = typo_match(key, self._display)
+                if close:
+                    key = close
+                else:
+                    typed = " ".join(title.split())
+                    # Keep a deliberately cased title ("DevOps Engineer"), not "ai engineer".
+                    self._display[key] = typed if typed != typed.lower() and typed != typed.upper() else display_title(key)
+            return key, self._display[key]
+
+    def __len__(self):
+        return len(self._display)
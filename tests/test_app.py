@@ -0,0 +1,57 @@
+import os
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESUME = os.path.join(ROOT, "SampleResume", "PriyaSE.pdf")
+
+# AppTest has no file uploads; answer the uploader with a sample resume.
+DRIVER = f"""
+import io
+import os
+import runpy
+
+import streamlit as st
+
+
+class _Upload(io.BytesIO):
+    name = os.path.basename({RESUME!r})
+    size = property(lambda self: len(self.getvalue()))
+
+
+def _file_uploader(*args, **kwargs):
+    with open({RESUME!r}, "rb") as f:
+        return _Upload(f.read())
+
+
+st.file_uploader = _file_uploader
+os.chdir({ROOT!r})
+runpy.run_path(os.path.join({ROOT!r}, "app.py"), run_name="__main__")
+"""
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    from streamlit.testing.v1 import AppTest
+
+    monkeypatch.setenv("RESUME_ANALYZER_BACKEND", "stub")
+    monkeypatch.setenv("RESUME_ANALYZER_STUB_LATENCY", "constant:0")
+    for name, path in [("LLM_CACHE", "responses.sqlite3"), ("SHARED_CACHE", "shared.sqlite3"),
+                       ("JOBS", "jobs.sqlite3"), ("SESSION_DIR", "sessions"), ("CACHE_DIR", "parses"),
+                       ("JD_LIBRARY", "jd_library")]:
+        monkeypatch.setenv(f"RESUME_ANALYZER_{name}", str(tmp_path / path))
+    return AppTest.from_string(DRIVER, default_timeout=60)
+
+
+def test_full_report_fills_every_tab(app):
+    app.run()
+    app.text_input[0].input("Data Scientist").run()
+    app.text_area(key="ats_job_description").input("Python, SQL and Spark for data pipelines").run()
+    next(b for b in app.button if "Full Report" in b.label).click().run()
+
+    assert not app.exception
+    assert not app.error
+    labels = [m.label for m in app.metric]
+    assert "General Score" in labels and "ATS Score" in labels
+    downloads = [b.label for b in app.get("download_button")]
+    assert "Download Cover Letter as TXT" in downloads
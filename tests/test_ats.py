@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from core.ats import BIGRAM_BOOST, K1, PARTIAL_PHRASE_CREDIT, score_ats, format_keyword_table, weigh_terms
+from core.parsing import parse_keyword_table
+
+
+def test_repeated_terms_saturate_and_phrases_are_boosted():
+    vocab, weights = weigh_terms(["python", "python", "python", "python", "machine learning", "sql"])
+    weight = dict(zip(vocab, weights))
+    assert weight["sql"] == pytest.approx(1.0)
+    assert weight["python"] == pytest.approx(4 * (K1 + 1) / (4 + K1))
+    assert weight["python"] < 4 * weight["sql"] / 2
+    assert weight["machine learning"] == pytest.approx(BIGRAM_BOOST)
+
+
+def test_idf_scales_the_weights():
+    vocab, weights = weigh_terms(["python", "sql"], idf={"python": 0.5})
+    assert dict(zip(vocab, weights)) == pytest.approx({"python": 0.5, "sql": 1.0})
+
+
+def test_a_resume_covering_every_term_scores_100():
+    result = score_ats("Python developer with Kubernetes", "Python developer, Kubernetes")
+    assert (result.score, result.coverage, result.missing_keywords) == (100, 1.0, [])
+
+
+def test_an_empty_job_description_scores_zero():
+    assert score_ats("Python developer", "").score == 0
+
+
+def test_phrase_words_found_apart_earn_partial_credit():
+    result = score_ats("Skills: machine vision, deep learning", "Machine learning")
+    # "machine" and "learning" match; "machine learning" only partially.
+    full = 2 * 1.0
+    expected = (full + PARTIAL_PHRASE_CREDIT * BIGRAM_BOOST) / (full + BIGRAM_BOOST)
+    assert result.coverage == pytest.approx(expected)
+    assert result.score == int(round(100 * np.sqrt(expected)))
+    assert "machine learning" not in result.missing_keywords + result.present_keywords
+
+
+def test_missing_keywords_are_ordered_by_weight_without_overlapping_words():
+    result = score_ats("Nothing relevant here", "Kubernetes for deployments; Kubernetes for jobs; Kubernetes, Terraform, machine learning")
+    assert result.missing_keywords[:2] == ["kubernetes", "machine learning"]
+    assert "machine" not in result.missing_keywords and "learning" not in result.missing_keywords
+    words = [w for keyword in result.missing_keywords for w in keyword.lower().split()]
+    assert len(words) == len(set(words))
+
+
+def test_keyword_table_round_trips_through_the_ai_parser():
+    table = format_keyword_table(["Kubernetes", "Terraform"], ["Python"])
+    assert parse_keyword_table(table) == (["Kubernetes", "Terraform"], ["Python"])
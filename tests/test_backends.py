@@ -0,0 +1,127 @@
+import random
+
+import pytest
+
+from core.backends import (
+    HEALTH_CHECK_TIMEOUT,
+    RecordingBackend,
+    ReplayBackend,
+    ReplayMissError,
+    Response,
+    SharedModel,
+    StubBackend,
+    StubRateLimitError,
+    create_backend,
+    parse_latency,
+)
+from core.parsing import parse_keyword_table, parse_score, parse_trend_rows
+from core.scheduler import is_retryable
+
+
+class FakeClient:
+    """A model that fails with the queued errors, then answers."""
+
+    def __init__(self, name, errors=()):
+        self.model_name = name
+        self.errors = list(errors)
+        self.token_requests = []
+
+    def generate_content(self, prompt, generation_config=None, stream=False, **kwargs):
+        if self.errors:
+            raise self.errors.pop(0)
+        return iter([Response("o"), Response("k")]) if stream else Response("ok")
+
+    def count_tokens(self, prompt, request_options=None):
+        self.token_requests.append(request_options)
+        if self.errors:
+            raise self.errors.pop(0)
+
+
+def _shared(*clients):
+    built = iter(clients)
+    return SharedModel(lambda: (next(built), None))
+
+
+def test_client_is_replaced_after_two_connection_errors():
+    broken = FakeClient("first", [ConnectionError("reset"), ConnectionError("reset")])
+    shared = _shared(broken, FakeClient("second"))
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            shared.generate_content("hi")
+    assert shared.model_name == "second"
+    assert shared.stats()["replacements"] == 1
+    assert shared.generate_content("hi").text == "ok"
+
+
+def test_a_success_or_a_bad_request_resets_the_count():
+    errors = [ConnectionError("reset"), ValueError("bad prompt"), ConnectionError("reset")]
+    shared = _shared(FakeClient("first", errors), FakeClient("second"))
+    for _ in range(3):
+        with pytest.raises((ConnectionError, ValueError)):
+            shared.generate_content("hi")
+    assert shared.model_name == "first"
+    assert shared.stats()["consecutive_failures"] == 1
+
+
+def test_failed_health_check_replaces_the_client_without_retrying():
+    broken = FakeClient("first", [ConnectionError("unreachable")])
+    shared = _shared(broken, FakeClient("second"))
+    assert shared.check_health() is False
+    assert broken.token_requests == [{"timeout": HEALTH_CHECK_TIMEOUT, "retry": None}]
+    assert shared.model_name == "second"
+    assert shared.check_health() is True
+
+
+@pytest.mark.parametrize("spec", ["constant:1.5", "uniform:1,2", "normal:1,5", "lognormal:1.5,0.4", "exponential:0.5"])
+def test_latency_samples_are_never_negative(spec):
+    sample, rng = parse_latency(spec), random.Random(0)
+    assert all(sample(rng) >= 0 for _ in range(200))
+    assert parse_latency("constant:1.5")(rng) == 1.5
+
+
+@pytest.mark.parametrize("spec", ["constant", "uniform:1", "gamma:1,2", "normal:a,b"])
+def test_bad_latency_specs_are_rejected(spec):
+    with pytest.raises(ValueError, match="Bad latency spec"):
+        parse_latency(spec)
+
+
+def test_stub_answers_are_deterministic_and_parseable():
+    stub = StubBackend(latency="constant:0")
+    text = stub.generate_content("Rate this resume").text
+    assert text == StubBackend(latency="constant:0", seed=7).generate_content("Rate this resume").text
+    assert text != stub.generate_content("Rate that resume").text
+    assert parse_score(text) is not None
+    assert len(parse_trend_rows(text)) == 6
+    missing, present = parse_keyword_table(text)
+    assert len(missing) + len(present) == 8
+    assert "".join(c.text for c in stub.generate_content("Rate this resume", stream=True)) == text
+
+
+def test_stub_errors_look_like_rate_limits():
+    stub = StubBackend(latency="constant:0", error_rate=1.0)
+    with pytest.raises(StubRateLimitError) as caught:
+        stub.generate_content("hi")
+    assert is_retryable(caught.value)
+
+
+def test_recorded_responses_replay_offline(tmp_path):
+    recorder = RecordingBackend(FakeClient("models/gemini-1.5-flash"), str(tmp_path))
+    config = {"temperature": 0.2}
+    assert recorder.generate_content("hi", generation_config=config).text == "ok"
+    assert [c.text for c in recorder.generate_content("stream me", generation_config=config, stream=True)] == ["o", "k"]
+
+    replay = ReplayBackend(str(tmp_path), "gemini-1.5-flash", realtime=False)
+    assert replay.generate_content("hi", generation_config=config).text == "ok"
+    assert [c.text for c in replay.generate_content("stream me", generation_config=config, stream=True)] == ["o", "k"]
+    with pytest.raises(ReplayMissError):
+        replay.generate_content("hi", generation_config={"temperature": 0.9})
+
+
+def test_create_backend_reads_the_environment(monkeypatch, tmp_path):
+    monkeypatch.setenv("RESUME_ANALYZER_BACKEND", "stub")
+    monkeypatch.setenv("RESUME_ANALYZER_STUB_LATENCY", "constant:0.25")
+    assert create_backend().latency == "constant:0.25"
+    monkeypatch.setenv("RESUME_ANALYZER_RECORDINGS", str(tmp_path))
+    assert create_backend("replay").directory == str(tmp_path)
+    with pytest.raises(ValueError, match="Unknown model backend"):
+        create_backend("mystery")
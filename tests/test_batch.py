@@ -0,0 +1,111 @@
+import csv
+import os
+import shutil
+import threading
+
+from core.backends import Response
+from core.batch import iter_resume_paths, score_resume, screen_resumes, write_reports
+from core.near_dup import NearDuplicateIndex
+
+SAMPLES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "SampleResume")
+
+ANSWER = """**ATS Score: {score}/100**
+
+| Missing Keywords | Present Keywords |
+|---|---|
+| Kubernetes | Python |
+| - | SQL |
+"""
+
+
+class ScoringModel:
+    """Scores the teacher resume lower than everyone else."""
+
+    model_name = "test/ats"
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt, generation_config=None, stream=False):
+        with self._lock:
+            self.calls += 1
+        if self.fail:
+            raise RuntimeError("quota exceeded")
+        return Response(ANSWER.format(score=40 if "teach" in prompt.lower() else 85))
+
+
+def _folder(tmp_path, names):
+    for name in names:
+        shutil.copy(os.path.join(SAMPLES, name.split(":")[-1]), tmp_path / name.split(":")[0])
+    return tmp_path
+
+
+def test_iter_resume_paths_lists_supported_files_in_order(tmp_path):
+    for name in ["b.pdf", "a.docx", "notes.txt", "c.PDF"]:
+        (tmp_path / name).write_bytes(b"")
+    (tmp_path / "nested.pdf").mkdir()
+    assert [os.path.basename(p) for p in iter_resume_paths(tmp_path)] == ["a.docx", "b.pdf", "c.PDF"]
+
+
+def test_score_resume_parses_the_score_and_keywords():
+    result = score_resume("r.pdf", "Python developer", "Python and Kubernetes", ScoringModel())
+    assert (result.ats_score, result.missing_keywords, result.present_keywords) == (85, ["Kubernetes"], ["Python", "SQL"])
+    assert result.error is None
+
+
+def test_score_resume_reports_model_failures():
+    result = score_resume("r.pdf", "Python developer", "Python", ScoringModel(fail=True))
+    assert result.ats_score is None
+    assert result.error == "model call failed: quota exceeded"
+
+
+def test_screening_writes_ranked_reports(tmp_path):
+    (tmp_path / "in").mkdir()
+    folder = _folder(tmp_path / "in", ["priya.pdf:PriyaSE.pdf", "teacher.pdf:Teacher.pdf", "marketing.pdf:Marketing.pdf"])
+    (folder / "broken.pdf").write_bytes(b"%PDF-1.4 not really a pdf")
+    model = ScoringModel()
+
+    results = screen_resumes(iter_resume_paths(folder), "Python and Kubernetes", model,
+                             extract_workers=2, max_concurrency=2)
+    jsonl_path, csv_path = write_reports(results, tmp_path / "out")
+
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["file"] for row in rows[2:]] == ["teacher.pdf", "broken.pdf"]
+    assert {row["file"] for row in rows[:2]} == {"priya.pdf", "marketing.pdf"}
+    assert [row["rank"] for row in rows] == ["1", "2", "3", "4"]
+    assert rows[0]["ats_score"] == "85" and rows[0]["missing_keywords"] == "Kubernetes"
+    assert rows[3]["ats_score"] == "" and rows[3]["error"].startswith("could not read file")
+    assert model.calls == 3
+    with open(jsonl_path, encoding="utf-8") as f:
+        assert len(f.readlines()) == 4
+
+
+def test_near_duplicates_reuse_the_earlier_result(tmp_path):
+    folder = _folder(tmp_path, ["a.pdf:PriyaSE.pdf", "b.pdf:PriyaSE.pdf", "c.pdf:Teacher.pdf"])
+    model = ScoringModel()
+
+    results = {os.path.basename(r.path): r for r in screen_resumes(
+        iter_resume_paths(folder), "Python", model, extract_workers=1, max_concurrency=1,
+        near_duplicates=NearDuplicateIndex(0.9),
+    )}
+
+    assert model.calls == 2
+    assert os.path.basename(results["b.pdf"].similar_to) == "a.pdf"
+    assert results["b.pdf"].ats_score == results["a.pdf"].ats_score == 85
+    assert results["c.pdf"].similar_to is None
+
+
+def test_rerun_duplicates_scores_them_and_only_marks_them(tmp_path):
+    folder = _folder(tmp_path, ["a.pdf:PriyaSE.pdf", "b.pdf:PriyaSE.pdf"])
+    model = ScoringModel()
+
+    results = {os.path.basename(r.path): r for r in screen_resumes(
+        iter_resume_paths(folder), "Python", model, extract_workers=1, max_concurrency=1,
+        near_duplicates=NearDuplicateIndex(0.9), rerun_duplicates=True,
+    )}
+
+    assert model.calls == 2
+    assert os.path.basename(results["b.pdf"].similar_to) == "a.pdf"
@@ -0,0 +1,50 @@
+from core.compaction import normalize_resume_text
+from core.extraction import PAGE_BREAK
+
+
+def _page(number, body):
+    return f"Jordan Lee · jordan@example.com\n{body}\nConfidential resume\nPage {number} of 3\n"
+
+
+def test_running_header_footer_and_page_numbers_are_dropped():
+    text = PAGE_BREAK.join([
+        _page(1, "SUMMARY\nBackend engineer."),
+        _page(2, "EXPERIENCE\nSoftware Engineer, Acme"),
+        _page(3, "EDUCATION\nBSc Computer Science"),
+    ])
+    lines = normalize_resume_text(text).splitlines()
+    assert lines.count("Jordan Lee · jordan@example.com") == 1
+    assert lines.count("Confidential resume") == 1
+    assert not [line for line in lines if line.startswith("Page ")]
+    for content in ("Backend engineer.", "Software Engineer, Acme", "BSc Computer Science"):
+        assert content in lines
+
+
+def test_bare_numbers_and_repeated_titles_are_content():
+    text = """Jordan Lee
+Software Engineer
+jordan@example.com
+
+EXPERIENCE
+Software Engineer
+Acme Corp
+2018
+2022
+- Built the billing service
+
+EDUCATION
+BSc Computer Science
+GPA
+9
+"""
+    lines = normalize_resume_text(text).splitlines()
+    assert lines.count("Software Engineer") == 2
+    for content in ("2018", "2022", "9"):
+        assert content in lines
+
+
+def test_numbers_at_page_edges_are_only_dropped_as_page_numbers():
+    text = PAGE_BREAK.join(["EXPERIENCE\nSoftware Engineer\n2018\n", "2022\nLead Engineer\n2\n"])
+    lines = normalize_resume_text(text).splitlines()
+    assert "2018" in lines and "2022" in lines
+    assert "2" not in lines
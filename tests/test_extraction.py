@@ -0,0 +1,166 @@
+import io
+import zipfile
+
+import docx
+import pytest
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+from docx.shared import Inches
+
+from core import extraction
+from core.extraction import (
+    ExtractionError,
+    ExtractionLimits,
+    check_upload,
+    extract_text_from_path,
+    iter_pdf_pages,
+    iter_pdf_pages_parallel,
+    parse_document,
+)
+
+# Word writes a text box as a DrawingML shape followed by a VML fallback copy.
+TEXT_BOX = (
+    f'<w:r {nsdecls("w")} xmlns:v="urn:schemas-microsoft-com:vml" '
+    'xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape" '
+    'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006">'
+    '<mc:AlternateContent><mc:Choice Requires="wps"><w:drawing><wps:txbx><w:txbxContent>'
+    '<w:p><w:r><w:t>Open to relocation</w:t></w:r></w:p>'
+    '</w:txbxContent></wps:txbx></w:drawing></mc:Choice>'
+    '<mc:Fallback><w:pict><v:textbox><w:txbxContent>'
+    '<w:p><w:r><w:t>Open to relocation</w:t></w:r></w:p>'
+    '</w:txbxContent></v:textbox></w:pict></mc:Fallback></mc:AlternateContent></w:r>'
+)
+
+
+def _docx_bytes():
+    doc = docx.Document()
+    doc.sections[0].header.paragraphs[0].text = "Jordan Lee · jordan@example.com"
+    doc.add_paragraph("EXPERIENCE")
+    role = doc.add_paragraph()
+    role.paragraph_format.tab_stops.add_tab_stop(Inches(3))
+    role.paragraph_format.tab_stops.add_tab_stop(Inches(5))
+    role.add_run("Software Engineer\t2021 - Present")
+    anchor = doc.add_paragraph("Relocation")
+    anchor._p.append(parse_xml(TEXT_BOX))
+    table = doc.add_table(rows=2, cols=2)
+    for row, (name, skills) in enumerate([("Languages", "Python, Go"), ("Cloud", "AWS")]):
+        table.cell(row, 0).text = name
+        table.cell(row, 1).text = skills
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def test_docx_text_matches_the_document():
+    text = parse_document(_docx_bytes(), "resume.docx")
+    assert text.split("\n") == [
+        "Jordan Lee · jordan@example.com",
+        "EXPERIENCE",
+        "Software Engineer\t2021 - Present",
+        "Relocation",
+        "Open to relocation",
+        "",
+        "Languages | Python, Go",
+        "Cloud | AWS",
+    ]
+
+
+def test_tab_stop_definitions_are_not_text():
+    data = _docx_bytes()
+    paragraphs = docx.Document(io.BytesIO(data)).paragraphs
+    assert "Software Engineer\t2021 - Present" in [p.text for p in paragraphs]
+    assert "\t\tSoftware Engineer" not in parse_document(data, "resume.docx")
+
+
+def test_docx_character_limit():
+    with pytest.raises(ExtractionError):
+        parse_document(_docx_bytes(), "resume.docx", ExtractionLimits(max_chars=40))
+
+
+def _pdf_bytes(pages):
+    import fitz
+
+    doc = fitz.open()
+    for number in range(pages):
+        doc.new_page().insert_text((72, 72), f"Page {number + 1}: built data pipelines in Python")
+    return doc.tobytes()
+
+
+
+def test_repeated_headers_and_footers_appear_once():
+    doc = docx.Document()
+    section = doc.sections[0]
+    section.different_first_page_header_footer = True
+    section.header.paragraphs[0].text = "Jordan Lee"
+    section.first_page_header.paragraphs[0].text = "Jordan Lee"
+    section.footer.paragraphs[0].text = "References on request"
+    doc.add_paragraph("EXPERIENCE")
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    assert parse_document(buffer.getvalue(), "resume.docx").split("\n") == [
+        "Jordan Lee", "EXPERIENCE", "References on request",
+    ]
+
+
+def _zip_bytes(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("data, message", [
+    (_docx_bytes()[:2000], "damaged"),
+    (_zip_bytes({"word/document.xml": "<w:document"}), "damaged"),
+    (_zip_bytes({"content.xml": "<office:document/>"}), "does not look like a real DOCX"),
+])
+def test_broken_docx_files_are_rejected(data, message):
+    with pytest.raises(ExtractionError, match=message):
+        parse_document(data, "resume.docx")
+
+@pytest.mark.parametrize("start_method", ["forkserver", "spawn"])
+def test_parallel_pdf_pages_match_sequential(monkeypatch, start_method):
+    monkeypatch.setattr(extraction, "_START_METHOD", start_method)
+    data = _pdf_bytes(12)
+    sequential = list(iter_pdf_pages(data))
+    assert list(iter_pdf_pages_parallel(data, workers=2, threshold=0)) == sequential
+    assert parse_document(data, "resume.pdf", workers=2) == parse_document(data, "resume.pdf")
+
+
+@pytest.mark.parametrize("head, size, filename, message", [
+    (b"%PDF-1.7", 100, "resume.txt", "Unsupported file type: .txt"),
+    (b"%PDF-1.7", 100, "resume", "Unsupported file type: resume"),
+    (b"%PDF-1.7", 11 * 1024 * 1024, "resume.pdf", "File is 11.0 MB; the limit is 10 MB."),
+    (b"PK\x03\x04", 100, "resume.pdf", "does not look like a real PDF"),
+    (b"%PDF-1.7", 100, "resume.docx", "does not look like a real DOCX"),
+])
+def test_check_upload_rejects(head, size, filename, message):
+    with pytest.raises(ExtractionError, match=message.replace(".", r"\.")):
+        check_upload(head, size, filename)
+
+
+def test_check_upload_accepts_real_documents():
+    check_upload(b"%PDF-1.7", 100, "Resume.PDF")
+    check_upload(b"PK\x03\x04", 100, "resume.docx")
+
+
+def test_pdf_page_limit_is_checked_before_parsing(monkeypatch):
+    data = _pdf_bytes(3)
+    monkeypatch.setattr("fitz.Page.get_text", lambda *a, **k: pytest.fail("page parsed"))
+    with pytest.raises(ExtractionError, match="Document has 3 pages; the limit is 2."):
+        parse_document(data, "resume.pdf", ExtractionLimits(max_pages=2))
+
+
+def test_pdf_character_limit(tmp_path):
+    path = tmp_path / "resume.pdf"
+    path.write_bytes(_pdf_bytes(3))
+    assert extract_text_from_path(str(path)).count("Python") == 3
+    with pytest.raises(ExtractionError, match="more than 100 characters"):
+        extract_text_from_path(str(path), ExtractionLimits(max_chars=100))
+
+
+def test_limits_from_env(monkeypatch):
+    monkeypatch.setenv("RESUME_ANALYZER_MAX_PAGES", "5")
+    monkeypatch.setenv("RESUME_ANALYZER_MAX_CHARS", "1000")
+    assert ExtractionLimits.from_env() == ExtractionLimits(max_pages=5, max_chars=1000)
@@ -0,0 +1,32 @@
+import pytest
+
+from core.incremental import run_incremental
+
+NO_HEADINGS = """Jordan Lee
+jordan@example.com
+
+Built data pipelines in Python and Spark for five years.
+Led a team of four engineers.
+"""
+
+
+def test_resume_without_headings_is_analyzed_as_one_section():
+    prompts = []
+
+    def generate(prompt, feature):
+        prompts.append(prompt)
+        return "Resume Score: 72/100\nClear and concise."
+
+    result, report = run_incremental("general", NO_HEADINGS, generate, {})
+    assert len(prompts) == 1
+    assert "Built data pipelines" in prompts[0]
+    assert report.analyzed == ["resume"]
+    assert result.startswith("Resume Score: 72/100")
+
+
+def test_empty_resume_is_not_scored():
+    def generate(prompt, feature):
+        raise AssertionError("no model call expected")
+
+    with pytest.raises(ValueError):
+        run_incremental("general", "  \n", generate, {})
@@ -0,0 +1,77 @@
+import os
+
+import numpy as np
+import pytest
+
+from core.ats import score_ats
+from core.jd_library import JobLibrary, build_library, open_library
+from core.matching import ResumeIndex
+
+DATA = "Job Title: Data Scientist\nPython, SQL and Spark. Machine learning models in Python.\n"
+WEB = "Frontend developer building React apps in TypeScript.\n"
+RESUME = "Skills: Python, SQL, statistics and machine learning."
+
+
+@pytest.fixture
+def source(tmp_path):
+    folder = tmp_path / "jds"
+    folder.mkdir()
+    (folder / "data.txt").write_text(DATA, encoding="utf-8")
+    (folder / "web.txt").write_text(WEB, encoding="utf-8")
+    (folder / "notes.md").write_text("ignored", encoding="utf-8")
+    return folder
+
+
+def test_library_keeps_titles_texts_and_term_counts(source, tmp_path):
+    library = build_library(str(source), str(tmp_path / "lib"))
+    assert len(library) == 2 and "data" in library and "notes" not in library
+    assert library.title("data") == "Data Scientist"
+    assert library.title("web") == "web"
+    assert library.text("web") == WEB.strip()
+    assert library.term_counts("data")["python"] == 2
+
+
+def test_saved_roles_score_like_their_text(source, tmp_path):
+    library = build_library(str(source), str(tmp_path / "lib"))
+    saved = library.score_ats("data", RESUME)
+    fresh = score_ats(RESUME, library.text("data"))
+    assert (saved.score, saved.coverage) == (fresh.score, pytest.approx(fresh.coverage))
+    assert [k.lower() for k in saved.missing_keywords] == [k.lower() for k in fresh.missing_keywords]
+
+
+def test_stored_counts_feed_the_matcher(source, tmp_path):
+    library = build_library(str(source), str(tmp_path / "lib"))
+    index = ResumeIndex()
+    index.add("resume", RESUME)
+    from_counts = index.match(library.all_term_counts()).scores
+    from_text = index.match({role["id"]: library.text(role["id"]) for role in library.roles}).scores
+    np.testing.assert_allclose(from_counts, from_text, rtol=1e-6)
+
+
+def test_open_library_rebuilds_only_when_the_folder_changes(source, tmp_path):
+    library_dir = str(tmp_path / "lib")
+    first = open_library(str(source), library_dir)
+    built_at = os.stat(os.path.join(library_dir, "manifest.json")).st_mtime_ns
+    first.close()
+
+    again = open_library(str(source), library_dir)
+    assert os.stat(os.path.join(library_dir, "manifest.json")).st_mtime_ns == built_at
+    again.close()
+
+    (source / "ops.txt").write_text("Kubernetes and Terraform engineer.", encoding="utf-8")
+    rebuilt = open_library(str(source), library_dir)
+    assert "ops" in rebuilt and len(rebuilt) == 3
+
+
+def test_a_damaged_library_is_rebuilt(source, tmp_path):
+    library_dir = tmp_path / "lib"
+    build_library(str(source), str(library_dir)).close()
+    (library_dir / "manifest.json").write_text("{", encoding="utf-8")
+    assert len(open_library(str(source), str(library_dir))) == 2
+
+
+def test_an_empty_folder_gives_an_empty_library(tmp_path):
+    (tmp_path / "empty").mkdir()
+    library = build_library(str(tmp_path / "empty"), str(tmp_path / "lib"))
+    assert len(library) == 0 and library.all_term_counts() == {}
+    assert len(JobLibrary(str(tmp_path / "lib"))) == 0
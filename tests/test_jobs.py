@@ -0,0 +1,111 @@
+import sqlite3
+import threading
+import time
+
+from core.jobs import JobQueue
+
+
+def _wait(queue, job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while queue.get(job_id).status in ("queued", "running"):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    return queue.get(job_id)
+
+
+def test_finished_jobs_are_purged_while_running(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), lambda feature, prompt, options: prompt.upper(),
+                     workers=1, keep_for=0.05, poll_interval=0.01, purge_interval=0.01)
+    job_id = queue.submit("a" * 32, "roadmap", "roadmap_result", "plan")
+    assert _wait(queue, job_id).result == "PLAN"
+
+    deadline = time.monotonic() + 5
+    while queue.get(job_id) is not None:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_each_job_is_claimed_once_by_queues_sharing_the_file(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    runs = []
+
+    def runner(feature, prompt, options):
+        runs.append(prompt)
+        return prompt
+
+    queues = [JobQueue(path, runner, workers=2, poll_interval=0.01) for _ in range(2)]
+    job_ids = [queues[0].submit("a" * 32, "roadmap", f"key{i}", f"prompt {i}") for i in range(20)]
+    for job_id in job_ids:
+        assert _wait(queues[1], job_id).status == "done"
+    assert sorted(runs) == sorted(f"prompt {i}" for i in range(20))
+
+
+def test_worker_survives_database_errors(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), lambda feature, prompt, options: prompt,
+                     workers=1, poll_interval=0.01)
+    claim = queue._claim
+    failures = []
+
+    def flaky_claim():
+        if not failures:
+            failures.append(1)
+            raise sqlite3.OperationalError("database is locked")
+        return claim()
+
+    queue._claim = flaky_claim
+    job_id = queue.submit("a" * 32, "roadmap", "roadmap_result", "plan")
+    assert _wait(queue, job_id).status == "done"
+    assert queue._workers[0].is_alive()
+    assert queue.stats()["errors"] == 1
+
+
+def test_job_whose_result_cannot_be_saved_is_failed(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), lambda feature, prompt, options: prompt,
+                     workers=1, poll_interval=0.01)
+    finish = queue._finish
+
+    def finish_without_results(job_id, status, result=None, error=None):
+        if status == "done":
+            raise sqlite3.OperationalError("database or disk is full")
+        finish(job_id, status, result, error)
+
+    queue._finish = finish_without_results
+    job_id = queue.submit("a" * 32, "roadmap", "roadmap_result", "plan")
+    job = _wait(queue, job_id)
+    assert job.status == "failed"
+    assert "disk is full" in job.error
+
+
+def test_running_job_with_an_expired_lease_is_run_again(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    # A job left running by a queue that stopped renewing its lease, e.g. one
+    # in this very process whose cache was cleared.
+    stalled = threading.Event()
+    first = JobQueue(path, lambda feature, prompt, options: stalled.wait() and "",
+                     workers=1, poll_interval=0.01, lease=0.2)
+    job_id = first.submit("a" * 32, "roadmap", "roadmap_result", "plan")
+    while first.get(job_id).status != "running":
+        time.sleep(0.01)
+    with sqlite3.connect(path) as conn:
+        conn.execute("UPDATE jobs SET heartbeat = 0, owner = 'gone' WHERE id = ?", (job_id,))
+
+    second = JobQueue(path, lambda feature, prompt, options: prompt.upper(), workers=1, poll_interval=0.01, lease=0.2)
+    assert second.stats()["recovered"] == 1
+    assert _wait(second, job_id).result == "PLAN"
+    stalled.set()
+
+
+def test_job_with_a_live_lease_is_not_taken_over(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    release = threading.Event()
+    first = JobQueue(path, lambda feature, prompt, options: release.wait() and "first",
+                     workers=1, poll_interval=0.01, lease=0.2)
+    job_id = first.submit("a" * 32, "roadmap", "roadmap_result", "plan")
+    while first.get(job_id).status != "running":
+        time.sleep(0.01)
+
+    second = JobQueue(path, lambda feature, prompt, options: "second", workers=1, poll_interval=0.01, lease=0.2)
+    time.sleep(0.5)   # several lease periods, renewed by the first queue
+    assert second.stats()["recovered"] == 0
+    release.set()
+    assert _wait(first, job_id).result == "first"
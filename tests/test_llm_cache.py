@@ -0,0 +1,71 @@
+from core.backends import Response
+from core.llm import generate_text
+from core.llm_cache import DAY, ResponseCache, make_key
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+class EchoModel:
+    model_name = "test/echo"
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate_content(self, prompt, generation_config=None, stream=False):
+        self.calls += 1
+        return Response(f"answer {self.calls}")
+
+
+def _cache(tmp_path, **kwargs):
+    return ResponseCache(str(tmp_path / "responses.sqlite3"), **kwargs)
+
+
+def test_key_ignores_whitespace_but_not_model_config_or_wording():
+    base = make_key("m", {"temperature": 0.2}, "Rate this resume:\n  Python  developer\n")
+    assert make_key("m", {"temperature": 0.2}, "  Rate this resume:\n\nPython developer") == base
+    assert make_key("m", {"temperature": 0.2, "top_p": None}, "Rate this resume:\nPython developer") == base
+    assert make_key("other", {"temperature": 0.2}, "Rate this resume:\nPython developer") != base
+    assert make_key("m", {"temperature": 0.9}, "Rate this resume:\nPython developer") != base
+    assert make_key("m", {"temperature": 0.2}, "Rate this resume:\nGo developer") != base
+
+
+def test_entries_expire_after_their_feature_ttl(tmp_path, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr("core.llm_cache.time", clock)
+    cache = _cache(tmp_path)
+    cache.put("k1", "trends", "growing")
+    cache.put("k2", "general", "72/100")
+    clock.now += 2 * DAY
+    assert cache.get("k1", "trends") is None
+    assert cache.get("k2", "general") == "72/100"
+    assert cache.stats()["entries"] == 1
+
+
+def test_least_recently_used_entries_are_evicted_past_max_bytes(tmp_path, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr("core.llm_cache.time", clock)
+    cache = _cache(tmp_path, max_bytes=25)
+    for key in ("a", "b"):
+        clock.now += 1
+        cache.put(key, "general", "x" * 10)
+    clock.now += 1
+    cache.get("a", "general")
+    clock.now += 1
+    cache.put("c", "general", "x" * 10)
+    assert cache.get("b", "general") is None
+    assert cache.get("a", "general") and cache.get("c", "general")
+
+
+def test_generate_text_uses_the_cache_and_bypass_refreshes_it(tmp_path):
+    cache, model = _cache(tmp_path), EchoModel()
+    assert generate_text(model, "prompt", cache=cache) == "answer 1"
+    assert generate_text(model, "prompt", cache=cache) == "answer 1"
+    assert generate_text(model, "prompt", cache=cache, bypass_cache=True) == "answer 2"
+    assert generate_text(model, "prompt", cache=cache) == "answer 2"
+    assert model.calls == 2
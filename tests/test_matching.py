@@ -0,0 +1,63 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from core.matching import MatchResult, ResumeIndex
+from core.text import extract_terms
+
+RESUMES = {
+    "data.pdf": "Data scientist. Python, SQL, Spark, machine learning and statistics.",
+    "web.pdf": "Frontend developer. JavaScript, React, CSS and TypeScript.",
+    "ops.pdf": "Site reliability engineer. Kubernetes, Terraform, Python and AWS.",
+}
+ROLES = {
+    "Data Scientist": "We need Python, SQL, Spark and machine learning experience.",
+    "Frontend Engineer": "React and TypeScript developer who writes clean CSS.",
+}
+
+
+@pytest.fixture
+def index():
+    index = ResumeIndex()
+    index.add_many(RESUMES.items())
+    return index
+
+
+def test_re_adding_a_resume_is_ignored(index):
+    index.add("data.pdf", "Completely different text")
+    assert len(index) == 3 and "data.pdf" in index and "other.pdf" not in index
+    assert index.match({"r": "Completely different"}).scores.max() == 0
+
+
+def test_each_role_ranks_its_matching_resume_first(index):
+    result = index.match(ROLES)
+    assert result.scores.shape == (2, 3)
+    assert ((result.scores >= 0) & (result.scores <= 100)).all()
+    top = result.top_for_roles(k=2)
+    assert top["Data Scientist"][0][0] == "data.pdf"
+    assert top["Frontend Engineer"][0][0] == "web.pdf"
+    assert len(top["Data Scientist"]) == 2
+    assert result.top_for_candidates(k=1)["web.pdf"][0][0] == "Frontend Engineer"
+
+
+def test_precomputed_term_counts_match_raw_text(index):
+    counts = {role: Counter(extract_terms(text)[0]) for role, text in ROLES.items()}
+    np.testing.assert_allclose(index.match(counts).scores, index.match(ROLES).scores, rtol=1e-6)
+
+
+def test_chunked_scoring_matches_one_block(index, monkeypatch):
+    whole = index.match(ROLES).scores
+    monkeypatch.setattr("core.matching.DOC_CHUNK", 1)
+    np.testing.assert_allclose(index.match(ROLES).scores, whole, rtol=1e-6)
+
+
+def test_rarer_terms_get_higher_idf(index):
+    idf = index.idf_table(["python", "react", "cobol"])
+    assert idf["python"] < idf["react"] < idf["cobol"]
+
+
+def test_empty_index_or_roles_give_empty_scores():
+    assert ResumeIndex().match(ROLES).scores.shape == (2, 0)
+    result = MatchResult(["r"], [], np.zeros((1, 0)))
+    assert result.top_for_roles() == {"r": []}
@@ -0,0 +1,71 @@
+import json
+import urllib.request
+
+import pytest
+
+from core.metrics import BUCKETS, MetricsRegistry
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+def test_spans_aggregate_by_stage_and_labels(registry):
+    for seconds in [0.002, 0.004, 0.2]:
+        registry.observe("llm", seconds, {"feature": "ats"}, {"chars": 100, "cached": True})
+    with registry.span("llm", feature="general") as fields:
+        fields["chars"] = 7
+
+    ats, general = registry.snapshot()
+    assert (ats["stage"], ats["labels"], ats["count"]) == ("llm", "feature=ats", 3)
+    assert ats["mean_ms"] == pytest.approx(1000 * 0.206 / 3)
+    assert ats["p50_ms"] == pytest.approx(4.0) and ats["max_ms"] == pytest.approx(200.0)
+    assert ats["chars"] == 300 and "cached" not in ats
+    assert (general["labels"], general["count"], general["chars"]) == ("feature=general", 1, 7)
+
+
+def test_timed_records_a_span_even_when_the_call_fails(registry):
+    @registry.timed("parse", parser="score")
+    def parse(fail):
+        if fail:
+            raise ValueError("bad")
+        return 42
+
+    assert parse(False) == 42
+    with pytest.raises(ValueError):
+        parse(True)
+    assert registry.snapshot()[0]["count"] == 2
+
+
+def test_prometheus_buckets_are_cumulative(registry):
+    registry.observe("extract", 0.003, {"kind": "pdf"}, {"pages": 2})
+    registry.observe("extract", 100.0, {"kind": "pdf"}, {"pages": 3})
+    text = registry.prometheus_text()
+    assert 'resume_analyzer_stage_seconds_bucket{stage="extract",kind="pdf",le="0.005"} 1' in text
+    assert 'resume_analyzer_stage_seconds_bucket{stage="extract",kind="pdf",le="+Inf"} 2' in text
+    assert text.count("_bucket{") == len(BUCKETS) + 1
+    assert 'resume_analyzer_stage_seconds_count{stage="extract",kind="pdf"} 2' in text
+    assert 'resume_analyzer_pages_total{stage="extract",kind="pdf"} 5' in text
+
+
+def test_spans_are_logged_as_json_lines(registry, tmp_path):
+    path = tmp_path / "logs" / "metrics.jsonl"
+    registry.configure_log(str(path))
+    registry.observe("llm", 0.5, {"feature": "ats"}, {"tokens": 12})
+    record = json.loads(path.read_text().splitlines()[0])
+    assert {k: record[k] for k in ("stage", "feature", "seconds", "tokens")} == \
+        {"stage": "llm", "feature": "ats", "seconds": 0.5, "tokens": 12}
+
+
+def test_exporter_serves_both_formats(registry):
+    registry.observe("llm", 0.1)
+    server = registry.serve(0)
+    try:
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        with urllib.request.urlopen(f"{base}/metrics") as response:
+            assert "resume_analyzer_stage_seconds_count" in response.read().decode()
+        with urllib.request.urlopen(f"{base}/metrics.json") as response:
+            assert json.load(response)[0]["stage"] == "llm"
+    finally:
+        server.shutdown()
@@ -0,0 +1,10 @@
+import pytest
+
+from core.near_dup import MIN_CANDIDATE_PROBABILITY, NUM_PERM, _band_layout, candidate_probability
+
+
+@pytest.mark.parametrize("threshold", [0.5, 0.7, 0.8, 0.9, 0.95])
+def test_pairs_at_the_threshold_are_candidates(threshold):
+    bands, rows = _band_layout(threshold, NUM_PERM)
+    assert bands * rows == NUM_PERM
+    assert candidate_probability(threshold, bands, rows) >= MIN_CANDIDATE_PROBABILITY
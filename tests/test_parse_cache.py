@@ -0,0 +1,56 @@
+from core.parse_cache import ParseCache, make_key
+
+
+class CountingParser:
+    def __init__(self, result="resume text"):
+        self.result = result
+        self.calls = 0
+
+    def __call__(self, data, filename):
+        self.calls += 1
+        return self.result
+
+
+def test_same_bytes_are_parsed_once_whatever_the_file_name():
+    cache, parse = ParseCache(), CountingParser()
+    assert cache.get_or_parse(b"%PDF-1 same", "a.pdf", "1", parse) == "resume text"
+    assert cache.get_or_parse(b"%PDF-1 same", "renamed.pdf", "1", parse) == "resume text"
+    assert parse.calls == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_key_changes_with_content_extension_and_version():
+    keys = {
+        make_key(b"one", "a.pdf", "1"),
+        make_key(b"two", "a.pdf", "1"),
+        make_key(b"one", "a.docx", "1"),
+        make_key(b"one", "a.pdf", "2"),
+    }
+    assert len(keys) == 4
+    assert make_key(b"one", "a.PDF", "1") == make_key(b"one", "b.pdf", "1")
+
+
+def test_failed_parses_are_not_cached():
+    cache, parse = ParseCache(), CountingParser(result=None)
+    for _ in range(2):
+        assert cache.get_or_parse(b"scan", "a.pdf", "1", parse) is None
+    assert parse.calls == 2
+
+
+def test_memory_tier_evicts_least_recently_used_past_max_bytes():
+    cache, parse = ParseCache(max_bytes=25), CountingParser("x" * 10)
+    for data in (b"a", b"b", b"c"):
+        cache.get_or_parse(data, "r.pdf", "1", parse)
+    stats = cache.stats()
+    assert (stats["entries"], stats["bytes"]) == (2, 20)
+    cache.get_or_parse(b"a", "r.pdf", "1", parse)
+    assert parse.calls == 4
+
+
+def test_disk_tier_survives_a_new_cache(tmp_path):
+    parse = CountingParser()
+    ParseCache(disk_dir=str(tmp_path)).get_or_parse(b"doc", "r.docx", "1", parse)
+    restarted = ParseCache(disk_dir=str(tmp_path))
+    assert restarted.get_or_parse(b"doc", "r.docx", "1", parse) == "resume text"
+    assert parse.calls == 1
+    assert restarted.stats()["disk_hits"] == 1
@@ -0,0 +1,82 @@
+import pytest
+
+from core.resume import parse_resume
+
+RESUME = """Jordan Lee
+jordan.lee@example.com | +1 (555) 123-4567 | linkedin.com/in/jordanlee
+
+EXPERIENCE
+Senior Engineer | Acme | Jan 2021 - Present
+- Built data pipelines in Python
+  processing 2TB a day
+- Led a team of four
+
+Engineer | Initech | 2018 - 2020
+- Maintained the billing service
+
+SKILLS
+Languages: Python, Go, SQL
+- Docker; Kubernetes
+
+EDUCATION
+B.Sc. Computer Science, 2014 - 2018
+"""
+
+
+@pytest.fixture(scope="module")
+def resume():
+    return parse_resume(RESUME)
+
+
+def _is_exact(span):
+    return RESUME[span.start:span.end] == span.text
+
+
+def test_contact_details(resume):
+    contact = resume.contact
+    assert contact.name.text == "Jordan Lee"
+    assert contact.email.text == "jordan.lee@example.com"
+    assert contact.phone.text == "+1 (555) 123-4567"
+    assert [link.text for link in contact.links] == ["linkedin.com/in/jordanlee"]
+    assert all(map(_is_exact, [contact.name, contact.email, contact.phone, *contact.links]))
+
+
+def test_experience_entries_with_dates_and_wrapped_bullets(resume):
+    first, second = resume.experience
+    assert first.title.text == "Senior Engineer | Acme | Jan 2021 - Present"
+    assert (first.dates.begin, first.dates.finish, first.dates.current) == ("Jan 2021", "Present", True)
+    assert [b.text for b in first.bullets] == [
+        "Built data pipelines in Python\n  processing 2TB a day",
+        "Led a team of four",
+    ]
+    assert (second.dates.begin, second.dates.finish, second.dates.current) == ("2018", "2020", False)
+    assert [b.text for b in second.bullets] == ["Maintained the billing service"]
+    assert RESUME[first.start:first.end].endswith("Led a team of four")
+    assert all(_is_exact(span) for entry in resume.experience for span in (entry.title, *entry.bullets))
+
+
+def test_skills_drop_labels_bullets_and_separators(resume):
+    assert [s.text for s in resume.skills] == ["Python", "Go", "SQL", "Docker", "Kubernetes"]
+    assert all(map(_is_exact, resume.skills))
+
+
+def test_every_date_range_is_found(resume):
+    assert [d.span.text for d in resume.dates] == ["Jan 2021 - Present", "2018 - 2020", "2014 - 2018"]
+
+
+def test_sections_by_name(resume):
+    assert resume.section_text("skills").startswith("SKILLS\nLanguages: Python")
+    assert resume.section("awards") is None and resume.section_text("awards") == ""
+
+
+def test_the_same_text_returns_the_same_object(resume):
+    assert parse_resume("".join(list(RESUME))) is resume
+    assert resume.terms() is resume.terms()
+    edited = parse_resume(RESUME.replace("Go,", "Rust,"))
+    assert edited is not resume and edited.version != resume.version
+
+
+def test_contact_falls_back_to_the_top_without_a_header():
+    resume = parse_resume("EXPERIENCE\nEngineer at Acme, reach me at sam@example.org\n")
+    assert resume.contact.email.text == "sam@example.org"
+    assert resume.experience[0].dates is None
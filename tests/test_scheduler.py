@@ -0,0 +1,141 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from core.scheduler import LLMScheduler, QuotaExceededError, TokenBucket, is_retryable
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def monotonic(self):
+        return self.now
+
+
+class ApiError(Exception):
+    def __init__(self, code):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+
+class ResourceExhausted(Exception):
+    pass
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr("core.scheduler.time", SimpleNamespace(monotonic=time.monotonic, sleep=delays.append))
+    return delays
+
+
+def _flaky(failures):
+    calls = []
+
+    def fn():
+        calls.append(1)
+        if len(calls) <= len(failures):
+            raise failures[len(calls) - 1]
+        return "ok"
+    return fn, calls
+
+
+def test_rate_limit_and_server_errors_are_retryable():
+    assert is_retryable(ApiError(429)) and is_retryable(ApiError(503))
+    assert is_retryable(ResourceExhausted())
+    assert not is_retryable(ApiError(400))
+    assert not is_retryable(ValueError("bad prompt"))
+
+
+def test_token_bucket_allows_a_burst_then_refills(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr("core.scheduler.time", clock)
+    bucket = TokenBucket(rate=2.0, capacity=3)
+    assert [bucket.try_take() for _ in range(4)] == [True, True, True, False]
+    assert bucket.time_until_token() == pytest.approx(0.5)
+    clock.now += 0.5
+    assert bucket.try_take() and not bucket.try_take()
+    clock.now += 100
+    assert sum(bucket.try_take() for _ in range(5)) == 3
+
+
+def test_retryable_errors_back_off_exponentially(sleeps):
+    scheduler = LLMScheduler(requests_per_minute=6000, max_retries=3, base_delay=1.0, max_delay=3.0)
+    fn, calls = _flaky([ApiError(429), ApiError(500), ApiError(503)])
+    assert scheduler.call("s", fn) == "ok"
+    assert len(calls) == 4 and len(sleeps) == 3
+    for delay, cap in zip(sleeps, [1.0, 2.0, 3.0]):
+        assert 0 <= delay <= cap
+    assert scheduler.metrics()["retries"] == 3
+
+
+def test_exhausted_retries_raise_a_quota_error(sleeps):
+    scheduler = LLMScheduler(requests_per_minute=6000, max_retries=2)
+    fn, calls = _flaky([ApiError(429)] * 5)
+    with pytest.raises(QuotaExceededError):
+        scheduler.call("s", fn)
+    assert len(calls) == 3
+    assert scheduler.metrics()["failed"] == 1
+
+
+def test_other_errors_are_not_retried(sleeps):
+    scheduler = LLMScheduler(requests_per_minute=6000)
+    fn, calls = _flaky([ValueError("bad prompt")])
+    with pytest.raises(ValueError):
+        scheduler.call("s", fn)
+    assert len(calls) == 1 and sleeps == []
+
+
+def test_streams_are_retried_only_before_the_first_chunk(sleeps):
+    scheduler = LLMScheduler(requests_per_minute=6000)
+    attempts = []
+
+    def start():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ApiError(503)
+        yield "a"
+        if len(attempts) == 2:
+            raise ApiError(503)
+        yield "b"
+
+    received = []
+    with pytest.raises(QuotaExceededError):
+        for chunk in scheduler.stream("s", start):
+            received.append(chunk)
+    assert received == ["a"] and len(attempts) == 2
+
+
+def test_waiting_sessions_are_served_round_robin():
+    scheduler = LLMScheduler(requests_per_minute=6000, burst=100, max_concurrency=1)
+    granted = []
+    release = threading.Event()
+
+    def hold():
+        with scheduler.slot("holder"):
+            release.wait()
+
+    def request(session):
+        with scheduler.slot(session):
+            granted.append(session)
+
+    threads = [threading.Thread(target=hold)]
+    threads[0].start()
+    while scheduler.metrics()["active"] != 1:
+        time.sleep(0.001)
+    # "greedy" queues three requests before "polite" queues one.
+    for number, session in enumerate(["greedy", "greedy", "greedy", "polite"], start=1):
+        threads.append(threading.Thread(target=request, args=(session,)))
+        threads[-1].start()
+        while scheduler.metrics()["queue_depth"] != number:
+            time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert granted == ["greedy", "polite", "greedy", "greedy"]
+    metrics = scheduler.metrics()
+    assert (metrics["granted"], metrics["queue_depth"], metrics["active"]) == (5, 0, 0)
@@ -0,0 +1,26 @@
+import os
+
+from core.session_store import SessionStore
+
+
+def test_blob_over_the_memory_budget_is_read_once(tmp_path):
+    store = SessionStore(max_memory_bytes=64, spill_dir=str(tmp_path))
+    text = os.urandom(2000).hex()   # incompressible, far over the budget
+    store.set("a", "general_result", text)
+    assert store.stats()["memory_bytes"] == 0
+
+    assert store.session("a").general_result == text
+    stats = store.stats()
+    assert (stats["loads"], stats["spills"], stats["memory_bytes"]) == (1, 1, 0)
+
+
+def test_spilled_blob_under_the_budget_is_kept_after_reading(tmp_path):
+    store = SessionStore(max_memory_bytes=2000, spill_dir=str(tmp_path))
+    first, second = os.urandom(1500).hex(), os.urandom(1500).hex()
+    store.set("a", "general_result", first)
+    store.set("b", "general_result", second)
+
+    assert store.get("a", "general_result") == first
+    stats = store.stats()
+    assert stats["loads"] == 1
+    assert stats["memory_bytes"] <= 2000
@@ -0,0 +1,45 @@
+import pytest
+
+from core.backends import Response
+from core.llm import stream_text
+from core.llm_cache import ResponseCache
+
+
+class ChunkedModel:
+    model_name = "test/chunked"
+
+    def __init__(self, chunks, fail_after=None):
+        self.chunks = chunks
+        self.fail_after = fail_after
+        self.calls = 0
+
+    def generate_content(self, prompt, generation_config=None, stream=False):
+        self.calls += 1
+        for i, chunk in enumerate(self.chunks):
+            if i == self.fail_after:
+                raise ConnectionError("stream reset")
+            yield Response(chunk)
+
+
+def test_chunks_arrive_in_order_and_the_finished_answer_is_cached(tmp_path):
+    cache = ResponseCache(str(tmp_path / "responses.sqlite3"))
+    model = ChunkedModel(["Resume ", "Score: ", "72/100", ""])
+    assert list(stream_text(model, "prompt", cache=cache)) == ["Resume ", "Score: ", "72/100"]
+    # A cached answer comes back whole, without calling the model.
+    assert list(stream_text(model, "prompt", cache=cache)) == ["Resume Score: 72/100"]
+    assert model.calls == 1
+
+
+def test_an_interrupted_stream_is_not_cached(tmp_path):
+    cache = ResponseCache(str(tmp_path / "responses.sqlite3"))
+    with pytest.raises(ConnectionError):
+        list(stream_text(ChunkedModel(["Resume ", "Score"], fail_after=1), "prompt", cache=cache))
+    assert cache.stats()["entries"] == 0
+
+
+def test_a_stream_abandoned_by_the_page_is_not_cached(tmp_path):
+    cache = ResponseCache(str(tmp_path / "responses.sqlite3"))
+    chunks = stream_text(ChunkedModel(["Resume ", "Score: ", "72/100"]), "prompt", cache=cache)
+    next(chunks)
+    chunks.close()
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from core.backends import Response, stub_json
+from core.llm import generate_text
+from core.llm_cache import ResponseCache
+from core.parsing import parse_score, parse_trend_rows
+from core.structured import RESULT_KEYS, StructuredResponseError, analyze, parse_analysis, render_results, result_fields
+
+
+class FlakyModel:
+    """Answers with each of ``answers`` in turn, then repeats the last one."""
+
+    model_name = "test/flaky"
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.calls = 0
+
+    def generate_content(self, prompt, generation_config=None, stream=False):
+        answer = self.answers[min(self.calls, len(self.answers) - 1)]
+        self.calls += 1
+        return Response(answer)
+
+
+def _analyze(model, cache):
+    config = {"response_mime_type": "application/json"}
+    return analyze(lambda p: generate_text(model, p, config, feature="structured", cache=cache,
+                                           validate=parse_analysis), "Analyze this resume.")
+
+
+def test_rejected_answers_are_not_cached(tmp_path):
+    valid = stub_json("Analyze this resume.")
+    model = FlakyModel(["not json", '{"resume_score": "high"}', valid])
+    cache = ResponseCache(str(tmp_path / "responses.sqlite3"))
+
+    with pytest.raises(StructuredResponseError):
+        _analyze(model, cache)
+    assert model.calls == 2
+
+    # The next run asks the model again instead of replaying the bad answers.
+    assert _analyze(model, cache) == json.loads(valid)
+    assert model.calls == 3
+    # ...and a valid answer is served from the cache from then on.
+    assert _analyze(model, cache) == json.loads(valid)
+    assert model.calls == 3
+
+
+ANALYSIS = {
+    "resume_score": 72,
+    "archetype": "Builder",
+    "summary": "Strong backend experience.",
+    "strengths": ["Python"],
+    "weaknesses": ["No metrics"],
+    "ats": None,
+    "fit": {"score": 64, "justification": "Close match."},
+    "career_paths": [],
+    "trends": {"summary": "Growing.", "rows": [{"year": 2024, "demand_growth_pct": 10}, {"year": 2025, "demand_growth_pct": 12.5}]},
+}
+
+
+def test_render_results_clears_keys_the_analysis_has_nothing_for():
+    rendered = render_results(parse_analysis(json.dumps(ANALYSIS)))
+    assert set(rendered) == set(RESULT_KEYS)
+    assert rendered["ats_result"] == ""
+    assert rendered["opportunity_result"]
+
+
+def test_result_fields_match_the_rendered_text():
+    analysis = parse_analysis(json.dumps(ANALYSIS))
+    rendered, fields = render_results(analysis), result_fields(analysis)
+    assert fields["general_result"]["score"] == parse_score(rendered["general_result"]) == 72
+    assert fields["trends_result"]["rows"] == parse_trend_rows(rendered["trends_result"]) == [("2024", 10.0), ("2025", 12.5)]
+    assert "ats_result" not in fields
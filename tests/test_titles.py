@@ -0,0 +1,31 @@
+import pytest
+
+from core.titles import TitleIndex, canonical_key
+
+KNOWN = ["Senior Data Engineer", "Senior Software Engineer", "C Developer", "Data Scientist", "AI Engineer"]
+
+
+@pytest.mark.parametrize("title", [
+    "Junior Data Engineer",
+    "Junior Software Engineer",
+    "R Developer",
+    "C# Developer",
+    "Data Engineer",
+    "Senior Data Scientist",
+])
+def test_different_roles_are_not_merged(title):
+    index = TitleIndex(KNOWN)
+    key, _ = index.resolve(title)
+    assert key == canonical_key(title)
+    assert len(index) == len(KNOWN) + 1
+
+
+@pytest.mark.parametrize("title, expected", [
+    ("Senior Software Enginer", "Senior Software Engineer"),
+    ("senior softwre engineer", "Senior Software Engineer"),
+    ("Data Scientst", "Data Scientist"),
+    ("A.I. Engineer", "AI Engineer"),
+    ("Sr. Data Engineer", "Senior Data Engineer"),
+])
+def test_typos_and_variants_resolve_to_the_known_title(title, expected):
+    assert TitleIndex(KNOWN).resolve(title) == (canonical_key(expected), expected)